@@ -0,0 +1,96 @@
+"""Memory used by review models for a workspace's worth of comments.
+
+Compares the slotted models with the plain dataclasses they replaced.
+
+    python benchmarks/bench_models.py [--comments N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from mdreview.models import Comment, ReviewFile
+
+
+@dataclass
+class LegacyComment:
+    line_start: int
+    line_end: int
+    anchor_text: str
+    body: str
+    id: str = field(default_factory=lambda: uuid4().hex[:8])
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+    orphaned: bool = False
+    updated_at: str | None = None
+
+
+@dataclass
+class LegacyReviewFile:
+    file: str
+    content_hash: str = ""
+    status: str = "unreviewed"
+    comments: list = field(default_factory=list)
+    reviewed_at: str | None = None
+
+
+def _sidecars(count: int, per_file: int) -> list[str]:
+    """Serialized comment lists, one per file, as read from sidecars."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "line_start": i % 400 + 1,
+            "line_end": i % 400 + 2,
+            "anchor_text": f"## Section {i % 40}",
+            "body": f"Comment number {i}",
+            "id": uuid4().hex[:8],
+            "created_at": (start + timedelta(seconds=i, microseconds=i)).isoformat(),
+            "orphaned": False,
+            "updated_at": None if i % 3 else (start + timedelta(days=1)).isoformat(),
+        }
+        for i in range(count)
+    ]
+    return [json.dumps(rows[i : i + per_file]) for i in range(0, count, per_file)]
+
+
+def measure(comment_cls, review_cls, sidecars: list[str]) -> int:
+    """Bytes still held after loading every sidecar into models."""
+    gc.collect()
+    tracemalloc.start()
+    reviews = [
+        review_cls(
+            file=f"doc{i}.md",
+            comments=[comment_cls(**c) for c in json.loads(text)],
+        )
+        for i, text in enumerate(sidecars)
+    ]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del reviews
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--per-file", type=int, default=20)
+    args = parser.parse_args()
+
+    sidecars = _sidecars(args.comments, args.per_file)
+    legacy = measure(LegacyComment, LegacyReviewFile, sidecars)
+    compact = measure(Comment, ReviewFile, sidecars)
+    print(f"{args.comments} comments in {args.comments // args.per_file} files")
+    print(f"  dataclass: {legacy / 2**20:8.1f} MiB")
+    print(f"  slotted:   {compact / 2**20:8.1f} MiB ({compact / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Load and save time for a directory of review sidecars.
+
+Runs every pass with the stdlib json module and, when installed, orjson.
+
+    python benchmarks/bench_serialization.py [--files N] [--comments N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from mdreview import serialization
+from mdreview.models import Comment, ReviewFile, ReviewStatus
+from mdreview.storage import load_review, review_to_dict, save_review
+
+
+def _review(i: int, comments: int) -> ReviewFile:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return ReviewFile(
+        file=f"doc{i}.md",
+        content_hash="sha256:" + f"{i:064x}",
+        status=ReviewStatus.CHANGES_REQUESTED,
+        comments=[
+            Comment(
+                line_start=j * 3 + 1,
+                line_end=j * 3 + 2,
+                anchor_text=f"Paragraph {j} of document {i}, with a café",
+                body=f"Comment {j}: please reword this sentence.",
+                created_at=(start + timedelta(seconds=i * 60 + j)).isoformat(),
+            )
+            for j in range(comments)
+        ],
+        reviewed_at=start.isoformat(),
+    )
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=5)
+    args = parser.parse_args()
+
+    reviews = [_review(i, args.comments) for i in range(args.files)]
+    fast = serialization._orjson
+    backends = [("json", None)] + ([("orjson", fast)] if fast else [])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"doc{i}.md" for i in range(args.files)]
+        print(f"{args.files} sidecars, {args.comments} comments each")
+        outputs = {}
+        for name, module in backends:
+            serialization._orjson = module
+            texts: list[str] = []
+            encode = _time(
+                lambda: texts.extend(
+                    serialization.dumps_pretty(review_to_dict(r)) for r in reviews
+                )
+            )
+            decode = _time(lambda: [serialization.loads(t) for t in texts])
+            save = _time(lambda: [save_review(p, r) for p, r in zip(paths, reviews)])
+            load = _time(lambda: [load_review(p) for p in paths])
+            outputs[name] = paths[-1].with_suffix(".md.review.json").read_bytes()
+            print(
+                f"  {name:7s} encode {encode:5.2f}s  decode {decode:5.2f}s"
+                f"  save {save:5.2f}s  load {load:5.2f}s"
+            )
+        serialization._orjson = fast
+        if len(outputs) == 2:
+            same = outputs["json"] == outputs["orjson"]
+            print(f"  byte-identical output: {same}")
+
+
+if __name__ == "__main__":
+    main()
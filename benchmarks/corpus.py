@@ -0,0 +1,154 @@
+"""Synthetic markdown corpus for benchmarks.
+
+Everything is driven by a seeded ``random.Random`` so a given set of
+parameters always produces the same documents, comments and edits.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from mdreview.fingerprints import anchor_hashes
+from mdreview.models import Comment, ReviewFile, ReviewStatus
+
+WORDS = (
+    "review comment anchor block render diff drift snapshot sidecar document "
+    "section paragraph change line cursor status approve request terminal "
+    "markdown mermaid diagram watcher journal store round content hash"
+).split()
+
+EDIT_PATTERNS = ("insert", "delete", "rewrite", "move")
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    lines: int = 1000  # approximate document length
+    comments: int = 50  # comments per document
+    diagram_density: float = 0.05  # chance a section carries a mermaid diagram
+    edit_pattern: str = "insert"  # one of EDIT_PATTERNS
+    edit_fraction: float = 0.1  # share of blocks touched by an edit round
+    seed: int = 0
+
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _diagram(rng: random.Random) -> list[str]:
+    nodes = [f"N{i}" for i in range(rng.randint(3, 6))]
+    edges = [f"    {a} --> {b}" for a, b in zip(nodes, nodes[1:])]
+    return ["```mermaid", "graph TD", *edges, "```"]
+
+
+def _block(rng: random.Random, spec: CorpusSpec) -> list[str]:
+    kind = rng.random()
+    if kind < spec.diagram_density:
+        return _diagram(rng)
+    if kind < 0.25:
+        return [f"- {_sentence(rng, 6)}" for _ in range(rng.randint(2, 5))]
+    if kind < 0.32:
+        return ["```python", *(f"x{i} = {i}" for i in range(rng.randint(2, 6))), "```"]
+    return [_sentence(rng, rng.randint(8, 30))]
+
+
+def generate_document(spec: CorpusSpec, rng: random.Random | None = None) -> str:
+    """A markdown document of roughly ``spec.lines`` lines."""
+    rng = rng or random.Random(spec.seed)
+    lines = ["# Benchmark document", ""]
+    section = 0
+    while len(lines) < spec.lines:
+        if section == 0 or rng.random() < 0.15:
+            section += 1
+            lines += [f"## Section {section}", ""]
+        lines += [*_block(rng, spec), ""]
+    return "\n".join(lines) + "\n"
+
+
+def _blocks(text: str) -> list[list[str]]:
+    blocks: list[list[str]] = []
+    current: list[str] = []
+    for line in text.splitlines():
+        if line:
+            current.append(line)
+        elif current:
+            blocks.append(current)
+            current = []
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def edit_document(text: str, spec: CorpusSpec, rng: random.Random | None = None) -> str:
+    """One review round's worth of edits in ``spec.edit_pattern`` style."""
+    rng = rng or random.Random(spec.seed + 1)
+    blocks = _blocks(text)
+    touched = max(1, int(len(blocks) * spec.edit_fraction))
+    for _ in range(touched):
+        i = rng.randrange(len(blocks))
+        match spec.edit_pattern:
+            case "insert":
+                blocks.insert(i, [_sentence(rng)])
+            case "delete":
+                if len(blocks) > 1:
+                    blocks.pop(i)
+            case "rewrite":
+                blocks[i] = [
+                    line + " " + _sentence(rng, 4) if rng.random() < 0.5 else line
+                    for line in blocks[i]
+                ]
+            case "move":
+                blocks.insert(rng.randrange(len(blocks)), blocks.pop(i))
+            case other:
+                raise ValueError(f"unknown edit pattern {other!r}")
+    return "\n\n".join("\n".join(b) for b in blocks) + "\n"
+
+
+def generate_comments(
+    text: str, spec: CorpusSpec, rng: random.Random | None = None
+) -> list[Comment]:
+    """Comments anchored to random non-blank lines of ``text``."""
+    rng = rng or random.Random(spec.seed + 2)
+    lines = text.splitlines()
+    candidates = [i for i, line in enumerate(lines) if line.strip()]
+    comments = []
+    for n in range(spec.comments):
+        i = rng.choice(candidates)
+        anchor_hash, context_hash = anchor_hashes(lines, i + 1, i + 1)
+        comments.append(
+            Comment(
+                line_start=i + 1,
+                line_end=i + 1,
+                anchor_text=lines[i].strip(),
+                body=_sentence(rng, 8),
+                id=f"{spec.seed:04x}{n:04x}",
+                created_at="2026-01-01T00:00:00+00:00",
+                anchor_hash=anchor_hash,
+                context_hash=context_hash,
+            )
+        )
+    return comments
+
+
+def write_corpus(root: Path, files: int, spec: CorpusSpec) -> list[Path]:
+    """Write ``files`` documents with reviewed sidecars under ``root``."""
+    from mdreview.storage import compute_hash, save_review
+
+    paths = []
+    for i in range(files):
+        rng = random.Random(spec.seed * 100_003 + i)
+        text = generate_document(spec, rng)
+        path = root / f"section{i % 10}" / f"doc{i}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        review = ReviewFile(
+            file=path.name,
+            content_hash=compute_hash(text),
+            status=ReviewStatus.CHANGES_REQUESTED,
+            comments=generate_comments(text, spec, rng),
+        )
+        save_review(path, review)
+        paths.append(path)
+    return paths
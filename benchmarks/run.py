@@ -0,0 +1,250 @@
+"""Benchmark the hot paths and write machine-readable results.
+
+    python benchmarks/run.py                      # all benchmarks
+    python benchmarks/run.py -k drift -k diff     # only matching names
+    python benchmarks/run.py -o new.json --compare old.json
+
+Each benchmark is timed over ``--repeat`` runs after a warm-up run; the
+median and minimum are reported. Peak Python allocations are measured in a
+separate run under tracemalloc so tracing does not skew the timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from copy import copy
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from corpus import (  # noqa: E402
+    CorpusSpec,
+    edit_document,
+    generate_comments,
+    generate_document,
+    write_corpus,
+)
+
+BENCHMARKS: dict[str, Callable[[CorpusSpec], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a setup function returning the callable to time."""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _block_ranges(text: str) -> list[tuple[int, int] | None]:
+    from markdown_it import MarkdownIt
+
+    tokens = MarkdownIt("gfm-like").parse(text)
+    return [tuple(t.map) for t in tokens if t.map and t.nesting >= 0 and t.level == 0]
+
+
+@benchmark("reconcile_drift")
+def _reconcile(spec: CorpusSpec):
+    from mdreview.fingerprints import fingerprint
+    from mdreview.models import ReviewFile
+    from mdreview.storage import reconcile_drift
+
+    text = generate_document(spec)
+    comments = generate_comments(text, spec)
+    blocks = fingerprint(text.splitlines())  # as saved with the review
+    lines = edit_document(text, spec).splitlines()
+
+    def run():
+        review = ReviewFile(
+            file="doc.md", comments=[copy(c) for c in comments], blocks=blocks
+        )
+        reconcile_drift(review, lines)
+
+    return run
+
+
+@benchmark("compute_block_diff")
+def _diff(spec: CorpusSpec):
+    from mdreview.diff import compute_block_diff
+
+    old = generate_document(spec)
+    new = edit_document(old, spec)
+    old_lines, new_lines = old.splitlines(), new.splitlines()
+    ranges = _block_ranges(new)
+    return lambda: compute_block_diff(old_lines, new_lines, ranges)
+
+
+@benchmark("preprocess_mermaid")
+def _mermaid(spec: CorpusSpec):
+    from mdreview.mermaid import preprocess_mermaid
+
+    text = generate_document(spec)
+    return lambda: preprocess_mermaid(text, render_ascii=True)
+
+
+@benchmark("load_reviews")
+def _load_reviews(spec: CorpusSpec):
+    from mdreview.storage import load_review
+
+    tmp = tempfile.TemporaryDirectory()
+    paths = write_corpus(Path(tmp.name), 200, spec)
+
+    def run():
+        _ = tmp  # keep the corpus alive as long as the benchmark
+        return [load_review(p) for p in paths]
+
+    return run
+
+
+def _in_app(spec: CorpusSpec, body) -> Callable[[], object]:
+    """Run ``body(app, pilot, path)`` inside a headless ReviewApp on a corpus file."""
+    from mdreview.app import ReviewApp
+
+    class QuietApp(ReviewApp):
+        def _print_summary(self) -> None:
+            pass
+
+    tmp = tempfile.TemporaryDirectory()
+    (path,) = write_corpus(Path(tmp.name), 1, spec)
+
+    def run():
+        async def main():
+            app = QuietApp([path])
+            async with app.run_test(size=(120, 40)) as pilot:
+                await body(app, pilot, path)
+
+        _ = tmp
+        asyncio.run(main())
+
+    return run
+
+
+@benchmark("markdown_update")
+def _markdown_update(spec: CorpusSpec):
+    from mdreview.markdown import ReviewMarkdown
+
+    other = generate_document(spec, random.Random(spec.seed + 7))
+
+    async def body(app, pilot, path):
+        md = app.query_one(ReviewMarkdown)
+        await md.update(other)
+        await md.update(path.read_text())
+
+    return _in_app(spec, body)
+
+
+@benchmark("app_startup")
+def _startup(spec: CorpusSpec):
+    async def body(app, pilot, path):
+        await pilot.pause()
+
+    return _in_app(spec, body)
+
+
+def measure(run: Callable[[], object], repeat: int) -> dict:
+    run()  # warm-up: imports, caches
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "runs": repeat,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("mdreview")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"\n{'benchmark':22s} {'old':>10s} {'new':>10s} {'ratio':>7s}")
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        print(
+            f"{name:22s} {before['median_s'] * 1000:9.2f}ms "
+            f"{result['median_s'] * 1000:9.2f}ms {ratio:6.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--only", action="append", default=[])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lines", type=int, default=CorpusSpec.lines)
+    parser.add_argument("--comments", type=int, default=CorpusSpec.comments)
+    parser.add_argument(
+        "--diagram-density", type=float, default=CorpusSpec.diagram_density
+    )
+    parser.add_argument(
+        "--edit-pattern",
+        choices=("insert", "delete", "rewrite", "move"),
+        default=CorpusSpec.edit_pattern,
+    )
+    parser.add_argument("--seed", type=int, default=CorpusSpec.seed)
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench.json"))
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args()
+
+    spec = CorpusSpec(
+        lines=args.lines,
+        comments=args.comments,
+        diagram_density=args.diagram_density,
+        edit_pattern=args.edit_pattern,
+        seed=args.seed,
+    )
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if args.only and not any(k in name for k in args.only):
+            continue
+        results[name] = measure(setup(spec), args.repeat)
+        r = results[name]
+        print(
+            f"{name:22s} median {r['median_s'] * 1000:9.2f}ms  "
+            f"min {r['min_s'] * 1000:9.2f}ms  peak {r['peak_kib']:10.1f}KiB"
+        )
+
+    report = {
+        "version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "spec": spec.__dict__,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
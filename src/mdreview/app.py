@@ -2,49 +2,88 @@
 
 from __future__ import annotations
 
-import webbrowser
+import asyncio
+import sys
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import ScrollableContainer
+from textual.notifications import SeverityLevel
 from textual.widgets import Static
 
+from mdreview import parsing, profiling
 from mdreview.diff import compute_block_diff
+from mdreview.fingerprints import fingerprint
 from mdreview.keybindings import DEFAULT_BINDINGS, ACTION_LABELS, key_label
+from mdreview.lines import LineIndex, split_lines
 from mdreview.markdown import ReviewMarkdown
 from mdreview.mermaid import preprocess_mermaid
 from mdreview.models import Comment, ReviewFile, ReviewStatus
 from mdreview.operations import (
+    ReviewTally,
     add_comment,
+    apply_reload,
     approve_file,
-    compute_exit_code,
     delete_all_comments,
     delete_comment,
     edit_comment,
     format_summary,
     handle_content_change,
+    reload_file,
     request_changes,
     should_save_snapshot,
 )
+from mdreview.persistence import ReviewWriter
+from mdreview.profiling import span
+from mdreview.snapshots import SnapshotRound
 from mdreview.storage import (
-    compute_hash,
+    JOURNAL_COMPACT_EVENTS,
+    algorithm_of,
+    append_journal,
+    compact_journal,
+    event_add,
+    event_clear,
+    event_content,
+    event_delete,
+    event_edit,
+    event_status,
+    get_hash_algorithm,
+    hash_file,
     load_review,
     load_snapshot,
+    read_content,
     reconcile_drift,
-    save_review,
     save_snapshot,
+    snapshot_rounds,
 )
-from mdreview.widgets.comment_input import CommentInput
-from mdreview.widgets.comment_picker import CommentPicker
 from mdreview.widgets.comment_popover import CommentPopover
-from mdreview.widgets.file_selector import FileSelector
 
-from mdreview.widgets.help_overlay import HelpOverlay
+if TYPE_CHECKING:
+    from textual.await_complete import AwaitComplete
+
+    from mdreview.daemon import DaemonClient
+
+RELOAD_WORKERS = 4  # Threads used to reload files that are not on screen
+STATUS_WINDOW = 25  # Most status dots in the title bar; larger sessions get a window
+
+_STATUS_DOTS = {
+    ReviewStatus.APPROVED: "\u2713",
+    ReviewStatus.CHANGES_REQUESTED: "\u25cf",
+    ReviewStatus.UNREVIEWED: "\u25cb",
+}
 
 
 class TitleBar(Static):
-    """Title bar showing filename, position, and status dots."""
+    """Title bar showing filename, position, and status dots.
+
+    Large sessions show a window of dots around the current file plus
+    per-status totals instead of one dot per file.
+    """
 
     DEFAULT_CSS = """
     TitleBar {
@@ -60,35 +99,35 @@ class TitleBar(Static):
         super().__init__()
         self._filename = ""
         self._index = 0
-        self._total = 0
-        self._statuses: list[ReviewStatus] = []
+        self._tally = ReviewTally()
 
-    def set_state(
-        self,
-        filename: str,
-        index: int,
-        total: int,
-        statuses: list[ReviewStatus],
-    ) -> None:
+    def set_state(self, filename: str, index: int, tally: ReviewTally) -> None:
         self._filename = filename
         self._index = index
-        self._total = total
-        self._statuses = statuses
+        self._tally = tally
         self._refresh_display()
 
     def _refresh_display(self) -> None:
+        total = len(self._tally)
+        start = min(max(0, self._index - STATUS_WINDOW // 2), total - STATUS_WINDOW)
+        start = max(0, start)
         dots = []
-        for i, status in enumerate(self._statuses):
-            match status:
-                case ReviewStatus.APPROVED:
-                    dots.append("\u2713" if i != self._index else "[\u2713]")
-                case ReviewStatus.CHANGES_REQUESTED:
-                    dots.append("\u25cf" if i != self._index else "[\u25cf]")
-                case _:
-                    dots.append("\u25cb" if i != self._index else "[\u25cb]")
+        for i, status in enumerate(
+            self._tally.statuses(start, start + STATUS_WINDOW), start
+        ):
+            icon = _STATUS_DOTS.get(status, "\u25cb")
+            dots.append(icon if i != self._index else f"[{icon}]")
 
         dots_str = " ".join(dots)
-        pos = f"[{self._index + 1}/{self._total}]"
+        if total > STATUS_WINDOW:
+            before = "\u2026 " if start > 0 else ""
+            after = " \u2026" if start + STATUS_WINDOW < total else ""
+            counts = " ".join(
+                f"{icon}{self._tally.count(status)}"
+                for status, icon in _STATUS_DOTS.items()
+            )
+            dots_str = f"{before}{dots_str}{after}  {counts}"
+        pos = f"[{self._index + 1}/{total}]"
         self.update(f" {dots_str}  {pos}  {self._filename}")
 
 
@@ -111,6 +150,7 @@ class FooterBar(Static):
         self._diff_available = False
         self._has_comments = False
         self._keys = keybindings or dict(DEFAULT_BINDINGS)
+        self._stats = ""  # profiling stats line, shown under the hints
 
     def _hint(self, action: str, label: str) -> str:
         """Format a single keybinding hint."""
@@ -128,6 +168,13 @@ class FooterBar(Static):
         self._has_comments = has_comments
         self._refresh()
 
+    def set_stats(self, stats: str) -> None:
+        if stats == self._stats:
+            return
+        self._stats = stats
+        self.styles.height = 2 if stats else 1
+        self._refresh()
+
     def _refresh(self) -> None:
         if self._mode == "selecting":
             comment_key = key_label(self._keys["comment"])
@@ -138,7 +185,6 @@ class FooterBar(Static):
                 f"[bold ansi_bright_yellow]{select_up}/{select_down}[/] extend  "
                 "[bold ansi_bright_yellow]Esc[/] cancel"
             )
-            self.update(text)
         else:
             prev_key = key_label(self._keys["prev_file"])
             next_key = key_label(self._keys["next_file"])
@@ -158,7 +204,9 @@ class FooterBar(Static):
                 self._hint("show_help", "help")
                 + f"[bold ansi_bright_yellow]{key_label(self._keys['quit'])}[/] quit"
             )
-            self.update(text)
+        if self._stats:
+            text += f"\n [dim]{self._stats}[/]"
+        self.update(text)
 
 
 class ReviewApp(App):
@@ -192,6 +240,9 @@ class ReviewApp(App):
         files: list[Path],
         watch_dir: Path | None = None,
         keybindings: dict[str, str] | None = None,
+        journal: bool = False,
+        discovered: AsyncIterator[list[Path]] | None = None,
+        daemon: DaemonClient | None = None,
     ) -> None:
         self._keybindings = keybindings or dict(DEFAULT_BINDINGS)
         super().__init__()
@@ -204,44 +255,68 @@ class ReviewApp(App):
         if keymap:
             self.set_keymap(keymap)
         self._files = files
+        self._known_files: set[Path] = {f.resolve() for f in files}
+        self._discovered = discovered  # batches of files still being scanned
+        self._scan_complete = discovered is None
+        self._daemon = daemon  # warm workspace daemon, if one is running
+        self._file_selector = None  # open FileSelector, grown as files arrive
+        self._path_index = None  # FileSelector's name index, kept between openings
         self._watch_dir = watch_dir
         self._watcher_worker = None
+        self._discovery_worker = None
         self._current_index = 0
         self._reviews: list[ReviewFile] = []
-        self._lines: dict[int, list[str]] = {}  # file index -> source lines
+        # file index -> line offsets, indexed when a file is first commented
+        self._lines: dict[int, LineIndex] = {}
         self._mermaid_data: dict[int, list[dict]] = {}  # file index -> mermaid diagrams
         self._mermaid_ascii_on: dict[int, bool] = {}  # file index -> show ascii?
-        self._scroll_positions: dict[int, float] = {}
+        # file index -> ReviewMarkdown.scroll_anchor() when last left
+        self._scroll_anchors: dict[int, tuple[int, int] | None] = {}
         self._selecting = False
         self._selection_start: int | None = None
         self._exit_code = 2  # incomplete by default
-        self._snapshots: dict[int, str | None] = {}  # file index -> snapshot content
+        # file index -> snapshot rounds (hashes only; content is loaded on diff)
+        self._snapshot_rounds: dict[int, list[SnapshotRound]] = {}
+        self._diff_round: dict[int, int] = {}  # file index -> round to diff against
         self._diff_available: dict[int, bool] = {}  # file index -> diff available?
         self._diff_mode: dict[int, bool] = {}  # file index -> diff mode on?
+        self._reload_pool = ThreadPoolExecutor(
+            max_workers=RELOAD_WORKERS, thread_name_prefix="mdreview-reload"
+        )
+        self._pending_reloads: set[int] = set()  # background reloads in flight
+        self._stale_reloads: set[int] = set()  # changed again while in flight
+        self._writer = ReviewWriter(on_error=self._on_write_error)
+        self._journal = journal  # append comment events instead of rewriting
+        self._journal_events: dict[int, int] = {}  # file index -> uncompacted events
 
         # Load reviews
         for i, path in enumerate(files):
-            content = path.read_text()
-            self._lines[i] = content.splitlines()
             review = load_review(path)
-            current_hash = compute_hash(content)
+            with span("app.read", file=path.name):
+                # Checked with the algorithm the stored hash was made with
+                current_hash = hash_file(path, algorithm_of(review.content_hash))
 
             if (
                 review.content_hash
                 and review.content_hash != current_hash
                 and review.comments
             ):
-                reconcile_drift(review, self._lines[i])
+                content, current_hash = read_content(path)
+                reconcile_drift(review, split_lines(content))
+            elif review.content_hash != current_hash:
+                review.blocks = []  # fingerprints of the old content
+                if algorithm_of(current_hash) != get_hash_algorithm():
+                    current_hash = hash_file(path)  # new hashes use the selected one
 
             review.content_hash = current_hash
             self._reviews.append(review)
             self._mermaid_ascii_on[i] = True
 
-            snapshot = load_snapshot(path)
-            self._snapshots[i] = snapshot
-            has_diff = snapshot is not None and snapshot != content
-            self._diff_available[i] = has_diff
+            self._snapshot_rounds[i] = snapshot_rounds(path)
+            self._diff_round[i] = -1
+            self._refresh_diff_available(i)
             self._diff_mode[i] = False
+        self._tally = ReviewTally(r.status for r in self._reviews)
 
     def compose(self) -> ComposeResult:
         yield TitleBar()
@@ -261,74 +336,106 @@ class ReviewApp(App):
     def on_mount(self) -> None:
         self._load_file(0)
         self.query_one(FooterBar).set_mode("normal")
+        if profiling.enabled():
+            self.set_interval(1.0, self._update_profile_stats)
         self._start_file_watcher()
+        if self._discovered is not None:
+            self._discovery_worker = self.run_worker(
+                self._consume_discovery(self._discovered),
+                name="discovery",
+                exit_on_error=False,
+            )
 
     def _load_file(self, index: int) -> None:
+        md = self.query_one(ReviewMarkdown)
         # Save scroll position of current file
-        try:
-            scroll = self.query_one("#content-scroll", ScrollableContainer)
-            self._scroll_positions[self._current_index] = scroll.scroll_y
-        except Exception:
-            pass
+        self._scroll_anchors[self._current_index] = md.scroll_anchor()
 
         self._current_index = index
         path = self._files[index]
-        content = path.read_text()
 
         # Preprocess mermaid
-        if self._mermaid_ascii_on.get(index, True):
-            processed, diagrams = preprocess_mermaid(content, render_ascii=True)
-        else:
-            processed, diagrams = preprocess_mermaid(content, render_ascii=False)
+        processed, diagrams = self._render_source(
+            path, self._mermaid_ascii_on.get(index, True)
+        )
         self._mermaid_data[index] = diagrams
 
-        md = self.query_one(ReviewMarkdown)
-        md.update(processed)
+        # The widget mounts the saved view first and keeps it in place
+        update = md.update(processed, self._scroll_anchors.get(index))
+        self._after_update(index, update, self._post_load)
+
+    def _after_update(
+        self, index: int, update: AwaitComplete, callback: Callable[[], None]
+    ) -> None:
+        """Run ``callback`` once a file's blocks are all mounted, if it is
+        still the file on screen."""
+
+        async def wait() -> None:
+            await update
+            if self._current_index == index:
+                callback()
 
-        # Need to defer comment/cursor setup until after markdown is rendered
-        self.set_timer(0.1, self._post_load)
+        self.run_worker(
+            wait(), name="markdown-update", group="markdown", exit_on_error=False
+        )
+
+    def _render_source(self, path: Path, render_ascii: bool) -> tuple[str, list[dict]]:
+        """Mermaid-preprocessed markdown, from the daemon's cache when connected."""
+        if self._daemon is not None:
+            try:
+                return self._daemon.render(path, render_ascii)
+            except (OSError, ValueError, RuntimeError):
+                self._daemon = None  # render locally from now on
+        with span("app.read", file=path.name):
+            content = path.read_text()
+        return preprocess_mermaid(content, render_ascii=render_ascii)
 
     def _post_load(self) -> None:
         idx = self._current_index
         md = self.query_one(ReviewMarkdown)
         review = self._reviews[idx]
         md.set_comments(review.comments)
-        md.cursor_index = 0
+        # Start the cursor at the top of the restored view
+        anchor = self._scroll_anchors.get(idx)
+        start = md.block_index_for_line(anchor[0] + 1) if anchor else None
+        md.cursor_index = start or 0
 
         # Apply diff if available and enabled
         self._apply_diff_if_needed()
 
         # Notify about unchanged files
-        snapshot = self._snapshots.get(idx)
-        if snapshot is not None and not self._diff_available.get(idx, False):
+        if self._snapshot_rounds.get(idx) and not self._diff_available.get(idx, False):
             self._notify("No changes since last review")
 
         self._update_popover()
         self._update_title_bar()
         self._update_footer()
 
-        # Restore scroll position
-        saved = self._scroll_positions.get(idx, 0)
-        if saved:
-            scroll = self.query_one("#content-scroll", ScrollableContainer)
-            scroll.scroll_y = saved
-
     def _update_title_bar(self) -> None:
         path = self._files[self._current_index]
         parent = path.parent.name
         name = path.name
         display = f"{parent}/{name}" if parent and parent != "/" else name
 
-        statuses = [r.status for r in self._reviews]
-        self.query_one(TitleBar).set_state(
-            display, self._current_index, len(self._files), statuses
-        )
+        self.query_one(TitleBar).set_state(display, self._current_index, self._tally)
 
     def _update_footer(self) -> None:
         footer = self.query_one(FooterBar)
         footer.set_diff_available(self._diff_available.get(self._current_index, False))
         footer.set_has_comments(bool(self._reviews[self._current_index].comments))
 
+    def _update_profile_stats(self) -> None:
+        writer = self._writer.stats()
+        queue = (
+            f"writes {writer.pending} queued, "
+            f"{writer.last_latency * 1000:.1f}ms last, "
+            f"{writer.max_latency * 1000:.1f}ms max"
+        )
+        if writer.failures:
+            queue += f", {writer.failures} failed"
+        stages = profiling.stats_line()
+        self.query_one(FooterBar).set_stats(f"{stages} · {queue}" if stages else queue)
+
     def _update_popover(self) -> None:
         md = self.query_one(ReviewMarkdown)
         popover = self.query_one(CommentPopover)
@@ -355,8 +462,55 @@ class ReviewApp(App):
         else:
             popover.hide()
 
-    def _notify(self, message: str) -> None:
-        self.notify(message, timeout=3)
+    def _notify(self, message: str, severity: SeverityLevel = "information") -> None:
+        self.notify(message, severity=severity, timeout=3)
+
+    def _save_review(self, index: int, event: dict) -> None:
+        """Persist a review change.
+
+        In journal mode the event is appended to the file's comment journal,
+        which is compacted into the sidecar every JOURNAL_COMPACT_EVENTS
+        events and on exit. Otherwise the whole sidecar is queued for a
+        background write.
+        """
+        path = self._files[index]
+        if not self._journal:
+            self._writer.submit(path, self._reviews[index])
+            return
+        try:
+            append_journal(path, event)
+            count = self._journal_events.get(index, 0) + 1
+            if count >= JOURNAL_COMPACT_EVENTS:
+                compact_journal(path, self._reviews[index])
+                count = 0
+            self._journal_events[index] = count
+        except OSError as e:
+            self.notify(
+                f"Could not save review for {path.name}: {e.strerror or e}",
+                severity="error",
+            )
+
+    def _compact_journals(self) -> None:
+        """Fold every journal written this session into its sidecar."""
+        for index, count in self._journal_events.items():
+            if count:
+                try:
+                    compact_journal(self._files[index], self._reviews[index])
+                except OSError:
+                    pass  # The journal stays and is replayed next time
+        self._journal_events.clear()
+
+    def _on_write_error(self, path: Path, error: Exception) -> None:
+        """Called on the writer thread when a sidecar could not be saved."""
+        reason = getattr(error, "strerror", None) or error
+        try:
+            self.call_from_thread(
+                self._notify,
+                f"Could not save review for {path.name}: {reason}",
+                "error",
+            )
+        except RuntimeError:
+            pass  # App already stopped; the summary still reflects the state
 
     # --- Navigation ---
 
@@ -436,19 +590,20 @@ class ReviewApp(App):
     def action_open_file_selector(self) -> None:
         if self._selecting:
             return
-        file_info = []
-        for i, path in enumerate(self._files):
-            review = self._reviews[i]
-            file_info.append((path, review.status, len(review.comments)))
 
         def on_select(index: int | None) -> None:
+            self._file_selector = None
             if index is not None:
                 self._load_file(index)
 
-        self.push_screen(
-            FileSelector(file_info, self._current_index),
-            callback=on_select,
+        from mdreview.widgets.file_selector import FileSelector, PathIndex
+
+        if self._path_index is None:
+            self._path_index = PathIndex()
+        self._file_selector = FileSelector(
+            self._files, self._reviews, self._current_index, index=self._path_index
         )
+        self.push_screen(self._file_selector, callback=on_select)
 
     # --- Comments ---
 
@@ -491,13 +646,27 @@ class ReviewApp(App):
                 if text:
                     self._add_comment(line_start, line_end, text)
 
+            from mdreview.widgets.comment_input import CommentInput
+
             self.push_screen(CommentInput(line_start, line_end), callback=on_comment)
 
+    def _file_lines(self, index: int) -> Sequence[str]:
+        """Lines of a file, read from disk on access."""
+        lines = self._lines.get(index)
+        if lines is None:
+            try:
+                lines = self._lines[index] = LineIndex(self._files[index])
+            except OSError:
+                return ()  # deleted under us; comments get no anchor
+        return lines
+
     def _add_comment(self, line_start: int, line_end: int, body: str) -> None:
         review = self._reviews[self._current_index]
-        lines = self._lines[self._current_index]
-        add_comment(review, lines, line_start, line_end, body)
-        save_review(self._files[self._current_index], review)
+        lines = self._file_lines(self._current_index)
+        if not review.blocks:
+            review.blocks = fingerprint(lines)  # for re-anchoring after edits
+        comment = add_comment(review, lines, line_start, line_end, body)
+        self._save_review(self._current_index, event_add(comment))
 
         md = self.query_one(ReviewMarkdown)
         md.set_comments(review.comments)
@@ -514,6 +683,8 @@ class ReviewApp(App):
         if len(popover.active_comments) == 1:
             self._do_delete_comment(popover.active_comments[0])
         else:
+            from mdreview.widgets.comment_picker import CommentPicker
+
             self.push_screen(
                 CommentPicker(popover.active_comments, title="Delete which comment?"),
                 callback=lambda c: c and self._do_delete_comment(c),
@@ -522,7 +693,7 @@ class ReviewApp(App):
     def _do_delete_comment(self, comment: Comment) -> None:
         review = self._reviews[self._current_index]
         delete_comment(review, comment.id)
-        save_review(self._files[self._current_index], review)
+        self._save_review(self._current_index, event_delete(comment.id))
 
         md = self.query_one(ReviewMarkdown)
         md.set_comments(review.comments)
@@ -540,6 +711,8 @@ class ReviewApp(App):
         if len(popover.active_comments) == 1:
             self._do_edit_comment(popover.active_comments[0])
         else:
+            from mdreview.widgets.comment_picker import CommentPicker
+
             self.push_screen(
                 CommentPicker(popover.active_comments, title="Edit which comment?"),
                 callback=lambda c: c and self._do_edit_comment(c),
@@ -557,12 +730,14 @@ class ReviewApp(App):
                 review = self._reviews[self._current_index]
                 result = edit_comment(review, comment.id, text)
                 if result:
-                    save_review(self._files[self._current_index], review)
+                    self._save_review(self._current_index, event_edit(result))
                     md = self.query_one(ReviewMarkdown)
                     md.set_comments(review.comments)
                     self._update_popover()
                     self._notify(f"Comment updated ({range_str})")
 
+        from mdreview.widgets.comment_input import CommentInput
+
         self.push_screen(
             CommentInput(
                 comment.line_start,
@@ -585,7 +760,8 @@ class ReviewApp(App):
         def on_confirm(confirmed: bool) -> None:
             if confirmed:
                 deleted = delete_all_comments(review)
-                save_review(self._files[self._current_index], review)
+                self._tally.set(self._current_index, review.status)
+                self._save_review(self._current_index, event_clear())
 
                 md = self.query_one(ReviewMarkdown)
                 md.set_comments(review.comments)
@@ -628,7 +804,8 @@ class ReviewApp(App):
     def _do_approve(self) -> None:
         review = self._reviews[self._current_index]
         approve_file(review)
-        save_review(self._files[self._current_index], review)
+        self._tally.set(self._current_index, review.status)
+        self._save_review(self._current_index, event_status(review))
         self._maybe_save_snapshot()
         self._update_title_bar()
         self._notify(f"Approved: {self._files[self._current_index].name}")
@@ -644,7 +821,8 @@ class ReviewApp(App):
             return
 
         request_changes(review)
-        save_review(self._files[self._current_index], review)
+        self._tally.set(self._current_index, review.status)
+        self._save_review(self._current_index, event_status(review))
         self._maybe_save_snapshot()
         self._update_title_bar()
         self._notify(f"Changes requested: {self._files[self._current_index].name}")
@@ -654,29 +832,45 @@ class ReviewApp(App):
         """Save a snapshot of the current file if content differs from existing snapshot."""
         idx = self._current_index
         path = self._files[idx]
-        content = path.read_text()
-        existing_snapshot = self._snapshots.get(idx)
-        if should_save_snapshot(content, existing_snapshot):
+        rounds = self._snapshot_rounds.get(idx)
+        latest_hash = rounds[-1].content_hash if rounds else None
+        current_hash = hash_file(path, algorithm_of(latest_hash))
+        if should_save_snapshot(current_hash, latest_hash):
+            content, _ = read_content(path)
             save_snapshot(path, content)
-            self._snapshots[idx] = content
+            self._snapshot_rounds[idx] = snapshot_rounds(path)
+            self._diff_round[idx] = -1
             self._diff_available[idx] = False
             self._diff_mode[idx] = False
 
     def _advance_to_next(self) -> None:
         """Move to the next unreviewed file, or stay if all are reviewed."""
-        for i in range(len(self._files)):
-            idx = (self._current_index + 1 + i) % len(self._files)
-            if self._reviews[idx].status == ReviewStatus.UNREVIEWED:
-                self._load_file(idx)
-                return
-
-        # All reviewed - check if we should exit
-        all_reviewed = all(r.status != ReviewStatus.UNREVIEWED for r in self._reviews)
-        if all_reviewed:
+        idx = self._tally.next_unreviewed(self._current_index)
+        if idx is not None:
+            self._load_file(idx)
+        else:
             self._notify("All files reviewed!")
 
     # --- Diff ---
 
+    def _diff_base_hash(self, index: int) -> str | None:
+        """Hash of the snapshot round the file is diffed against, if any."""
+        rounds = self._snapshot_rounds.get(index)
+        if not rounds:
+            return None
+        return rounds[self._diff_round.get(index, -1)].content_hash
+
+    def _refresh_diff_available(self, index: int) -> None:
+        base = self._diff_base_hash(index)
+        current = self._reviews[index].content_hash
+        if base is not None and algorithm_of(base) != algorithm_of(current):
+            # The round was hashed with another algorithm; hash the file with it
+            try:
+                current = hash_file(self._files[index], algorithm_of(base))
+            except OSError:
+                pass
+        self._diff_available[index] = base is not None and base != current
+
     def _apply_diff_if_needed(self) -> None:
         """Compute and apply diff tags if diff mode is on for the current file."""
         idx = self._current_index
@@ -688,14 +882,14 @@ class ReviewApp(App):
         ):
             return
 
-        snapshot = self._snapshots.get(idx)
+        path = self._files[idx]
+        snapshot = load_snapshot(path, self._diff_round.get(idx, -1))
         if snapshot is None:
             return
 
-        path = self._files[idx]
         current_content = path.read_text()
-        snapshot_lines = snapshot.splitlines()
-        current_lines = current_content.splitlines()
+        snapshot_lines = split_lines(snapshot)
+        current_lines = split_lines(current_content)
 
         from textual.widgets._markdown import MarkdownBlock
 
@@ -712,8 +906,7 @@ class ReviewApp(App):
     def action_toggle_diff(self) -> None:
         idx = self._current_index
         if not self._diff_available.get(idx, False):
-            snapshot = self._snapshots.get(idx)
-            if snapshot is None:
+            if not self._snapshot_rounds.get(idx):
                 self._notify("No changes to diff (first review)")
             else:
                 self._notify("No changes since last review")
@@ -723,6 +916,28 @@ class ReviewApp(App):
         self._apply_diff_if_needed()
         self._update_footer()
 
+    def action_cycle_diff_round(self) -> None:
+        """Step the diff base back one review round, wrapping to the latest."""
+        idx = self._current_index
+        rounds = self._snapshot_rounds.get(idx, [])
+        if len(rounds) < 2:
+            self._notify("No earlier review rounds to compare against")
+            return
+
+        current = self._diff_round.get(idx, -1)
+        self._diff_round[idx] = current - 1 if -current < len(rounds) else -1
+        self._refresh_diff_available(idx)
+        number = len(rounds) + self._diff_round[idx] + 1
+
+        if not self._diff_available[idx]:
+            self._diff_mode[idx] = False
+            self._notify(f"No changes since round {number} of {len(rounds)}")
+        else:
+            self._diff_mode[idx] = True
+            self._notify(f"Diff against round {number} of {len(rounds)}")
+        self._apply_diff_if_needed()
+        self._update_footer()
+
     # --- Mermaid ---
 
     def action_open_mermaid(self) -> None:
@@ -738,6 +953,9 @@ class ReviewApp(App):
             diagram = min(diagrams, key=lambda d: abs(d["line_start"] - cursor_line))
         else:
             diagram = diagrams[0]
+
+        import webbrowser
+
         webbrowser.open(diagram["url"])
 
     def action_toggle_mermaid(self) -> None:
@@ -767,15 +985,16 @@ class ReviewApp(App):
                 watch_paths.add(str(f.parent))
 
         async for changes in awatch(*watch_paths):
+            resolved_files = {f.resolve(): i for i, f in enumerate(self._files)}
+            changed_indices: list[int] = []
+
             for change_type, changed_path_str in changes:
                 changed_path = Path(changed_path_str).resolve()
 
                 if change_type == Change.deleted:
                     # Check if it's a watched file
-                    if changed_path in [f.resolve() for f in self._files]:
-                        self.call_from_thread(
-                            self._notify, f"File removed: {changed_path.name}"
-                        )
+                    if changed_path in resolved_files:
+                        self._notify(f"File removed: {changed_path.name}")
                     continue
 
                 # Only care about .md files
@@ -789,13 +1008,19 @@ class ReviewApp(App):
                     continue
 
                 # Check if it's an existing watched file
-                resolved_files = [f.resolve() for f in self._files]
                 if changed_path in resolved_files:
-                    idx = resolved_files.index(changed_path)
-                    self.call_from_thread(self._handle_file_change, idx)
+                    idx = resolved_files[changed_path]
+                    if idx not in changed_indices:
+                        changed_indices.append(idx)
                 elif self._watch_dir and change_type == Change.added:
                     # New file in watched directory
-                    self.call_from_thread(self._handle_new_file, changed_path)
+                    if self._handle_new_file(changed_path):
+                        resolved_files[changed_path] = len(self._files) - 1
+
+            # The file on screen is re-rendered first; the rest go to the pool
+            changed_indices.sort(key=lambda i: i != self._current_index)
+            for idx in changed_indices:
+                self._handle_file_change(idx)
 
     def _stop_file_watcher(self) -> None:
         """Stop the file watcher worker."""
@@ -803,25 +1028,89 @@ class ReviewApp(App):
             self._watcher_worker.cancel()
 
     def _handle_file_change(self, file_index: int) -> None:
+        """Reload a file that changed on disk.
+
+        The file on screen is reloaded and re-rendered immediately. Other
+        files are re-read and reconciled in the reload pool so a burst of
+        changes across a docs tree doesn't block the UI.
+        """
+        if file_index == self._current_index:
+            self._reload_current_file(file_index)
+            return
+
+        if file_index in self._pending_reloads:
+            self._stale_reloads.add(file_index)
+            return
+
+        self._pending_reloads.add(file_index)
+        self.run_worker(
+            self._reload_in_background(file_index),
+            group="reload",
+            exit_on_error=False,
+        )
+
+    async def _reload_in_background(self, file_index: int) -> None:
+        """Reload a non-visible file in the pool and apply the result."""
+        path = self._files[file_index]
+        review = self._reviews[file_index]
+        base_hash = review.content_hash
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._reload_pool,
+                reload_file,
+                path,
+                base_hash,
+                list(review.comments),
+                self._diff_base_hash(file_index),
+                review.blocks,
+            )
+        except OSError:
+            result = None
+        finally:
+            self._pending_reloads.discard(file_index)
+
+        if file_index in self._stale_reloads:
+            # Changed again while we were reading it: start over
+            self._stale_reloads.discard(file_index)
+            self._handle_file_change(file_index)
+            return
+
+        if result is None or not result.changed:
+            return
+
+        if file_index == self._current_index or review.content_hash != base_hash:
+            # The reviewer opened the file meanwhile; take the direct path
+            self._reload_current_file(file_index)
+            return
+
+        apply_reload(review, result)
+        self._lines.pop(file_index, None)
+        self._save_review(file_index, event_content(review))
+        self._diff_available[file_index] = result.diff_available
+        self._diff_mode[file_index] = False
+        self._notify(f"File reloaded: {path.name}")
+
+    def _reload_current_file(self, file_index: int) -> None:
         """Re-read and re-render a file that changed on disk."""
         path = self._files[file_index]
 
         if not path.exists():
             return
 
-        content = path.read_text()
+        with span("app.read", file=path.name):
+            content, new_hash = read_content(path)
         review = self._reviews[file_index]
-        result = handle_content_change(review, content, review.content_hash)
+        result = handle_content_change(review, content, review.content_hash, new_hash)
 
         if not result.changed:
             return
 
-        self._lines[file_index] = result.lines
-        save_review(path, review)
+        self._lines.pop(file_index, None)  # indexed from the old content
+        self._save_review(file_index, event_content(review))
 
         # Update snapshot diff availability
-        snapshot = self._snapshots.get(file_index)
-        self._diff_available[file_index] = snapshot is not None and snapshot != content
+        self._refresh_diff_available(file_index)
         self._diff_mode[file_index] = False
 
         # If this is the currently viewed file, reload it
@@ -829,11 +1118,7 @@ class ReviewApp(App):
             # Save cursor and scroll position before reload
             md = self.query_one(ReviewMarkdown)
             saved_cursor = md.cursor_index
-            try:
-                scroll = self.query_one("#content-scroll", ScrollableContainer)
-                saved_scroll = scroll.scroll_y
-            except Exception:
-                saved_scroll = 0
+            scroll_anchor = md.scroll_anchor()
 
             # Re-render
             if self._mermaid_ascii_on.get(file_index, True):
@@ -841,7 +1126,8 @@ class ReviewApp(App):
             else:
                 processed, diagrams = preprocess_mermaid(content, render_ascii=False)
             self._mermaid_data[file_index] = diagrams
-            md.update(processed)
+            # The widget mounts the blocks on screen first and keeps them in place
+            update = md.update(processed, scroll_anchor)
 
             def restore_after_reload() -> None:
                 md = self.query_one(ReviewMarkdown)
@@ -854,44 +1140,103 @@ class ReviewApp(App):
                 self._update_popover()
                 self._update_title_bar()
                 self._update_footer()
-                # Restore scroll
-                try:
-                    scroll = self.query_one("#content-scroll", ScrollableContainer)
-                    scroll.scroll_y = saved_scroll
-                except Exception:
-                    pass
 
-            self.set_timer(0.1, restore_after_reload)
+            self._after_update(file_index, update, restore_after_reload)
 
         self._notify(f"File reloaded: {path.name}")
 
-    def _handle_new_file(self, new_path: Path) -> None:
-        """Handle a new .md file detected in the watch directory."""
-        resolved = new_path.resolve()
-        if resolved in [f.resolve() for f in self._files]:
-            return  # Already tracked
+    async def _consume_discovery(self, batches: AsyncIterator[list[Path]]) -> None:
+        """Append files from the startup scan as it finds them.
 
-        content = new_path.read_text()
-        idx = len(self._files)
-        self._files.append(resolved)
+        Files are read, hashed and reconciled on the reload pool; only
+        adding them to the session happens on the event loop. Closing the
+        batches, also when this worker is cancelled, stops the scan.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with aclosing(batches):
+                async for batch in batches:
+                    prepared = await loop.run_in_executor(
+                        self._reload_pool, self._prepare_files, batch
+                    )
+                    added = [self._add_file(*new_file) for new_file in prepared]
+                    if not any(added):
+                        continue
+                    self._update_title_bar()
+                    if self._file_selector is not None:
+                        self._file_selector.sync()
+        except (OSError, RuntimeError) as e:
+            # The scan stays incomplete, which the exit summary reports
+            self._notify(f"File scan stopped: {e}", "error")
+            return
+        self._scan_complete = True
+
+    def _prepare_files(
+        self, paths: list[Path]
+    ) -> list[tuple[Path, ReviewFile, list[SnapshotRound]]]:
+        """Load the reviews of files new to the session. Runs off the loop."""
+        return [
+            new_file
+            for new_file in map(self._prepare_file, paths)
+            if new_file is not None
+        ]
+
+    def _prepare_file(
+        self, new_path: Path
+    ) -> tuple[Path, ReviewFile, list[SnapshotRound]] | None:
+        """Read a new file and load its reconciled review and snapshot rounds.
 
+        Returns None if the file is already tracked or cannot be read.
+        """
+        resolved = new_path.resolve()
+        if resolved in self._known_files:
+            return None
+        try:
+            content, content_hash = read_content(resolved)
+        except (OSError, UnicodeDecodeError):
+            return None
         review = load_review(resolved)
-        result = handle_content_change(review, content, review.content_hash)
-        self._lines[idx] = result.lines
+        handle_content_change(review, content, review.content_hash, content_hash)
+        return resolved, review, snapshot_rounds(resolved)
+
+    def _add_file(
+        self, path: Path, review: ReviewFile, rounds: list[SnapshotRound]
+    ) -> bool:
+        """Append a prepared file to the session, unless it is already in it."""
+        if path in self._known_files:
+            return False
+        idx = len(self._files)
+        self._files.append(path)
+        self._known_files.add(path)
         self._reviews.append(review)
+        self._tally.append(review.status)
         self._mermaid_ascii_on[idx] = True
 
-        snapshot = load_snapshot(resolved)
-        self._snapshots[idx] = snapshot
-        self._diff_available[idx] = snapshot is not None and snapshot != content
+        self._snapshot_rounds[idx] = rounds
+        self._diff_round[idx] = -1
+        self._refresh_diff_available(idx)
         self._diff_mode[idx] = False
+        return True
 
+    def _handle_new_file(self, new_path: Path) -> bool:
+        """Handle a new .md file detected in the watch directory.
+
+        Returns True if the file was added to the session.
+        """
+        new_file = self._prepare_file(new_path)
+        if new_file is None or not self._add_file(*new_file):
+            return False
         self._update_title_bar()
+        if self._file_selector is not None:
+            self._file_selector.sync()
         self._notify(f"New file detected: {new_path.name}")
+        return True
 
     # --- Help ---
 
     def action_show_help(self) -> None:
+        from mdreview.widgets.help_overlay import HelpOverlay
+
         self.push_screen(HelpOverlay(keybindings=self._keybindings))
 
     # --- Quit ---
@@ -905,13 +1250,9 @@ class ReviewApp(App):
             self.query_one(FooterBar).set_mode("normal")
             return
 
-        unreviewed = [
-            self._files[i].name
-            for i, r in enumerate(self._reviews)
-            if r.status == ReviewStatus.UNREVIEWED
-        ]
+        unreviewed = self._tally.count(ReviewStatus.UNREVIEWED)
 
-        if unreviewed:
+        if unreviewed or not self._scan_complete:
 
             def on_confirm(confirmed: bool) -> None:
                 if confirmed:
@@ -919,19 +1260,43 @@ class ReviewApp(App):
 
             from mdreview.widgets.confirm import ConfirmDialog
 
-            msg = f"{len(unreviewed)} file(s) not reviewed. Quit anyway?"
+            reasons = []
+            if unreviewed:
+                reasons.append(f"{unreviewed} file(s) not reviewed.")
+            if not self._scan_complete:
+                reasons.append("Still scanning for files.")
+            msg = " ".join(reasons) + " Quit anyway?"
             self.push_screen(ConfirmDialog(msg), callback=on_confirm)
         else:
             self._exit_with_summary()
 
     def _exit_with_summary(self) -> None:
-        self._exit_code = compute_exit_code(self._reviews)
+        if self._discovery_worker is not None:
+            self._discovery_worker.cancel()  # the summary covers what was found
+        # Files the scan has not found yet are unreviewed too
+        self._exit_code = self._tally.exit_code() if self._scan_complete else 2
         self.exit(self._exit_code)
 
     def on_unmount(self) -> None:
         self._stop_file_watcher()
+        self._reload_pool.shutdown(wait=False, cancel_futures=True)
+        parsing.shutdown()
+        self._writer.close()
+        self._compact_journals()
+        if self._daemon is not None:
+            self._daemon.close()
+        stats = self._writer.stats()
+        self.log(
+            f"sidecar writes: {stats.writes} ok, {stats.failures} failed, "
+            f"max latency {stats.max_latency * 1000:.1f}ms"
+        )
         self._print_summary()
+        if stats.failures:
+            print(
+                f"mdreview: {stats.failures} review save(s) failed",
+                file=sys.stderr,
+            )
 
     def _print_summary(self) -> None:
         """Print review summary to stdout after TUI closes."""
-        print(format_summary(self._files, self._reviews))
+        print(format_summary(self._files, self._reviews, self._scan_complete))
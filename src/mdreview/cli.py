@@ -1,35 +1,48 @@
 """CLI entry point for mdreview."""
 
 import sys
-from importlib.metadata import version
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import click
 
 
+def _installed_distribution():
+    """Find the installed mdreview distribution with a fresh metadata scan.
+
+    Caches are invalidated first so a version installed after startup (by
+    ``--update``) is seen instead of the one this process was loaded from.
+    """
+    import importlib
+    from importlib.metadata import distributions
+
+    importlib.invalidate_caches()
+    return next(iter(distributions(name="mdreview", path=sys.path)), None)
+
+
 def detect_install_method() -> str:
-    """Detect how mdreview was installed by inspecting the executable path."""
-    executable = sys.executable
-    if "pipx" in executable:
+    """Detect how mdreview was installed.
+
+    pipx and ``uv tool`` leave a receipt in the environment they manage;
+    otherwise the distribution's INSTALLER record names the tool.
+    """
+    prefix = Path(sys.prefix)
+    if (prefix / "pipx_metadata.json").exists():
         return "pipx"
-    if "uv" in executable and "tools" in executable:
+    if (prefix / "uv-receipt.toml").exists():
         return "uv"
+    dist = _installed_distribution()
+    installer = (dist.read_text("INSTALLER") or "").strip() if dist else ""
+    if installer == "uv":
+        return "uv-pip"
     return "pip"
 
 
 def get_installed_version() -> str:
     """Get the currently installed version, bypassing import cache."""
-    import subprocess
-
-    result = subprocess.run(
-        [sys.executable, "-m", "pip", "show", "mdreview"],
-        capture_output=True,
-        text=True,
-    )
-    for line in result.stdout.splitlines():
-        if line.startswith("Version:"):
-            return line.split(":", 1)[1].strip()
-    return "unknown"
+    dist = _installed_distribution()
+    return dist.version if dist else "unknown"
 
 
 def run_upgrade(method: str) -> int:
@@ -39,6 +52,15 @@ def run_upgrade(method: str) -> int:
     commands = {
         "pipx": ["pipx", "upgrade", "mdreview"],
         "uv": ["uv", "tool", "upgrade", "mdreview"],
+        "uv-pip": [
+            "uv",
+            "pip",
+            "install",
+            "--upgrade",
+            "--python",
+            sys.executable,
+            "mdreview",
+        ],
         "pip": [sys.executable, "-m", "pip", "install", "--upgrade", "mdreview"],
     }
     cmd = commands[method]
@@ -46,44 +68,134 @@ def run_upgrade(method: str) -> int:
     return result.returncode
 
 
-def collect_files(files: tuple[str, ...], directory: str | None) -> list[Path]:
-    """Collect markdown files from positional args and --dir flag."""
-    paths: list[Path] = []
+def iter_files(
+    files: tuple[str, ...],
+    directory: str | None,
+    include: tuple[str, ...] = (),
+    exclude: tuple[str, ...] = (),
+    use_gitignore: bool = True,
+    stop: threading.Event | None = None,
+) -> Iterator[Path]:
+    """Yield markdown files from positional args and --dir flag as they are found.
+
+    Directories are scanned with the ignore-aware walker, which ends early
+    once ``stop`` is set; explicitly named files are always included.
+    """
+    from mdreview.discovery import DEFAULT_INCLUDE, iter_markdown_files
 
+    def scan(d: Path) -> Iterator[Path]:
+        return iter_markdown_files(
+            d,
+            include or DEFAULT_INCLUDE,
+            exclude,
+            use_gitignore=use_gitignore,
+            stop=stop,
+        )
+
+    seen: set[Path] = set()
     for f in files:
         p = Path(f)
         if p.is_file():
-            paths.append(p.resolve())
+            found: Iterable[Path] = [p.resolve()]
         elif p.is_dir():
-            paths.extend(sorted(p.rglob("*.md")))
+            found = scan(p)
         else:
             click.echo(f"Warning: skipping '{f}' (not found)", err=True)
+            continue
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                yield path
 
     if directory:
         d = Path(directory)
         if d.is_dir():
-            paths.extend(sorted(d.rglob("*.md")))
+            for path in scan(d):
+                if path not in seen:
+                    seen.add(path)
+                    yield path
         else:
             click.echo(f"Error: directory '{directory}' not found", err=True)
 
-    # Deduplicate while preserving order
-    seen: set[Path] = set()
-    unique: list[Path] = []
-    for p in paths:
-        resolved = p.resolve()
-        if resolved not in seen:
-            seen.add(resolved)
-            unique.append(resolved)
 
-    return unique
+def collect_files(
+    files: tuple[str, ...],
+    directory: str | None,
+    include: tuple[str, ...] = (),
+    exclude: tuple[str, ...] = (),
+    use_gitignore: bool = True,
+) -> list[Path]:
+    """Collect markdown files from positional args and --dir flag."""
+    return list(iter_files(files, directory, include, exclude, use_gitignore))
+
+
+def history_root(files: tuple[str, ...], directory: str | None) -> Path:
+    """Where ``--history`` keeps its store, whichever way the files were named."""
+    import os
+
+    from mdreview.snapshots import find_store_root
+
+    if directory:
+        start = Path(directory).resolve()
+    else:
+        paths = [Path(f).resolve() for f in files if Path(f).exists()]
+        start = (
+            Path(os.path.commonpath([p if p.is_dir() else p.parent for p in paths]))
+            if paths
+            else Path.cwd()
+        )
+    return find_store_root(start)
+
+
+def _serve_daemon(
+    root: Path, options: tuple, idle_timeout: float, cache_limit: int
+) -> None:
+    """Run the workspace daemon in the foreground until it goes idle."""
+    from mdreview.daemon import DaemonServer, Workspace, socket_path
+
+    include, exclude, use_gitignore = options[:3]
+    path = socket_path(root, *options)
+    workspace = Workspace(root, include, exclude, use_gitignore, cache_limit)
+    try:
+        server = DaemonServer(workspace, path, idle_timeout)
+    except OSError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+    click.echo(
+        f"Serving {len(workspace.files())} file(s) from {workspace.root} on {path}"
+    )
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        pass
 
 
 @click.command()
-@click.version_option(version=version("mdreview"), prog_name="mdreview")
+@click.version_option(package_name="mdreview", prog_name="mdreview")
 @click.argument("files", nargs=-1)
 @click.option(
     "--dir", "directory", default=None, help="Recursively find .md files in directory"
 )
+@click.option(
+    "--include",
+    multiple=True,
+    metavar="GLOB",
+    help="Only collect files matching this gitignore-style glob when "
+    "scanning directories (default: *.md). Repeatable",
+)
+@click.option(
+    "--exclude",
+    multiple=True,
+    metavar="GLOB",
+    help="Skip paths matching this gitignore-style glob when scanning "
+    "directories. Repeatable",
+)
+@click.option(
+    "--no-gitignore",
+    is_flag=True,
+    default=False,
+    help="Scan directories without honouring .gitignore files",
+)
 @click.option(
     "--config",
     "open_config",
@@ -98,11 +210,133 @@ def collect_files(files: tuple[str, ...], directory: str | None) -> list[Path]:
     default=False,
     help="Upgrade mdreview to the latest version and exit",
 )
+@click.option(
+    "--status",
+    "show_status",
+    is_flag=True,
+    default=False,
+    help="Print review status without opening the TUI and exit with the "
+    "review exit code",
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    default=False,
+    help="With --status, print the status as JSON",
+)
+@click.option(
+    "--reconcile",
+    is_flag=True,
+    default=False,
+    help="With --status, re-anchor comments on changed files and save them",
+)
+@click.option(
+    "--daemon",
+    "run_daemon",
+    is_flag=True,
+    default=False,
+    help="Keep --dir scanned and cached in a background process that later "
+    "runs on the same directory connect to",
+)
+@click.option(
+    "--idle-timeout",
+    type=int,
+    default=30,
+    show_default=True,
+    metavar="MINUTES",
+    help="With --daemon, exit after this long without clients",
+)
+@click.option(
+    "--cache-mb",
+    type=int,
+    default=128,
+    show_default=True,
+    help="With --daemon, memory cap for cached hashes, reviews and renders",
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    default=None,
+    envvar="MDREVIEW_PROFILE",
+    metavar="FILE",
+    help="Time each stage and write a Chrome trace to FILE on exit "
+    "(also MDREVIEW_PROFILE)",
+)
+@click.option(
+    "--journal",
+    is_flag=True,
+    default=False,
+    help="Append comment changes to a .review.jsonl journal instead of "
+    "rewriting the sidecar",
+)
+@click.option(
+    "--history",
+    is_flag=True,
+    default=False,
+    help="Keep every review round's snapshot, compressed, in a .mdreview "
+    "directory instead of one .snapshot file per document",
+)
+@click.option(
+    "--hash",
+    "hash_algorithm",
+    type=click.Choice(["sha256", "blake2b", "xxh3"]),
+    default="sha256",
+    show_default=True,
+    envvar="MDREVIEW_HASH",
+    help="Content hash for new reviews and snapshots (also MDREVIEW_HASH). "
+    "xxh3 needs mdreview[fast]; switching makes every file look edited once",
+)
+@click.option(
+    "--store",
+    "store_path",
+    default=None,
+    help="Keep reviews and snapshots in this SQLite file instead of sidecars",
+)
+@click.option(
+    "--import-sidecars",
+    is_flag=True,
+    default=False,
+    help="Copy existing sidecars of the given files into --store and exit",
+)
+@click.option(
+    "--export-sidecars",
+    is_flag=True,
+    default=False,
+    help="Write every review in --store back out as sidecars and exit",
+)
 def main(
-    files: tuple[str, ...], directory: str | None, open_config: bool, do_update: bool
+    files: tuple[str, ...],
+    directory: str | None,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    no_gitignore: bool,
+    open_config: bool,
+    do_update: bool,
+    show_status: bool,
+    as_json: bool,
+    reconcile: bool,
+    run_daemon: bool,
+    idle_timeout: int,
+    cache_mb: int,
+    profile_path: str | None,
+    journal: bool,
+    history: bool,
+    hash_algorithm: str,
+    store_path: str | None,
+    import_sidecars: bool,
+    export_sidecars: bool,
 ) -> None:
     """Review markdown documents with inline comments."""
+    if profile_path:
+        # Before anything instrumented is imported, see mdreview.profiling
+        from mdreview import profiling
+
+        profiling.enable(profile_path)
+
     if do_update:
+        from importlib.metadata import version
+
         current = version("mdreview")
         method = detect_install_method()
         click.echo(f"mdreview {current}, upgrading via {method}...")
@@ -128,7 +362,98 @@ def main(
         subprocess.run([editor, str(config_path)])
         raise SystemExit(0)
 
-    paths = collect_files(files, directory)
+    if hash_algorithm != "sha256":
+        from mdreview.storage import set_hash_algorithm
+
+        try:
+            set_hash_algorithm(hash_algorithm)
+        except ValueError as e:
+            click.echo(f"Error: {e} (pip install mdreview[fast])", err=True)
+            raise SystemExit(2)
+
+    store = None
+    if store_path:
+        from mdreview.sqlite_store import SqliteBackend
+
+        store = SqliteBackend(Path(store_path))
+
+    if import_sidecars or export_sidecars:
+        from mdreview.storage import SidecarBackend, copy_reviews
+
+        if store is None:
+            click.echo(
+                "Error: --import-sidecars/--export-sidecars need --store", err=True
+            )
+            raise SystemExit(2)
+        if import_sidecars:
+            count = copy_reviews(
+                SidecarBackend(),
+                store,
+                collect_files(files, directory, include, exclude, not no_gitignore),
+            )
+            click.echo(f"Imported {count} file(s) into {store_path}")
+        if export_sidecars:
+            count = copy_reviews(store, SidecarBackend(), store.paths())
+            click.echo(f"Exported {count} file(s) from {store_path}")
+        raise SystemExit(0)
+
+    if store is not None:
+        from mdreview.storage import set_backend
+
+        set_backend(store)
+    elif history:
+        from mdreview.snapshots import STORE_DIR, SnapshotStore
+        from mdreview.storage import SidecarBackend, set_backend
+
+        root = history_root(files, directory)
+        set_backend(SidecarBackend(snapshots=SnapshotStore(root / STORE_DIR)))
+
+    daemon_options = (
+        include,
+        exclude,
+        not no_gitignore,
+        str(Path(store_path).resolve()) if store_path else None,
+        history,
+        hash_algorithm,
+    )
+    if run_daemon:
+        if not directory:
+            click.echo("Error: --daemon needs --dir", err=True)
+            raise SystemExit(2)
+        _serve_daemon(
+            Path(directory), daemon_options, idle_timeout * 60, cache_mb * 1024 * 1024
+        )
+        raise SystemExit(0)
+
+    # Reuse a warm daemon for this directory if one is running. --reconcile
+    # writes reviews, which only a local run does.
+    client = None
+    found: Iterator[Path] | None = None
+    if directory and not files and not (show_status and reconcile):
+        from mdreview.daemon import DaemonClient, DaemonError, socket_path
+
+        client = DaemonClient.connect(socket_path(Path(directory), *daemon_options))
+        if client is not None:
+            try:
+                if show_status:
+                    output, code = client.status(as_json)
+                    click.echo(output)
+                    raise SystemExit(code)
+                found = iter(client.files())
+            except (OSError, ValueError, DaemonError):
+                client = None  # the daemon went away: work locally
+
+    # The TUI opens on the first file found; the rest stream in while it runs
+    stop_scan = threading.Event()
+    if found is None:
+        found = iter_files(
+            files, directory, include, exclude, not no_gitignore, stop_scan
+        )
+    if show_status:
+        paths = list(found)
+    else:
+        first = next(found, None)
+        paths = [first] if first is not None else []
 
     if not paths:
         click.echo(
@@ -136,11 +461,24 @@ def main(
         )
         raise SystemExit(2)
 
+    if show_status:
+        from mdreview.headless import run_status
+
+        raise SystemExit(run_status(paths, as_json=as_json, reconcile=reconcile))
+
     from mdreview.app import ReviewApp
+    from mdreview.discovery import stream_batches
     from mdreview.keybindings import load_keybindings
 
     keybindings = load_keybindings()
     watch_dir = Path(directory).resolve() if directory else None
-    app = ReviewApp(paths, watch_dir=watch_dir, keybindings=keybindings)
+    app = ReviewApp(
+        paths,
+        watch_dir=watch_dir,
+        keybindings=keybindings,
+        journal=journal,
+        discovered=stream_batches(found, stop=stop_scan),
+        daemon=client,
+    )
     result = app.run()
     raise SystemExit(result or 0)
@@ -0,0 +1,440 @@
+"""Optional background daemon that keeps one workspace warm between runs.
+
+``mdreview --daemon --dir DIR`` scans DIR once, keeps the file list current
+with watchfiles and answers JSON-lines requests on a Unix socket. Later
+``mdreview --dir DIR`` and ``mdreview --status --dir DIR`` runs ask it for
+the file list, review status and mermaid-preprocessed documents instead of
+recomputing them. Clients fall back to working locally when no daemon is
+listening, so the daemon is never required.
+
+Content hashes, reviews and rendered documents are cached against file stat
+results, so answers stay correct even before the watcher has caught up with
+a change. They share one memory cap and the least recently used go first.
+Parsed markdown tokens are not cached: sending them over the socket costs
+about as much as parsing the rendered text in the client.
+
+The socket lives in a per-user directory that must be owned by the user and
+closed to everyone else; the daemon refuses to serve, and clients refuse to
+connect, otherwise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+from mdreview.models import ReviewFile
+
+IDLE_TIMEOUT = 30 * 60  # Seconds without clients before the daemon exits
+CACHE_LIMIT_MB = 128  # Cap on cached hashes, reviews and rendered documents
+REQUEST_TIMEOUT = 30.0  # Seconds a client waits for one answer
+
+
+class DaemonError(RuntimeError):
+    """The daemon answered a request with an error."""
+
+
+def socket_path(root: Path, *options) -> Path:
+    """Socket for a workspace, keyed by its root and JSON-able options.
+
+    Callers pass everything that changes the answers (scan filters, review
+    store), so runs with different settings never share a daemon.
+    """
+    key = json.dumps([str(root.resolve()), *options])
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(base) / f"mdreview-{uid}" / f"{digest}.sock"
+
+
+def check_socket_dir(directory: Path) -> None:
+    """Raise PermissionError unless only the current user can use ``directory``.
+
+    The fallback location under /tmp is predictable, so another local user
+    could create it first and plant a socket there.
+    """
+    if not hasattr(os, "getuid"):
+        return
+    st = os.lstat(directory)
+    if stat.S_ISLNK(st.st_mode) or not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{directory} is owned by another user")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise PermissionError(f"{directory} is accessible to other users")
+
+
+# --- Client ---
+
+
+class DaemonClient:
+    """One connection to a running daemon. Requests are answered in order."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    @classmethod
+    def connect(cls, path: Path) -> DaemonClient | None:
+        """Connect to the daemon listening on ``path``, or None if there isn't one."""
+        if not hasattr(socket, "AF_UNIX") or not path.exists():
+            return None
+        try:
+            check_socket_dir(path.parent)
+        except OSError:
+            return None  # not a daemon we can trust
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(REQUEST_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def request(self, op: str, **params) -> dict:
+        self._file.write(json.dumps({"op": op, **params}).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+        answer = json.loads(line)
+        if "error" in answer:
+            raise DaemonError(answer["error"])
+        return answer
+
+    def files(self) -> list[Path]:
+        return [Path(p) for p in self.request("files")["files"]]
+
+    def status(self, as_json: bool = False) -> tuple[str, int]:
+        """Printed ``--status`` output and exit code."""
+        answer = self.request("status", json=as_json)
+        return answer["output"], answer["exit_code"]
+
+    def render(self, path: Path, render_ascii: bool) -> tuple[str, list[dict]]:
+        """Mermaid-preprocessed markdown for a file, as ``preprocess_mermaid``."""
+        answer = self.request("render", path=str(path), ascii=render_ascii)
+        return answer["processed"], answer["diagrams"]
+
+
+# --- Server ---
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+_ENTRY_BYTES = 200  # Rough cost of one cache entry or comment besides its text
+
+
+def _review_bytes(review: ReviewFile) -> int:
+    """Rough memory held by a cached review."""
+    return (
+        _ENTRY_BYTES
+        + 64 * len(review.blocks)
+        + sum(_ENTRY_BYTES + len(c.body) + len(c.anchor_text) for c in review.comments)
+    )
+
+
+class Workspace:
+    """Cached state of every file under one root, safe to share between threads."""
+
+    def __init__(
+        self,
+        root: Path,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        use_gitignore: bool = True,
+        cache_limit: int = CACHE_LIMIT_MB * 1024 * 1024,
+    ) -> None:
+        from mdreview.discovery import DEFAULT_INCLUDE
+
+        self.root = root.resolve()
+        self._include = tuple(include) or DEFAULT_INCLUDE
+        self._exclude = tuple(exclude)
+        self._use_gitignore = use_gitignore
+        self._cache_limit = cache_limit
+        self._lock = threading.RLock()
+        self._files: list[Path] = []
+        self._known: set[Path] = set()
+        # ("hash", path) | ("review", path) | ("render", path, render_ascii)
+        #   -> (stat key, value, size), LRU order
+        self._cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._cache_bytes = 0
+        self.rescan()
+
+    def rescan(self) -> None:
+        from mdreview.discovery import iter_markdown_files
+
+        files = list(
+            iter_markdown_files(
+                self.root, self._include, self._exclude, self._use_gitignore
+            )
+        )
+        with self._lock:
+            self._files = files
+            self._known = set(files)
+            for key in [k for k in self._cache if k[1] not in self._known]:
+                self._drop(key)
+
+    def files(self) -> list[Path]:
+        with self._lock:
+            return list(self._files)
+
+    def cache_bytes(self) -> int:
+        with self._lock:
+            return self._cache_bytes
+
+    def _cached(self, key: tuple, stat_key: object) -> object | None:
+        """A cached value still valid for ``stat_key``, or None."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != stat_key:
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key: tuple, stat_key: object, value: object, size: int) -> None:
+        """Cache a value, evicting the least recently used over the limit."""
+        with self._lock:
+            self._drop(key)
+            if size > self._cache_limit:
+                return
+            self._cache[key] = (stat_key, value, size)
+            self._cache_bytes += size
+            while self._cache_bytes > self._cache_limit:
+                self._drop(next(iter(self._cache)))
+
+    def _drop(self, key: tuple) -> None:
+        """Remove a cached value. Called with the lock held."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._cache_bytes -= entry[2]
+
+    def _content_hash(self, path: Path, algorithm: str) -> str:
+        from mdreview.storage import algorithm_of, hash_file
+
+        key = _stat_key(path)
+        cached = self._cached(("hash", path), key)
+        if cached is not None and algorithm_of(cached) == algorithm:
+            return cached
+        content_hash = hash_file(path, algorithm)
+        if key is not None:
+            self._store(
+                ("hash", path), key, content_hash, _ENTRY_BYTES + len(content_hash)
+            )
+        return content_hash
+
+    def _review(self, path: Path) -> ReviewFile:
+        """Load a review, reusing the last one while its sidecar is unchanged.
+
+        Only sidecar reviews are cached; other backends are asked every time.
+        """
+        from mdreview.storage import (
+            SidecarBackend,
+            get_backend,
+            journal_path,
+            load_review,
+            sidecar_path,
+        )
+
+        if not isinstance(get_backend(), SidecarBackend):
+            return load_review(path)
+        key = (_stat_key(sidecar_path(path)), _stat_key(journal_path(path)))
+        cached = self._cached(("review", path), key)
+        if cached is not None:
+            return cached
+        review = load_review(path)
+        self._store(("review", path), key, review, _review_bytes(review))
+        return review
+
+    def status(self, as_json: bool = False) -> dict:
+        from mdreview.headless import FileStatus, format_status
+        from mdreview.operations import compute_exit_code
+        from mdreview.storage import algorithm_of
+
+        statuses = []
+        for path in self.files():
+            review = self._review(path)
+            stored = review.content_hash
+            drifted = bool(stored) and (
+                stored != self._content_hash(path, algorithm_of(stored))
+            )
+            statuses.append(FileStatus(path, review, drifted, False))
+        return {
+            "output": format_status(statuses, as_json),
+            "exit_code": compute_exit_code([s.review for s in statuses]),
+        }
+
+    def render(self, path: Path, render_ascii: bool) -> dict:
+        from mdreview.mermaid import preprocess_mermaid
+
+        with self._lock:
+            if path not in self._known:
+                raise ValueError(f"{path} is not part of this workspace")
+        key = _stat_key(path)
+        cached = self._cached(("render", path, render_ascii), key)
+        if cached is not None:
+            processed, diagrams = cached
+            return {"processed": processed, "diagrams": diagrams}
+
+        processed, diagrams = preprocess_mermaid(
+            path.read_text(), render_ascii=render_ascii
+        )
+        size = sys.getsizeof(processed) + sum(sys.getsizeof(str(d)) for d in diagrams)
+        self._store(("render", path, render_ascii), key, (processed, diagrams), size)
+        return {"processed": processed, "diagrams": diagrams}
+
+    def forget(self, path: Path) -> None:
+        """Drop cached data for a path that changed on disk."""
+        with self._lock:
+            self._drop(("hash", path))
+            self._drop(("render", path, True))
+            self._drop(("render", path, False))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        self.server.client_connected()
+        try:
+            for line in self.rfile:
+                # Anything else is a bug: socketserver prints the traceback
+                # and drops the connection, and the client falls back
+                try:
+                    answer = self.server.dispatch(json.loads(line))
+                except (OSError, ValueError) as e:
+                    answer = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(answer).encode() + b"\n")
+                self.wfile.flush()
+        finally:
+            self.server.client_disconnected()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve one workspace until idle for ``idle_timeout`` seconds."""
+
+    daemon_threads = True
+
+    def __init__(
+        self, workspace: Workspace, path: Path, idle_timeout: float = IDLE_TIMEOUT
+    ) -> None:
+        try:
+            path.parent.mkdir(mode=0o700, parents=True)
+            os.chmod(path.parent, 0o700)  # whatever the umask
+        except FileExistsError:
+            pass
+        check_socket_dir(path.parent)
+        if DaemonClient.connect(path) is not None:
+            raise OSError(f"a daemon is already serving {workspace.root}")
+        path.unlink(missing_ok=True)  # stale socket from a crashed daemon
+        self.workspace = workspace
+        self.path = path
+        self._idle_timeout = idle_timeout
+        self._clients = 0
+        self._last_active = time.monotonic()
+        self._activity = threading.Lock()
+        self._stop = threading.Event()
+        super().__init__(str(path), _Handler)
+        os.chmod(path, 0o600)
+
+    def client_connected(self) -> None:
+        with self._activity:
+            self._clients += 1
+
+    def client_disconnected(self) -> None:
+        with self._activity:
+            self._clients -= 1
+            self._last_active = time.monotonic()
+
+    def idle_for(self) -> float:
+        """Seconds since the last client left, or 0 while one is connected."""
+        with self._activity:
+            if self._clients:
+                return 0.0
+            return time.monotonic() - self._last_active
+
+    def dispatch(self, request: dict) -> dict:
+        with self._activity:
+            self._last_active = time.monotonic()
+        match request.get("op"):
+            case "ping":
+                return {
+                    "root": str(self.workspace.root),
+                    "pid": os.getpid(),
+                    "files": len(self.workspace.files()),
+                    "cache_bytes": self.workspace.cache_bytes(),
+                }
+            case "files":
+                return {"files": [str(p) for p in self.workspace.files()]}
+            case "status":
+                return self.workspace.status(as_json=bool(request.get("json")))
+            case "render":
+                if "path" not in request:
+                    raise ValueError("render needs a path")
+                return self.workspace.render(
+                    Path(request["path"]), bool(request.get("ascii", True))
+                )
+            case "stop":
+                self._stop.set()
+                return {}
+            case op:
+                raise ValueError(f"unknown op {op!r}")
+
+    def _watch(self) -> None:
+        """Keep the file list current and drop caches for changed files."""
+        from watchfiles import Change, watch
+
+        from mdreview.discovery import ALWAYS_SKIP
+
+        for changes in watch(self.workspace.root, stop_event=self._stop):
+            rescan = False
+            for change, changed in changes:
+                path = Path(changed)
+                if ALWAYS_SKIP.intersection(path.parts):
+                    continue
+                self.workspace.forget(path)
+                if change != Change.modified:
+                    rescan = True
+            if rescan:
+                self.workspace.rescan()
+
+    def _watch_idle(self) -> None:
+        while not self._stop.wait(min(1.0, self._idle_timeout)):
+            if self.idle_for() >= self._idle_timeout:
+                self._stop.set()
+        self.shutdown()
+
+    def run(self, watch: bool = True) -> None:
+        """Serve requests until stopped or idle. Removes the socket on exit."""
+        threads = [threading.Thread(target=self._watch_idle, daemon=True)]
+        if watch:
+            threads.append(threading.Thread(target=self._watch, daemon=True))
+        for t in threads:
+            t.start()
+        try:
+            self.serve_forever(poll_interval=0.2)
+        finally:
+            self._stop.set()
+            self.server_close()
+            self.path.unlink(missing_ok=True)
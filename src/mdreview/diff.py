@@ -5,6 +5,9 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 
+from mdreview.fingerprints import Block, fingerprint, match_blocks
+from mdreview.profiling import traced
+
 
 @dataclass
 class RemovedBlock:
@@ -80,6 +83,35 @@ def _refine_replace(
     return changed, new, old_for_line
 
 
+def _line_opcodes(
+    snapshot_lines: list[str], current_lines: list[str]
+) -> list[tuple[str, int, int, int, int]]:
+    """Line-level opcodes like ``SequenceMatcher.get_opcodes()``.
+
+    Blocks with the same fingerprint on both sides are taken as equal, so
+    lines are only compared in the gaps between them: an edit to one
+    paragraph of a long document compares just that paragraph.
+    """
+    pairs = match_blocks(fingerprint(snapshot_lines), fingerprint(current_lines))
+    n, m = len(snapshot_lines), len(current_lines)
+    pairs.append((Block(n, n, ""), Block(m, m, "")))  # sentinel: the final gap
+
+    opcodes = []
+    i = j = 0
+    for old, new in pairs:
+        if i < old.start or j < new.start:
+            matcher = SequenceMatcher(
+                None, snapshot_lines[i : old.start], current_lines[j : new.start]
+            )
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                opcodes.append((tag, i + i1, i + i2, j + j1, j + j2))
+        if old.start < old.end:
+            opcodes.append(("equal", old.start, old.end, new.start, new.end))
+        i, j = old.end, new.end
+    return opcodes
+
+
+@traced("diff.compute")
 def compute_block_diff(
     snapshot_lines: list[str],
     current_lines: list[str],
@@ -98,8 +130,7 @@ def compute_block_diff(
         - List of BlockDiff per block (tag + old content for changed blocks)
         - List of RemovedBlock entries for content deleted between rounds
     """
-    matcher = SequenceMatcher(None, snapshot_lines, current_lines)
-    opcodes = matcher.get_opcodes()
+    opcodes = _line_opcodes(snapshot_lines, current_lines)
 
     # Build line-level classification
     changed_lines: set[int] = set()
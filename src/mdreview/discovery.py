@@ -0,0 +1,360 @@
+"""Find markdown files under a directory, skipping ignored paths.
+
+Directories are pruned as soon as they are seen: a handful of dependency
+and VCS directories are always skipped, ``.gitignore`` files are honoured
+the way git reads them, and user exclude globs apply on top. Top-level
+subtrees are walked in parallel and files stream out one by one, in sorted
+order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import SimpleQueue
+from typing import NamedTuple
+
+DEFAULT_INCLUDE = ("*.md",)
+SCAN_WORKERS = 8  # Threads walking top-level subtrees
+STREAM_BATCH = 64  # Files handed to the app per batch while scanning
+
+# Never worth descending into, whether or not a .gitignore says so.
+ALWAYS_SKIP = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".mdreview",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+    }
+)
+
+
+class Pattern(NamedTuple):
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate a gitignore glob into a regex over '/'-separated paths."""
+    out: list[str] = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        c = glob[i]
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and (end := glob.find("]", i + 2)) != -1:
+            body = glob[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+            continue
+        elif c == "\\" and i + 1 < len(glob):
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_pattern(line: str) -> Pattern | None:
+    """Compile one gitignore-style line. Returns None for blanks and comments.
+
+    A pattern without a '/' (other than a trailing one) matches at any
+    depth; otherwise it is anchored to the directory it belongs to.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    body = _glob_to_regex(line.lstrip("/"))
+    if not anchored:
+        body = "(?:.*/)?" + body
+    return Pattern(re.compile(body), negate, dir_only)
+
+
+class PatternSet:
+    """Gitignore-style patterns, each group scoped to a base directory.
+
+    Later patterns override earlier ones, so a deeper ``.gitignore`` can
+    re-include what a parent excluded. Paths are plain strings from
+    ``os.scandir`` to keep per-entry matching cheap.
+    """
+
+    def __init__(self, groups: tuple[tuple[str, tuple[Pattern, ...]], ...] = ()):
+        self._groups = groups
+
+    @classmethod
+    def from_globs(cls, base: Path, globs: Iterable[str]) -> PatternSet:
+        return cls().extended(str(base), globs)
+
+    def extended(self, base: str, lines: Iterable[str]) -> PatternSet:
+        """A copy with patterns from ``lines`` scoped to ``base`` appended."""
+        patterns = tuple(p for p in map(compile_pattern, lines) if p is not None)
+        if not patterns:
+            return self
+        return PatternSet(self._groups + ((base.rstrip(os.sep) + os.sep, patterns),))
+
+    def with_gitignore(self, directory: str) -> PatternSet:
+        """A copy including ``directory/.gitignore``, if there is one."""
+        try:
+            with open(os.path.join(directory, ".gitignore")) as f:
+                return self.extended(directory, f.read().splitlines())
+        except OSError:
+            return self
+
+    def matches(self, path: str, is_dir: bool) -> bool:
+        """Whether the last pattern matching ``path`` is a positive one."""
+        matched = False
+        for base, patterns in self._groups:
+            if not path.startswith(base):
+                continue
+            rel = path[len(base) :]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+            for pattern in patterns:
+                if pattern.dir_only and not is_dir:
+                    continue
+                if pattern.negate == matched and pattern.regex.fullmatch(rel):
+                    matched = not pattern.negate
+        return matched
+
+
+def _ancestor_gitignores(root: Path) -> PatternSet:
+    """Rules from .gitignore files between the repository root and ``root``."""
+    for top in (root, *root.parents):
+        if (top / ".git").exists():
+            break
+    else:
+        return PatternSet()
+    rules = PatternSet()
+    for directory in reversed(root.parents):
+        if directory.is_relative_to(top):
+            rules = rules.with_gitignore(str(directory))
+    return rules
+
+
+class _Walker:
+    def __init__(
+        self, include: PatternSet, exclude: PatternSet, use_gitignore: bool
+    ) -> None:
+        self.include = include
+        self.exclude = exclude
+        self.use_gitignore = use_gitignore
+
+    def entries(
+        self, directory: str, rules: PatternSet
+    ) -> tuple[list[os.DirEntry], PatternSet]:
+        """Sorted entries of a directory that survive the ignore rules."""
+        if self.use_gitignore:
+            rules = rules.with_gitignore(directory)
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return [], rules
+
+        kept = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if is_dir and entry.name in ALWAYS_SKIP:
+                continue
+            if rules.matches(entry.path, is_dir):
+                continue
+            if self.exclude.matches(entry.path, is_dir):
+                continue
+            if not is_dir and not self.include.matches(entry.path, False):
+                continue
+            kept.append(entry)
+        return kept, rules
+
+    def walk(
+        self, directory: str, rules: PatternSet, stopped: Callable[[], bool]
+    ) -> Iterator[str]:
+        if stopped():
+            return
+        entries, rules = self.entries(directory, rules)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from self.walk(entry.path, rules, stopped)
+            else:
+                yield _file_path(entry)
+
+    def walk_into(
+        self,
+        directory: str,
+        rules: PatternSet,
+        stopped: Callable[[], bool],
+        out: SimpleQueue,
+    ) -> None:
+        """Put each file found under ``directory`` on ``out``, then None."""
+        try:
+            for path in self.walk(directory, rules, stopped):
+                out.put(path)
+        finally:
+            out.put(None)
+
+
+def _file_path(entry: os.DirEntry) -> str:
+    # Directories are never followed and the root is resolved, so only a
+    # symlinked file can have a path other than its real one
+    return os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+
+
+def iter_markdown_files(
+    root: Path,
+    include: Iterable[str] = DEFAULT_INCLUDE,
+    exclude: Iterable[str] = (),
+    use_gitignore: bool = True,
+    workers: int = SCAN_WORKERS,
+    stop: threading.Event | None = None,
+) -> Iterator[Path]:
+    """Yield matching files under ``root`` in sorted path order.
+
+    Include and exclude globs use gitignore syntax relative to ``root``.
+    Paths are resolved, and a file reached through several symlinks is
+    yielded once. Each top-level subdirectory is walked on its own thread;
+    files are yielded as soon as everything sorting before them is known,
+    so the first result does not wait for its whole subtree.
+
+    Setting ``stop``, or closing the iterator, ends the walk early.
+    """
+    root = root.resolve()
+    top = str(root)
+    walker = _Walker(
+        PatternSet.from_globs(root, include),
+        PatternSet.from_globs(root, exclude),
+        use_gitignore,
+    )
+    rules = _ancestor_gitignores(root) if use_gitignore else PatternSet()
+    entries, rules = walker.entries(top, rules)
+    closed = threading.Event()
+
+    def stopped() -> bool:
+        return closed.is_set() or (stop is not None and stop.is_set())
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mdreview-scan")
+    seen: set[str] = set()
+    try:
+        subtrees: dict[str, SimpleQueue[str | None]] = {}
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                found = subtrees[entry.path] = SimpleQueue()
+                pool.submit(walker.walk_into, entry.path, rules, stopped, found)
+        for entry in entries:
+            queue = subtrees.get(entry.path)
+            paths = [_file_path(entry)] if queue is None else iter(queue.get, None)
+            for path in paths:
+                if path not in seen:
+                    seen.add(path)
+                    yield Path(path)
+    finally:
+        closed.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def stream_batches(
+    paths: Iterator[Path],
+    batch_size: int = STREAM_BATCH,
+    stop: threading.Event | None = None,
+) -> AsyncIterator[list[Path]]:
+    """Pull from a blocking path iterator on its own thread, in batches.
+
+    Lets the event loop keep running while a directory scan is in progress.
+    Each path is handed over as soon as it is found; paths found while the
+    consumer is busy make up the next batch, of at most ``batch_size``. The
+    thread is a daemon and checks ``stop`` between paths; closing this
+    generator sets it, so pass the same event to the scan to end the walk
+    too.
+    """
+    loop = asyncio.get_running_loop()
+    if stop is None:
+        stop = threading.Event()
+    lock = threading.Lock()
+    found: list[Path] = []
+    outcome: list[BaseException | None] = []  # set once the iterator ends
+    wake = asyncio.Event()
+
+    def notify() -> None:
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            stop.set()  # the loop is gone
+
+    def pull() -> None:
+        # A bug in the scan keeps its traceback on this thread; the consumer
+        # is only told the scan did not finish
+        error: BaseException | None = RuntimeError("file discovery failed")
+        try:
+            for path in paths:
+                if stop.is_set():
+                    break
+                with lock:
+                    found.append(path)
+                    first = len(found) == 1
+                if first:
+                    notify()
+            error = None
+        except OSError as e:
+            error = e
+        finally:
+            if hasattr(paths, "close"):
+                paths.close()
+            with lock:
+                outcome.append(error)
+            notify()
+
+    threading.Thread(target=pull, name="mdreview-discovery", daemon=True).start()
+    try:
+        while True:
+            await wake.wait()
+            wake.clear()
+            with lock:
+                batch = found[:]
+                found.clear()
+                done = bool(outcome)
+            for i in range(0, len(batch), batch_size):
+                yield batch[i : i + batch_size]
+            if done:
+                if outcome[0] is not None:
+                    raise outcome[0]
+                return
+    finally:
+        stop.set()
@@ -0,0 +1,227 @@
+"""Fingerprints of a document's blocks and of comment anchors.
+
+A document is cut into blocks at blank lines, keeping fenced code whole and
+giving ATX headings a block of their own, and each block is hashed. Two
+versions of a document are compared by lining up the hashes: blocks found
+in both, in the same order, are unchanged and need no closer look.
+
+Comments are fingerprinted by the lines they cover, alone and with a few
+lines of context around them, as polynomial hashes over per-line hashes.
+Those roll, so every window of a document can be hashed in one pass and a
+comment found again with a dictionary lookup.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Callable, Sequence
+from difflib import SequenceMatcher
+from typing import NamedTuple
+
+CONTEXT_LINES = 2  # Lines either side of a comment in its context hash
+
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+_HEADING = re.compile(r" {0,3}#{1,6}(\s|$)")
+
+
+class Block(NamedTuple):
+    start: int  # first line, 0-indexed
+    end: int  # line after the last
+    hash: str
+
+
+def _block_hash(lines: Sequence[str]) -> str:
+    return hashlib.blake2b("\n".join(lines).encode(), digest_size=8).hexdigest()
+
+
+def fingerprint(lines: Sequence[str]) -> list[Block]:
+    """Hash every top-level block of a document."""
+    ranges: list[tuple[int, int]] = []
+    start: int | None = None
+    fence = ""  # opening fence of the code block we are in
+
+    for i, line in enumerate(lines):
+        if fence:
+            m = _FENCE.match(line)
+            if (
+                m
+                and m.group(1)[0] == fence[0]
+                and len(m.group(1)) >= len(fence)
+                and not line[m.end() :].strip()
+            ):
+                ranges.append((start, i + 1))
+                start, fence = None, ""
+            continue
+        if not line.strip():
+            if start is not None:
+                ranges.append((start, i))
+                start = None
+            continue
+        if (m := _FENCE.match(line)) or _HEADING.match(line):
+            if start is not None:
+                ranges.append((start, i))
+            if m:
+                start, fence = i, m.group(1)
+            else:
+                ranges.append((i, i + 1))
+                start = None
+            continue
+        if start is None:
+            start = i
+    if start is not None:
+        ranges.append((start, len(lines)))  # unclosed fences run to the end
+
+    all_lines = lines[:]
+    return [Block(s, e, _block_hash(all_lines[s:e])) for s, e in ranges]
+
+
+def match_blocks(
+    old: Sequence[Block], new: Sequence[Block]
+) -> list[tuple[Block, Block]]:
+    """Pairs of identical blocks, in document order, that survived an edit."""
+    matcher = SequenceMatcher(
+        None, [b.hash for b in old], [b.hash for b in new], autojunk=False
+    )
+    return [
+        (old[m.a + k], new[m.b + k])
+        for m in matcher.get_matching_blocks()
+        for k in range(m.size)
+    ]
+
+
+def line_mapper(
+    old: Sequence[Block], new: Sequence[Block]
+) -> Callable[[int], int | None]:
+    """Map a 0-indexed line of the old document to the new one.
+
+    Only lines inside unchanged blocks map; the rest give None. Blocks that
+    moved also map, when their hash is unique among the unmatched blocks.
+    """
+    pairs = match_blocks(old, new)
+    matched_old = {o.start for o, _ in pairs}
+    matched_new = {n.start for _, n in pairs}
+    moved_old = Counter(b.hash for b in old if b.start not in matched_old)
+    moved_new: dict[str, Block | None] = {}
+    for b in new:
+        if b.start not in matched_new:
+            moved_new[b.hash] = None if b.hash in moved_new else b
+    for b in old:
+        if b.start in matched_old or moved_old[b.hash] != 1:
+            continue
+        target = moved_new.get(b.hash)
+        if target is not None:
+            pairs.append((b, target))
+    pairs.sort()
+    starts = [o.start for o, _ in pairs]
+
+    def remap(line: int) -> int | None:
+        i = bisect_right(starts, line) - 1
+        if i < 0:
+            return None
+        o, n = pairs[i]
+        return n.start + line - o.start if line < o.end else None
+
+    return remap
+
+
+def encode_blocks(blocks: Sequence[Block]) -> str:
+    """Compact ``"start-end hash"`` entries joined by ``;``, for storage.
+
+    One string rather than a list, so an edit to the document changes a
+    single line of a sidecar instead of one line per block.
+    """
+    return ";".join(f"{b.start}-{b.end} {b.hash}" for b in blocks)
+
+
+def decode_blocks(data: str | Sequence[str]) -> list[Block]:
+    """Blocks from :func:`encode_blocks`, or from the list of entries older
+    sidecars and journals stored."""
+    if isinstance(data, str):
+        data = re.split(r"[;\n]", data) if data else []
+    blocks = []
+    for item in data:
+        span, digest = item.split(" ", 1)
+        start, end = span.split("-", 1)
+        blocks.append(Block(int(start), int(end), digest))
+    return blocks
+
+
+# --- Anchors ---
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+
+
+def _line_value(line: str) -> int:
+    digest = hashlib.blake2b(line.strip().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % (_MOD - 1) + 1  # 0 pads the edges
+
+
+def _window_hash(values: Sequence[int]) -> int:
+    h = 0
+    for v in values:
+        h = (h * _BASE + v) % _MOD
+    return h
+
+
+def anchor_hashes(
+    lines: Sequence[str], line_start: int, line_end: int
+) -> tuple[str, str]:
+    """Hashes of a 1-indexed line range, alone and with its context."""
+    start = max(line_start - 1 - CONTEXT_LINES, 0)
+    window = lines[start : line_end + CONTEXT_LINES]
+    values = [_line_value(line) for line in window]
+    before = CONTEXT_LINES - (line_start - 1 - start)
+    after = CONTEXT_LINES - (start + len(values) - line_end)
+    values = [0] * before + values + [0] * after
+    selected = values[CONTEXT_LINES : len(values) - CONTEXT_LINES]
+    return f"{_window_hash(selected):x}", f"{_window_hash(values):x}"
+
+
+class AnchorIndex:
+    """Every window of a document's lines by hash, built per window length."""
+
+    def __init__(self, lines: Sequence[str]) -> None:
+        pad = [0] * CONTEXT_LINES
+        self._values = pad + [_line_value(line) for line in lines] + pad
+        self._tables: dict[int, dict[str, list[int]]] = {}
+
+    def _table(self, length: int) -> dict[str, list[int]]:
+        table = self._tables.get(length)
+        if table is not None:
+            return table
+        table = {}
+        values = self._values
+        if len(values) >= length:
+            top = pow(_BASE, length - 1, _MOD)
+            h = _window_hash(values[:length])
+            table.setdefault(f"{h:x}", []).append(0)
+            for i in range(1, len(values) - length + 1):
+                h = ((h - values[i - 1] * top) * _BASE + values[i + length - 1]) % _MOD
+                table.setdefault(f"{h:x}", []).append(i)
+        self._tables[length] = table
+        return table
+
+    def find(
+        self, anchor_hash: str, context_hash: str | None, length: int
+    ) -> list[int]:
+        """0-indexed starts of ranges of ``length`` lines matching the hashes.
+
+        Matches with the same context are preferred; without any, the lines
+        alone are matched.
+        """
+        if context_hash:
+            # A window of length + 2 context lines starting at i covers the
+            # range starting at line i
+            starts = self._table(length + 2 * CONTEXT_LINES).get(context_hash)
+            if starts:
+                return starts
+        n = len(self._values) - 2 * CONTEXT_LINES
+        return [
+            i - CONTEXT_LINES
+            for i in self._table(length).get(anchor_hash, [])
+            if CONTEXT_LINES <= i <= CONTEXT_LINES + n - length
+        ]
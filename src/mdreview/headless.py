@@ -0,0 +1,111 @@
+"""Review status without the TUI, for CI and scripts.
+
+Only uses storage and operations, so running it never imports Textual.
+"""
+
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from mdreview.lines import split_lines
+from mdreview.models import ReviewFile
+from mdreview.operations import compute_exit_code, format_summary
+from mdreview.storage import (
+    algorithm_of,
+    compact_journal,
+    get_hash_algorithm,
+    hash_file,
+    load_review,
+    read_content,
+    reconcile_drift,
+)
+
+STATUS_WORKERS = 8
+
+
+class FileStatus(NamedTuple):
+    path: Path
+    review: ReviewFile
+    drifted: bool  # content changed since the review was last saved
+    reconciled: bool  # drift was reconciled and the review written back
+
+
+def check_file(path: Path, reconcile: bool = False) -> FileStatus:
+    """Load a file's review and detect drift, optionally reconciling it.
+
+    Comments are re-anchored and the review saved only when ``reconcile``
+    is set, so a plain status check never writes anything.
+    """
+    review = load_review(path)
+    current_hash = hash_file(path, algorithm_of(review.content_hash))
+    drifted = bool(review.content_hash) and review.content_hash != current_hash
+
+    if not (reconcile and drifted):
+        return FileStatus(path, review, drifted, False)
+
+    if review.comments:
+        content, current_hash = read_content(path)
+        reconcile_drift(review, split_lines(content))
+    else:
+        review.blocks = []
+        if algorithm_of(current_hash) != get_hash_algorithm():
+            current_hash = hash_file(path)  # new hashes use the selected one
+    review.content_hash = current_hash
+    compact_journal(path, review)
+    return FileStatus(path, review, drifted, True)
+
+
+def collect_status(
+    paths: list[Path], reconcile: bool = False, workers: int = STATUS_WORKERS
+) -> list[FileStatus]:
+    """Check every file in parallel. Results keep the order of ``paths``."""
+    if len(paths) < 2 or workers < 2:
+        return [check_file(p, reconcile) for p in paths]
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="mdreview-status"
+    ) as pool:
+        return list(pool.map(lambda p: check_file(p, reconcile), paths))
+
+
+def status_to_dict(statuses: list[FileStatus]) -> dict:
+    """JSON-ready report with per-file status and the overall exit code."""
+    reviews = [s.review for s in statuses]
+    return {
+        "exit_code": compute_exit_code(reviews),
+        "files": [
+            {
+                "path": str(s.path),
+                "status": s.review.status.value,
+                "comments": len(s.review.comments),
+                "orphaned": sum(1 for c in s.review.comments if c.orphaned),
+                "drifted": s.drifted,
+                "reconciled": s.reconciled,
+                "reviewed_at": s.review.reviewed_at,
+            }
+            for s in statuses
+        ],
+    }
+
+
+def format_status(
+    statuses: list[FileStatus], as_json: bool = False, reconcile: bool = False
+) -> str:
+    """The text ``--status`` prints: the review summary, or JSON."""
+    if as_json:
+        return json.dumps(status_to_dict(statuses), indent=2)
+    text = format_summary([s.path for s in statuses], [s.review for s in statuses])
+    drifted = sum(1 for s in statuses if s.drifted)
+    if drifted:
+        verb = "reconciled" if reconcile else "changed since last review"
+        text += f"\n  {drifted} file{'s' if drifted != 1 else ''} {verb}"
+    return text
+
+
+def run_status(paths: list[Path], as_json: bool = False, reconcile: bool = False):
+    """Print the review status of ``paths``. Returns the review exit code."""
+    statuses = collect_status(paths, reconcile)
+    print(format_status(statuses, as_json, reconcile))
+    return compute_exit_code([s.review for s in statuses])
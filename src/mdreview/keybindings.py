@@ -5,11 +5,6 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-try:
-    import tomllib
-except ModuleNotFoundError:
-    import tomli as tomllib  # type: ignore[no-redef]
-
 # Action name -> default Textual key string.
 # Action names match ReviewApp.action_* methods (minus the "action_" prefix).
 DEFAULT_BINDINGS: dict[str, str] = {
@@ -30,6 +25,7 @@ DEFAULT_BINDINGS: dict[str, str] = {
     "open_mermaid": "o",
     "toggle_mermaid": "m",
     "toggle_diff": "v",
+    "cycle_diff_round": "V",
     "delete_all_comments": "D",
 }
 
@@ -52,6 +48,7 @@ ACTION_DESCRIPTIONS: dict[str, str] = {
     "open_mermaid": "Open mermaid diagram in browser",
     "toggle_mermaid": "Toggle mermaid ASCII/raw",
     "toggle_diff": "Toggle diff view",
+    "cycle_diff_round": "Diff against an earlier review round",
     "delete_all_comments": "Delete all comments on file",
 }
 
@@ -74,6 +71,7 @@ ACTION_LABELS: dict[str, str] = {
     "open_mermaid": "Open mermaid",
     "toggle_mermaid": "Toggle mermaid",
     "toggle_diff": "Toggle diff",
+    "cycle_diff_round": "Earlier round",
     "delete_all_comments": "Delete all comments",
 }
 
@@ -120,6 +118,11 @@ def load_keybindings(path: Path | None = None) -> dict[str, str]:
     if not path.exists():
         return dict(DEFAULT_BINDINGS)
 
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        import tomli as tomllib  # type: ignore[no-redef]
+
     try:
         with open(path, "rb") as f:
             data = tomllib.load(f)
@@ -0,0 +1,113 @@
+"""Lazy, memory-mapped access to the lines of a file.
+
+A ``LineIndex`` keeps only an array of line offsets, 4 bytes per line for
+files under 4 GiB. Each access maps the file, decodes just the lines asked
+for and unmaps it again. Nothing stays open between accesses, so a session
+can index thousands of files without holding a file descriptor or the
+decoded text of each.
+
+Lines end at ``\\n``, ``\\r\\n`` or ``\\r`` and nowhere else, which is how
+markdown-it numbers the lines in ``token.map``. ``str.splitlines()`` also
+breaks at form feeds, ``\\x85``, ``\\u2028`` and other separators, so text is
+split with ``split_lines`` wherever its line numbers must agree with a
+``LineIndex`` or with the rendered blocks.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+_NEWLINE = re.compile(rb"\r\n?|\n")
+
+
+def split_lines(text: str) -> list[str]:
+    """Lines of ``text``, split the way ``LineIndex`` and markdown-it do."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if not lines[-1]:
+        lines.pop()  # text ends with a newline, or is empty
+    return lines
+
+
+def _line_offsets(data: bytes | mmap.mmap) -> array:
+    """Start offset of every line, followed by the end of the data."""
+    offsets = array("I" if len(data) < 2**32 else "Q", [0])
+    offsets.extend(m.end() for m in _NEWLINE.finditer(data))
+    if offsets[-1] != len(data):
+        offsets.append(len(data))  # last line has no newline
+    return offsets
+
+
+class LineIndex(Sequence[str]):
+    """Read-only lines of a file, decoded on access.
+
+    If the file has changed since the offsets were computed, they are
+    recomputed on the next access, so lines always come from the file as
+    it is on disk.
+    """
+
+    __slots__ = ("path", "_offsets", "_stat")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._offsets = array("I", [0])
+        self._stat: tuple[int, int] | None = None
+        with self._mapped():
+            pass
+
+    @contextmanager
+    def _mapped(self) -> Iterator[bytes | mmap.mmap]:
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            # Empty files cannot be mapped
+            data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if st.st_size else b""
+            )
+            try:
+                if (st.st_size, st.st_mtime_ns) != self._stat:
+                    self._offsets = _line_offsets(data)
+                    self._stat = (st.st_size, st.st_mtime_ns)
+                yield data
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+
+    def _line(self, data: bytes | mmap.mmap, i: int) -> str:
+        raw = data[self._offsets[i] : self._offsets[i + 1]]
+        return raw.rstrip(b"\r\n").decode("utf-8", errors="replace")
+
+    def _count(self) -> int:
+        return len(self._offsets) - 1
+
+    def __len__(self) -> int:
+        st = os.stat(self.path)
+        if (st.st_size, st.st_mtime_ns) != self._stat:
+            with self._mapped():
+                pass
+        return self._count()
+
+    def __getitem__(self, i):
+        with self._mapped() as data:
+            if isinstance(i, slice):
+                return [self._line(data, j) for j in range(*i.indices(self._count()))]
+            if i < 0:
+                i += self._count()
+            if not 0 <= i < self._count():
+                raise IndexError("line index out of range")
+            return self._line(data, i)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._mapped() as data:
+            for i in range(self._count()):
+                yield self._line(data, i)
+
+    def nbytes(self) -> int:
+        """Memory held for the offsets."""
+        return self._offsets.itemsize * len(self._offsets)
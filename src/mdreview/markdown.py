@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
 from collections.abc import Iterable
+from contextlib import aclosing
+from time import perf_counter
+from typing import TYPE_CHECKING
 
-from markdown_it import MarkdownIt
 from textual.await_complete import AwaitComplete
+from textual.containers import ScrollableContainer
 from textual.widgets import Markdown, Static
 from textual.widgets._markdown import (
     HEADINGS,
@@ -28,6 +32,59 @@ from textual.widgets._markdown import (
 )
 
 from mdreview.models import Comment
+from mdreview.parsing import iter_tokens
+from mdreview.profiling import span, traced
+
+if TYPE_CHECKING:
+    from markdown_it.token import Token
+    from rich.style import Style
+    from rich.text import Text
+
+# Blocks are built in batches sized to take about one frame at 30fps, and
+# building yields to the event loop as often, so the screen and input keep
+# updating while a long document mounts
+MOUNT_BUDGET = 1 / 30
+FIRST_BATCH = 20
+MIN_BATCH = 4
+MAX_BATCH = 1000
+
+
+def next_batch_size(
+    size: int, elapsed: float, mounted: int = 0, budget: float = MOUNT_BUDGET
+) -> int:
+    """How many blocks to build next, given that ``size`` took ``elapsed``.
+
+    Growth is capped at double per batch, so one cheap batch of paragraphs
+    doesn't make the next one, full of tables, take many frames. Mounting a
+    batch lays out all the blocks already ``mounted`` again, so once that
+    outweighs the budget, batches grow with the document instead: at least
+    half of what is mounted, which keeps the number of layouts logarithmic.
+    """
+    if elapsed <= 0:
+        size = min(size * 2, MAX_BATCH)
+    else:
+        size = max(MIN_BATCH, min(int(size * budget / elapsed), size * 2, MAX_BATCH))
+    return max(size, mounted // 2)
+
+
+# Inline text is reused between blocks, loads and reloads
+INLINE_CACHE_SIZE = 8192
+# Component styles that build_from_token applies to inline markup
+INLINE_STYLES = ("code_inline", "em", "strong", "s")
+
+# (block type, inline source, link targets, styles) -> text, in LRU order
+_inline_texts: OrderedDict[tuple, Text] = OrderedDict()
+
+
+def _inline_key(block: MarkdownBlock, token: Token, styles: tuple[Style, ...]) -> tuple:
+    # Reference links resolve against definitions elsewhere in the document,
+    # so the same source can link somewhere else
+    targets = tuple(
+        child.attrs.get("href") or child.attrs.get("src", "")
+        for child in token.children or ()
+        if child.type in ("link_open", "image")
+    )
+    return type(block), token.content, targets, styles
 
 
 class DiffPlaceholder(Static):
@@ -44,6 +101,11 @@ class DiffPlaceholder(Static):
     """
 
 
+def _ends_before(block: MarkdownBlock, line: int) -> bool:
+    source_range = getattr(block, "source_range", None)
+    return source_range is None or source_range[1] <= line
+
+
 class ReviewMarkdown(Markdown):
     """Markdown widget that highlights commented blocks and tracks a cursor."""
 
@@ -92,22 +154,31 @@ class ReviewMarkdown(Markdown):
         self._cursor_index: int = 0
         self._comments: list[Comment] = []
         self._diff_tags: list[str] = []
-
-    def update(self, markdown: str) -> AwaitComplete:
-        """Override to attach source_range from token.map onto each block."""
-        parser = (
-            MarkdownIt("gfm-like")
-            if self._parser_factory is None
-            else self._parser_factory()
-        )
-
+        # None uses the shared parser, which can also parse in parallel
+        self._parser = None if self._parser_factory is None else self._parser_factory()
+        self._inline_styles: tuple[Style, ...] = ()  # those the blocks were built with
+        # Block kept at the top of the view while blocks mount above it, its
+        # offset from the top, and the scroll position last set for it
+        self._pin: tuple[MarkdownBlock, int, float | None] | None = None
+
+    def update(
+        self, markdown: str, scroll_anchor: tuple[int, int] | None = None
+    ) -> AwaitComplete:
+        """Override to attach source_range from token.map onto each block.
+
+        With a ``scroll_anchor`` from ``scroll_anchor()``, blocks from the
+        anchored line down are mounted first and scrolled to the top of the
+        view; the blocks above follow, nearest first, without moving it.
+        """
         table_of_contents: list[tuple[int, str, str | None]] = []
+        block_id: int = 0  # runs on across chunks
+        styles = self._inline_styles = self._get_inline_styles()
 
         def parse_markdown(tokens) -> Iterable[MarkdownBlock]:
+            nonlocal block_id
             stack: list[MarkdownBlock] = []
             # Track the token.map for the opening token of each stack level
             map_stack: list[list[int] | None] = []
-            block_id: int = 0
 
             for token in tokens:
                 token_type = token.type
@@ -199,7 +270,7 @@ class ReviewMarkdown(Markdown):
                     else:
                         yield block
                 elif token_type == "inline":
-                    stack[-1].build_from_token(token)
+                    self._build_inline(stack[-1], token, styles)
                 elif token_type in ("fence", "code_block"):
                     fence = MarkdownFence(
                         self, token.content.rstrip(), token.info
@@ -222,34 +293,79 @@ class ReviewMarkdown(Markdown):
         markdown_block = self.query("MarkdownBlock")
 
         async def await_update() -> None:
-            BATCH_SIZE = 200
+            anchor_line = scroll_anchor[0] if scroll_anchor else None
+            # Blocks above the anchor, held back until the view is filled
+            above: list[MarkdownBlock] = []
             batch: list[MarkdownBlock] = []
-            tokens = await asyncio.get_running_loop().run_in_executor(
-                None, parser.parse, markdown
-            )
-
-            async with self.lock:
-                removed: bool = False
-
-                async def mount_batch(batch: list[MarkdownBlock]) -> None:
-                    nonlocal removed
-                    if removed:
-                        await self.mount_all(batch)
-                    else:
-                        with self.app.batch_update():
+            size = FIRST_BATCH
+            async with aclosing(iter_tokens(markdown, self._parser)) as chunks:
+                tokens = await anext(chunks)
+                async with self.lock:
+                    with span("markdown.mount"):
+                        top: MarkdownBlock | None = None  # first block mounted
+                        mounted = 0
+                        clock = tick = perf_counter()
+
+                        async def mount_batch(
+                            batch: list[MarkdownBlock], upward: bool = False
+                        ) -> None:
+                            nonlocal top, size, clock, tick, mounted
+                            # Building the blocks is the part that holds up
+                            # the event loop; mounting them awaits as it goes
+                            size = next_batch_size(
+                                len(batch), perf_counter() - clock, mounted
+                            )
+                            mounted += len(batch)
+                            if top is not None:
+                                await self.mount_all(
+                                    batch, before=top if upward else None
+                                )
+                            else:
+                                with self.app.batch_update():
+                                    await markdown_block.remove()
+                                    await self.mount_all(batch)
+                                if scroll_anchor is not None:
+                                    self._pin = (batch[0], scroll_anchor[1], None)
+                            if top is None or upward:
+                                top = batch[0]
+                            if self._pin is not None:
+                                self.call_after_refresh(self._hold_pin)
+                            clock = tick = perf_counter()
+
+                        # Chunks of a huge document arrive one by one; each
+                        # is mounted while the next is still parsing
+                        while tokens is not None:
+                            for block in parse_markdown(tokens):
+                                if (
+                                    top is None
+                                    and not batch
+                                    and anchor_line is not None
+                                    and _ends_before(block, anchor_line)
+                                ):
+                                    above.append(block)
+                                    continue
+                                batch.append(block)
+                                if len(batch) >= size:
+                                    await mount_batch(batch)
+                                    batch = []
+                                elif perf_counter() - tick > MOUNT_BUDGET:
+                                    await asyncio.sleep(0)  # let input through
+                                    tick = perf_counter()
+                            if batch:
+                                await mount_batch(batch)
+                                batch = []
+                            tokens = await anext(chunks, None)
+                            clock = tick = perf_counter()
+
+                        # Then the blocks above, nearest first
+                        while above:
+                            batch = above[-size:]
+                            del above[-len(batch) :]
+                            await mount_batch(batch, upward=True)
+                        if top is None:
                             await markdown_block.remove()
-                            await self.mount_all(batch)
-                        removed = True
-
-                for block in parse_markdown(tokens):
-                    batch.append(block)
-                    if len(batch) == BATCH_SIZE:
-                        await mount_batch(batch)
-                        batch.clear()
-                if batch:
-                    await mount_batch(batch)
-                if not removed:
-                    await markdown_block.remove()
+                        if self._pin is not None:
+                            self.call_after_refresh(self._hold_pin, True)
 
             self._table_of_contents = table_of_contents
             self.post_message(
@@ -260,6 +376,92 @@ class ReviewMarkdown(Markdown):
 
         return AwaitComplete(await_update())
 
+    def _get_inline_styles(self) -> tuple[Style, ...]:
+        return tuple(
+            self.get_component_rich_style(name, partial=True) for name in INLINE_STYLES
+        )
+
+    def on_resize(self) -> None:
+        if self._pin is not None:
+            self._hold_pin()
+
+    def _build_inline(
+        self, block: MarkdownBlock, token: Token, styles: tuple[Style, ...]
+    ) -> None:
+        """``block.build_from_token(token)``, reusing the text of a block
+        built from the same inline source before."""
+        key = _inline_key(block, token, styles)
+        text = _inline_texts.get(key)
+        if text is None:
+            block.build_from_token(token)
+            _inline_texts[key] = block._text.copy()
+            if len(_inline_texts) > INLINE_CACHE_SIZE:
+                _inline_texts.popitem(last=False)
+        else:
+            _inline_texts.move_to_end(key)
+            block.set_content(text.copy())
+        # Blocks rebuild from _token whenever their styles are updated, which
+        # includes being mounted; notify_style_update below does it instead,
+        # through the memo and only when the inline styles have changed
+        block._token = None
+        block.inline_token = token
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        if self._inline_styles:
+            # Component styles are updated after the widget's own
+            self.call_later(self._restyle_inline)
+
+    def _restyle_inline(self) -> None:
+        styles = self._get_inline_styles()
+        if styles == self._inline_styles:
+            return
+        self._inline_styles = styles
+        for block in self.query(MarkdownBlock):
+            token = getattr(block, "inline_token", None)
+            if token is not None:
+                self._build_inline(block, token, styles)
+
+    @property
+    def _scroller(self) -> ScrollableContainer | None:
+        parent = self.parent
+        return parent if isinstance(parent, ScrollableContainer) else None
+
+    def scroll_anchor(self) -> tuple[int, int] | None:
+        """Where the view is: the source line of the top-level block at the
+        top of it, and how many rows into that block it starts.
+
+        None when the view is at the top of the document.
+        """
+        scroller = self._scroller
+        if scroller is None or not scroller.scroll_y:
+            return None
+        y = scroller.scroll_y - self.virtual_region.y
+        for child in self.children:
+            source_range = getattr(child, "source_range", None)
+            region = child.virtual_region
+            if source_range and region.bottom > y:
+                return source_range[0], max(0, int(y) - region.y)
+        return None
+
+    def _hold_pin(self, release: bool = False) -> None:
+        """Keep the pinned block where it was put as blocks mount above it."""
+        scroller = self._scroller
+        if self._pin is None or scroller is None:
+            return
+        block, offset, expected = self._pin
+        if not block.is_attached or (
+            expected is not None and scroller.scroll_y != expected
+        ):
+            self._pin = None  # replaced, or the user has scrolled away
+            return
+        y = self.virtual_region.y + block.virtual_region.y + offset
+        scroller.scroll_to(y=y, animate=False, immediate=True)
+        # Until layout catches up with the last mounts the scroll is clamped
+        # short of the block; stay pinned so the resize that follows lands it
+        released = release and scroller.scroll_y >= y
+        self._pin = None if released else (block, offset, scroller.scroll_y)
+
     @property
     def blocks(self) -> list[MarkdownBlock]:
         return list(self.query(MarkdownBlock))
@@ -292,6 +494,7 @@ class ReviewMarkdown(Markdown):
         self._comments = comments
         self._update_comment_classes()
 
+    @traced("markdown.diff")
     def apply_diff(self, diffs: list, removed_blocks: list) -> None:
         """Apply diff results: tag blocks, inject old-content and removed placeholders."""
         blocks = self.blocks
@@ -352,6 +555,7 @@ class ReviewMarkdown(Markdown):
             else:
                 block.remove_class("cursor")
 
+    @traced("markdown.comments")
     def _update_comment_classes(self) -> None:
         for block in self.blocks:
             if self._block_has_comment(block):
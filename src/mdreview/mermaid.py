@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import re
 
+from mdreview.profiling import traced
 
 MERMAID_BLOCK_RE = re.compile(r"```mermaid\s*\n(.*?)```", re.DOTALL)
 
 
+@traced("mermaid.render")
 def render_mermaid_ascii(source: str) -> str:
     """Render mermaid source as ASCII art."""
     stripped = source.strip()
@@ -48,6 +50,7 @@ def mermaid_live_url(source: str) -> str:
     return f"https://mermaid.live/edit#base64:{encoded}"
 
 
+@traced("mermaid.preprocess")
 def preprocess_mermaid(
     content: str, render_ascii: bool = True
 ) -> tuple[str, list[dict]]:
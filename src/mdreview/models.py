@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
+if TYPE_CHECKING:
+    from mdreview.fingerprints import Block
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 class ReviewStatus(str, Enum):
     UNREVIEWED = "unreviewed"
@@ -14,24 +22,142 @@ class ReviewStatus(str, Enum):
     CHANGES_REQUESTED = "changes_requested"
 
 
-@dataclass
+def _pack_timestamp(value: str | None) -> int | str | None:
+    """Store a UTC ISO timestamp as integer microseconds since the epoch.
+
+    Only timestamps that format back to exactly the same string are packed,
+    so sidecars round-trip byte for byte; anything else is kept as given.
+    """
+    if value is None:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if dt.utcoffset() != timedelta(0) or dt.isoformat() != value:
+        return value
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _unpack_timestamp(value: int | str | None) -> str | None:
+    if isinstance(value, int):
+        return (_EPOCH + value * _MICROSECOND).isoformat()
+    return value
+
+
+def _now() -> int:
+    return (datetime.now(timezone.utc) - _EPOCH) // _MICROSECOND
+
+
 class Comment:
-    line_start: int
-    line_end: int
-    anchor_text: str
-    body: str
-    id: str = field(default_factory=lambda: uuid4().hex[:8])
-    created_at: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    """A review comment anchored to a line range.
+
+    Slotted to keep per-comment overhead low when a whole workspace is in
+    memory: timestamps are held as integer microseconds and formatted as
+    ISO strings only when read, and anchor text is interned since many
+    comments share the same anchor lines.
+    """
+
+    __slots__ = (
+        "line_start",
+        "line_end",
+        "_anchor_text",
+        "body",
+        "id",
+        "_created_at",
+        "orphaned",
+        "_updated_at",
+        "anchor_hash",
+        "context_hash",
     )
-    orphaned: bool = False  # True if anchor could not be re-matched after drift
-    updated_at: str | None = None
 
+    def __init__(
+        self,
+        line_start: int,
+        line_end: int,
+        anchor_text: str,
+        body: str,
+        id: str | None = None,
+        created_at: str | None = None,
+        orphaned: bool = False,  # True if anchor could not be re-matched after drift
+        updated_at: str | None = None,
+        anchor_hash: str | None = None,  # see mdreview.fingerprints.anchor_hashes
+        context_hash: str | None = None,
+    ) -> None:
+        self.line_start = line_start
+        self.line_end = line_end
+        self.anchor_text = anchor_text
+        self.body = body
+        self.id = id if id is not None else uuid4().hex[:8]
+        self._created_at = _now() if created_at is None else _pack_timestamp(created_at)
+        self.orphaned = orphaned
+        self.updated_at = updated_at
+        self.anchor_hash = anchor_hash
+        self.context_hash = context_hash
+
+    @property
+    def anchor_text(self) -> str:
+        return self._anchor_text
 
-@dataclass
+    @anchor_text.setter
+    def anchor_text(self, value: str) -> None:
+        self._anchor_text = sys.intern(value)
+
+    @property
+    def created_at(self) -> str:
+        return _unpack_timestamp(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self._created_at = _pack_timestamp(value)
+
+    @property
+    def updated_at(self) -> str | None:
+        return _unpack_timestamp(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value: str | None) -> None:
+        self._updated_at = _pack_timestamp(value)
+
+    def _key(self) -> tuple:
+        return (
+            self.line_start,
+            self.line_end,
+            self._anchor_text,
+            self.body,
+            self.id,
+            self.created_at,
+            self.orphaned,
+            self.updated_at,
+            self.anchor_hash,
+            self.context_hash,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return (
+            f"Comment(line_start={self.line_start!r}, line_end={self.line_end!r}, "
+            f"anchor_text={self._anchor_text!r}, body={self.body!r}, "
+            f"id={self.id!r}, created_at={self.created_at!r}, "
+            f"orphaned={self.orphaned!r}, updated_at={self.updated_at!r}, "
+            f"anchor_hash={self.anchor_hash!r}, context_hash={self.context_hash!r})"
+        )
+
+
+@dataclass(slots=True)
 class ReviewFile:
     file: str
     content_hash: str = ""
     status: ReviewStatus = ReviewStatus.UNREVIEWED
     comments: list[Comment] = field(default_factory=list)
     reviewed_at: str | None = None
+    blocks: list[Block] = field(default_factory=list)  # fingerprints at content_hash
+
+    def __post_init__(self) -> None:
+        self.file = sys.intern(self.file)
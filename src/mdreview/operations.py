@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from copy import copy
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import NamedTuple
 
+from mdreview.fingerprints import Block, anchor_hashes, fingerprint
+from mdreview.lines import split_lines
 from mdreview.models import Comment, ReviewFile, ReviewStatus
-from mdreview.storage import compute_hash, reconcile_drift
+from mdreview.storage import (
+    compute_hash,
+    hash_matches,
+    read_content,
+    reconcile_drift,
+)
 
 
 # --- Comment operations ---
@@ -15,18 +26,21 @@ from mdreview.storage import compute_hash, reconcile_drift
 
 def add_comment(
     review: ReviewFile,
-    lines: list[str],
+    lines: Sequence[str],
     line_start: int,
     line_end: int,
     body: str,
 ) -> Comment:
     """Create a comment and append it to the review."""
     anchor = lines[line_start - 1].strip() if line_start - 1 < len(lines) else ""
+    anchor_hash, context_hash = anchor_hashes(lines, line_start, line_end)
     comment = Comment(
         line_start=line_start,
         line_end=line_end,
         anchor_text=anchor,
         body=body,
+        anchor_hash=anchor_hash,
+        context_hash=context_hash,
     )
     review.comments.append(comment)
     return comment
@@ -79,60 +93,201 @@ def request_changes(review: ReviewFile) -> None:
 # --- Snapshot helper ---
 
 
-def should_save_snapshot(content: str, existing_snapshot: str | None) -> bool:
+def should_save_snapshot(current_hash: str, snapshot_hash: str | None) -> bool:
     """Determine whether a snapshot should be saved after a review decision."""
-    return existing_snapshot != content
+    return snapshot_hash != current_hash
 
 
 # --- Exit code ---
 
 
-def compute_exit_code(reviews: list[ReviewFile]) -> int:
-    """Compute exit code: 0=all approved, 1=changes requested, 2=unreviewed."""
-    has_unreviewed = any(r.status == ReviewStatus.UNREVIEWED for r in reviews)
-    if has_unreviewed:
+def _exit_code(counts: Counter[ReviewStatus]) -> int:
+    if counts[ReviewStatus.UNREVIEWED]:
         return 2
-    has_changes = any(r.status == ReviewStatus.CHANGES_REQUESTED for r in reviews)
-    if has_changes:
+    if counts[ReviewStatus.CHANGES_REQUESTED]:
         return 1
     return 0
 
 
+def compute_exit_code(reviews: list[ReviewFile]) -> int:
+    """Compute exit code: 0=all approved, 1=changes requested, 2=unreviewed."""
+    return _exit_code(Counter(r.status for r in reviews))
+
+
+class ReviewTally:
+    """Status counts and sorted unreviewed indices for a session's files.
+
+    Kept current incrementally: ``append`` for each new file and ``set``
+    whenever a file's status may have changed, so counts, the exit code and
+    next-unreviewed lookups never rescan every review.
+    """
+
+    def __init__(self, statuses: Iterable[ReviewStatus] = ()) -> None:
+        self._statuses: list[ReviewStatus] = []
+        self._counts: Counter[ReviewStatus] = Counter()
+        self._unreviewed: list[int] = []  # sorted file indices
+        for status in statuses:
+            self.append(status)
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def append(self, status: ReviewStatus) -> None:
+        if status == ReviewStatus.UNREVIEWED:
+            self._unreviewed.append(len(self._statuses))  # stays sorted
+        self._statuses.append(status)
+        self._counts[status] += 1
+
+    def set(self, index: int, status: ReviewStatus) -> None:
+        old = self._statuses[index]
+        if old == status:
+            return
+        self._statuses[index] = status
+        self._counts[old] -= 1
+        self._counts[status] += 1
+        if old == ReviewStatus.UNREVIEWED:
+            del self._unreviewed[bisect_left(self._unreviewed, index)]
+        elif status == ReviewStatus.UNREVIEWED:
+            insort(self._unreviewed, index)
+
+    def status(self, index: int) -> ReviewStatus:
+        return self._statuses[index]
+
+    def statuses(
+        self, start: int = 0, stop: int | None = None
+    ) -> Sequence[ReviewStatus]:
+        return self._statuses[start:stop]
+
+    def count(self, status: ReviewStatus) -> int:
+        return self._counts[status]
+
+    def next_unreviewed(self, after: int) -> int | None:
+        """First unreviewed index after ``after``, wrapping around; None if none."""
+        if not self._unreviewed:
+            return None
+        pos = bisect_right(self._unreviewed, after)
+        return self._unreviewed[pos % len(self._unreviewed)]
+
+    def exit_code(self) -> int:
+        return _exit_code(self._counts)
+
+
 # --- File change handling ---
 
 
 class ContentChangeResult(NamedTuple):
     changed: bool
     new_hash: str
-    lines: list[str]
 
 
 def handle_content_change(
-    review: ReviewFile, new_content: str, old_hash: str
+    review: ReviewFile, new_content: str, old_hash: str, new_hash: str | None = None
 ) -> ContentChangeResult:
-    """Process a file content change. Reconciles drift if needed."""
-    new_hash = compute_hash(new_content)
-    lines = new_content.splitlines()
+    """Process a file content change. Reconciles drift if needed.
 
-    if new_hash == old_hash:
-        return ContentChangeResult(changed=False, new_hash=old_hash, lines=lines)
+    Pass ``new_hash`` when the content was read with ``read_content`` to
+    avoid hashing it again.
+    """
+    if new_hash is None:
+        new_hash = compute_hash(new_content)
 
+    if hash_matches(old_hash, new_content, new_hash):
+        return ContentChangeResult(changed=False, new_hash=old_hash)
+
+    lines = split_lines(new_content)
     if review.comments:
         reconcile_drift(review, lines)
+    else:
+        review.blocks = fingerprint(lines)
 
     review.content_hash = new_hash
-    return ContentChangeResult(changed=True, new_hash=new_hash, lines=lines)
+    return ContentChangeResult(changed=True, new_hash=new_hash)
+
+
+class ReloadResult(NamedTuple):
+    changed: bool
+    new_hash: str
+    moved: list[Comment]  # reconciled copies of comments whose anchor changed
+    diff_available: bool
+    blocks: list[Block]  # fingerprints of the new content
+
+
+def reload_file(
+    path: Path,
+    old_hash: str,
+    comments: list[Comment],
+    snapshot_hash: str | None,
+    blocks: Sequence[Block] = (),
+) -> ReloadResult:
+    """Re-read a file and reconcile drift on copies of its comments.
+
+    Touches no shared state, so it can run in a worker thread. The caller
+    applies the result with ``apply_reload`` on the UI thread.
+    """
+    content, new_hash = read_content(path)
+    diff_available = snapshot_hash is not None and not hash_matches(
+        snapshot_hash, content, new_hash
+    )
+
+    if hash_matches(old_hash, content, new_hash):
+        return ReloadResult(False, old_hash, [], diff_available, list(blocks))
+
+    scratch = ReviewFile(
+        file=path.name, comments=[copy(c) for c in comments], blocks=list(blocks)
+    )
+    lines = split_lines(content)
+    moved: list[Comment] = []
+    if scratch.comments:
+        reconcile_drift(scratch, lines)
+        for before, after in zip(comments, scratch.comments):
+            if (
+                before.line_start != after.line_start
+                or before.line_end != after.line_end
+                or before.anchor_text != after.anchor_text
+                or before.orphaned != after.orphaned
+                or before.context_hash != after.context_hash
+            ):
+                moved.append(after)
+    else:
+        scratch.blocks = fingerprint(lines)
+
+    return ReloadResult(True, new_hash, moved, diff_available, scratch.blocks)
+
+
+def apply_reload(review: ReviewFile, result: ReloadResult) -> None:
+    """Copy re-anchored positions from a reload result onto the review."""
+    moved = {c.id: c for c in result.moved}
+    for comment in review.comments:
+        update = moved.get(comment.id)
+        if update is None:
+            continue
+        comment.line_start = update.line_start
+        comment.line_end = update.line_end
+        comment.anchor_text = update.anchor_text
+        comment.orphaned = update.orphaned
+        comment.anchor_hash = update.anchor_hash
+        comment.context_hash = update.context_hash
+    review.content_hash = result.new_hash
+    review.blocks = result.blocks
 
 
 # --- Summary ---
 
 
-def format_summary(files: list[Path], reviews: list[ReviewFile]) -> str:
-    """Generate the review summary text."""
+def format_summary(
+    files: list[Path], reviews: list[ReviewFile], scan_complete: bool = True
+) -> str:
+    """Generate the review summary text.
+
+    When the directory scan was stopped early, files it had not found yet
+    count as not reviewed, so the exit code is 2.
+    """
     lines = ["\nReview complete:"]
+    counts: Counter[ReviewStatus] = Counter()
 
     for i, path in enumerate(files):
         review = reviews[i]
+        counts[review.status] += 1
         parent = path.parent.name
         name = f"{parent}/{path.name}" if parent else path.name
 
@@ -152,9 +307,9 @@ def format_summary(files: list[Path], reviews: list[ReviewFile]) -> str:
 
         lines.append(f"  {icon} {name:40s} {label}")
 
-    approved = sum(1 for r in reviews if r.status == ReviewStatus.APPROVED)
-    changes = sum(1 for r in reviews if r.status == ReviewStatus.CHANGES_REQUESTED)
-    unreviewed = sum(1 for r in reviews if r.status == ReviewStatus.UNREVIEWED)
+    approved = counts[ReviewStatus.APPROVED]
+    changes = counts[ReviewStatus.CHANGES_REQUESTED]
+    unreviewed = counts[ReviewStatus.UNREVIEWED]
 
     lines.append("")
     if approved:
@@ -163,8 +318,10 @@ def format_summary(files: list[Path], reviews: list[ReviewFile]) -> str:
         lines.append(f"  {changes} changes requested")
     if unreviewed:
         lines.append(f"  {unreviewed} not reviewed")
+    if not scan_complete:
+        lines.append("  scan stopped before all files were found")
 
-    exit_code = compute_exit_code(reviews)
+    exit_code = _exit_code(counts) if scan_complete else 2
     lines.append(f"\nExit code: {exit_code}")
 
     return "\n".join(lines)
@@ -0,0 +1,273 @@
+"""Markdown parsing for the review widget, in parallel for huge documents.
+
+One ``MarkdownIt`` instance is shared by every parse; building one compiles
+its rule chains, which is wasted work when done per load.
+
+Documents over ``PARALLEL_MIN_CHARS`` are cut into chunks at top-level ATX
+headings, where no block can be open, and the chunks are parsed in a pool
+of worker processes. Workers send the tokens back as plain tuples with
+their ``map`` line ranges already shifted to the chunk's place in the
+document. Chunks arrive in order, so the widget can mount the first one
+while the rest are still parsing. On a single core the chunks are parsed
+one after another in a thread, which still gets the first blocks on
+screen early.
+
+Link reference definitions apply to the whole document, so documents that
+have any are parsed in one piece.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import BrokenExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+from mdreview.profiling import span
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+PARALLEL_MIN_CHARS = 1 << 20  # Smaller documents parse faster in one piece
+CHUNK_CHARS = 1 << 18  # Target chunk size; chunks end at the next heading
+MAX_WORKERS = 4
+
+_NEWLINE = re.compile(r"\r\n?|\n")
+_FENCE = re.compile(r" {0,3}(`{3,}|~{3,})")
+_HEADING = re.compile(r"#{1,6}(\s|$)")
+# Also inside block quotes and list items, where a definition still applies
+# to the whole document
+_REFERENCE = re.compile(r"[ \t>]*(?:(?:[-+*]|\d{1,9}[.)])[ \t]+[ \t>]*)*\[[^\]]+\]:")
+# HTML blocks that may contain blank lines, and what ends them
+_RAW_HTML = (
+    (re.compile(r" {0,3}<(script|pre|style|textarea)(\s|>|$)", re.I), None),
+    (re.compile(r" {0,3}<!--"), "-->"),
+    (re.compile(r" {0,3}<\?"), "?>"),
+    (re.compile(r" {0,3}<!\[CDATA\["), "]]>"),
+    (re.compile(r" {0,3}<![a-z]", re.I), ">"),
+)
+
+_pool: ProcessPoolExecutor | None = None
+
+
+@lru_cache(maxsize=1)
+def gfm_parser() -> MarkdownIt:
+    """The shared parser, with the preset Textual's Markdown widget uses."""
+    return MarkdownIt("gfm-like")
+
+
+def split_chunks(markdown: str, size: int = CHUNK_CHARS) -> list[tuple[int, str]]:
+    """Cut a document into ``(first line, text)`` chunks of about ``size``.
+
+    A chunk ends before an ATX heading in the first column that follows a
+    blank line, outside fenced code and raw HTML. Nothing can continue past
+    such a heading, so each chunk parses the same on its own as it does in
+    the whole document. Returns a single chunk when there is no safe place
+    to cut, or when the document defines link references.
+    """
+    chunks: list[tuple[int, str]] = []
+    start = 0  # offset of the current chunk
+    start_line = 0
+    line_no = 0
+    fence = ""
+    html_end: str | None = None  # closing marker of the raw HTML we are in
+    blank = True  # previous line was blank
+    pos = 0
+    ends = [m.end() for m in _NEWLINE.finditer(markdown)]
+    if not ends or ends[-1] != len(markdown):
+        ends.append(len(markdown))
+
+    for end in ends:
+        line = markdown[pos:end].rstrip("\r\n")
+        if fence:
+            m = _FENCE.match(line)
+            if (
+                m
+                and m.group(1)[0] == fence[0]
+                and len(m.group(1)) >= len(fence)
+                and not line[m.end() :].strip()
+            ):
+                fence = ""
+        elif html_end is not None:
+            if html_end in line.lower():
+                html_end = None
+        elif m := _FENCE.match(line):
+            fence = m.group(1)
+        elif _REFERENCE.match(line):
+            return [(0, markdown)]
+        else:
+            if blank and _HEADING.match(line) and pos - start >= size:
+                chunks.append((start_line, markdown[start:pos]))
+                start, start_line = pos, line_no
+            for opener, closer in _RAW_HTML:
+                if om := opener.match(line):
+                    closer = closer or f"</{om.group(1).lower()}>"
+                    if closer not in line[om.end() :].lower():
+                        html_end = closer
+                    break
+        blank = not line.strip() and not fence
+        pos = end
+        line_no += 1
+
+    chunks.append((start_line, markdown[start:]))
+    return chunks
+
+
+def _rebase(tokens: Sequence[Token], offset: int) -> None:
+    for token in tokens:
+        if token.map:
+            token.map = [token.map[0] + offset, token.map[1] + offset]
+        if token.children:
+            _rebase(token.children, offset)
+
+
+def _encode(tokens: Sequence[Token]) -> list[tuple]:
+    # Tuples of the fields in constructor order pickle several times faster
+    # than Token.as_dict(), and empty dicts are left out
+    return [
+        (
+            t.type,
+            t.tag,
+            t.nesting,
+            t.attrs or None,
+            t.map,
+            t.level,
+            None if t.children is None else _encode(t.children),
+            t.content,
+            t.markup,
+            t.info,
+            t.meta or None,
+            t.block,
+            t.hidden,
+        )
+        for t in tokens
+    ]
+
+
+def decode(data: Sequence[tuple]) -> list[Token]:
+    """Tokens back from what ``parse_chunk`` returns."""
+    return [
+        Token(
+            type_,
+            tag,
+            nesting,
+            attrs or {},
+            map_,
+            level,
+            None if children is None else decode(children),
+            content,
+            markup,
+            info,
+            meta or {},
+            block,
+            hidden,
+        )
+        for (
+            type_,
+            tag,
+            nesting,
+            attrs,
+            map_,
+            level,
+            children,
+            content,
+            markup,
+            info,
+            meta,
+            block,
+            hidden,
+        ) in data
+    ]
+
+
+def _parse_at(text: str, first_line: int) -> list[Token]:
+    tokens = gfm_parser().parse(text)
+    _rebase(tokens, first_line)
+    return tokens
+
+
+def parse_chunk(text: str, first_line: int) -> list[tuple]:
+    """Parse one chunk in a worker; tokens come back serialized and rebased."""
+    return _encode(_parse_at(text, first_line))
+
+
+def _worker_count() -> int:
+    return min(MAX_WORKERS, os.cpu_count() or 1)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Forking a process with Textual's threads running is not safe
+        _pool = ProcessPoolExecutor(
+            max_workers=_worker_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker processes, if any were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def iter_tokens(
+    markdown: str, parser: MarkdownIt | None = None
+) -> AsyncIterator[list[Token]]:
+    """Tokens of a document, one list per chunk, in document order.
+
+    A custom ``parser`` cannot be sent to the workers, so it always parses
+    the whole document in one piece, in a thread.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = (
+        split_chunks(markdown, CHUNK_CHARS)
+        if parser is None and len(markdown) >= PARALLEL_MIN_CHARS
+        else [(0, markdown)]
+    )
+    if len(chunks) == 1:
+        parse = (parser or gfm_parser()).parse
+        with span("markdown.parse", chars=len(markdown)):
+            yield await loop.run_in_executor(None, parse, markdown)
+        return
+
+    if _worker_count() < 2:
+        # Nothing to gain from workers on one core, but chunks still let the
+        # first blocks show early
+        for first_line, text in chunks:
+            with span("markdown.parse", chars=len(text)):
+                yield await loop.run_in_executor(None, _parse_at, text, first_line)
+        return
+
+    pool = _get_pool()
+    futures = [
+        loop.run_in_executor(pool, parse_chunk, text, first_line)
+        for first_line, text in chunks
+    ]
+    try:
+        for (first_line, text), future in zip(chunks, futures):
+            with span("markdown.parse", chars=len(text)):
+                try:
+                    data = await future
+                except BrokenExecutor:
+                    # A worker died (or could not start); parse here instead
+                    shutdown()
+                    yield await loop.run_in_executor(None, _parse_at, text, first_line)
+                    continue
+            # Rebuilding tokens takes a while for big chunks; not on the loop
+            yield await loop.run_in_executor(None, decode, data)
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,163 @@
+"""Write-behind queue that persists review sidecars off the UI thread."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from copy import copy
+from pathlib import Path
+from typing import NamedTuple
+
+from mdreview.models import ReviewFile
+from mdreview.storage import save_review
+
+WRITE_DELAY = 0.25  # Seconds to coalesce mutations before writing a sidecar
+
+
+class WriterStats(NamedTuple):
+    pending: int  # sidecars queued but not yet written
+    writes: int  # sidecars written so far
+    failures: int  # writes that raised
+    last_latency: float  # seconds spent in the most recent write
+    max_latency: float  # slowest write so far
+
+
+def _copy_review(review: ReviewFile) -> ReviewFile:
+    """Detach a review from the UI so the writer thread can serialize it."""
+    return ReviewFile(
+        file=review.file,
+        content_hash=review.content_hash,
+        status=review.status,
+        comments=[copy(c) for c in review.comments],
+        reviewed_at=review.reviewed_at,
+        blocks=review.blocks,
+    )
+
+
+class ReviewWriter:
+    """Coalesce sidecar writes per file and flush them on a background thread.
+
+    ``submit`` only copies the review and queues it; the latest copy for a
+    path wins. A queued sidecar is written at most ``delay`` seconds after
+    its first pending mutation, so bursts of edits cost one write.
+    """
+
+    def __init__(
+        self,
+        delay: float = WRITE_DELAY,
+        on_error: Callable[[Path, Exception], None] | None = None,
+    ) -> None:
+        self._delay = delay
+        self._on_error = on_error
+        self._cond = threading.Condition()
+        self._pending: dict[Path, tuple[ReviewFile, float]] = {}  # path -> (copy, due)
+        self._writing = 0
+        self._flushing = False
+        self._closed = False
+        self._stopped = False  # the thread has exited
+        self._writes = 0
+        self._failures = 0
+        self._last_latency = 0.0
+        self._max_latency = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name="mdreview-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, md_path: Path, review: ReviewFile) -> None:
+        """Queue the current state of a review for writing."""
+        data = _copy_review(review)
+        with self._cond:
+            if self._closed or self._stopped:
+                raise RuntimeError("ReviewWriter is closed")
+            queued = self._pending.get(md_path)
+            due = queued[1] if queued else time.monotonic() + self._delay
+            self._pending[md_path] = (data, due)
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Write everything queued now and wait until it is on disk."""
+        with self._cond:
+            self._flushing = True
+            self._cond.notify()
+            while (self._pending or self._writing) and not self._stopped:
+                self._cond.wait()
+            self._flushing = False
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def stats(self) -> WriterStats:
+        with self._cond:
+            return WriterStats(
+                pending=len(self._pending),
+                writes=self._writes,
+                failures=self._failures,
+                last_latency=self._last_latency,
+                max_latency=self._max_latency,
+            )
+
+    def _take_due(self) -> list[tuple[Path, ReviewFile]]:
+        """Pop queued sidecars that are due. Called with the lock held."""
+        now = time.monotonic()
+        due = [
+            path
+            for path, (_, at) in self._pending.items()
+            if self._flushing or at <= now
+        ]
+        return [(path, self._pending.pop(path)[0]) for path in due]
+
+    def _run(self) -> None:
+        try:
+            self._write_until_closed()
+        finally:
+            # Also when a bug ended the thread, so flush() cannot wait forever
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+
+    def _write_until_closed(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    batch = self._take_due()
+                    if batch or (self._closed and not self._pending):
+                        break
+                    timeout = None
+                    if self._pending:
+                        next_due = min(at for _, at in self._pending.values())
+                        timeout = max(0.0, next_due - time.monotonic())
+                    self._cond.wait(timeout)
+                if not batch:
+                    return
+                self._writing += len(batch)
+
+            for path, review in batch:
+                start = time.perf_counter()
+                error: Exception | None = None
+                saved = False
+                try:
+                    save_review(path, review)
+                    saved = True
+                except (OSError, sqlite3.Error) as e:
+                    error = e
+                finally:
+                    elapsed = time.perf_counter() - start
+                    with self._cond:
+                        self._writing -= 1
+                        if saved:
+                            self._writes += 1
+                        else:
+                            self._failures += 1
+                        self._last_latency = elapsed
+                        self._max_latency = max(self._max_latency, elapsed)
+                        self._cond.notify_all()
+                if error is not None and self._on_error is not None:
+                    self._on_error(path, error)
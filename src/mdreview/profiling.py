@@ -0,0 +1,155 @@
+"""Opt-in timing spans for finding out which stage of a review is slow.
+
+``mdreview --profile trace.json`` (or ``MDREVIEW_PROFILE=trace.json``)
+records spans around file reads, hashing, drift reconciliation, mermaid
+rendering, markdown parsing and mounting, comment highlighting, diffing and
+sidecar writes. On exit they are written in Chrome trace format; open the
+file in chrome://tracing or https://ui.perfetto.dev.
+
+Profiling has to be switched on before the instrumented modules are
+imported: ``traced`` hands functions back unwrapped when it is off, so a
+normal run calls them directly. ``span`` checks a flag per call and is only
+used around once-per-file stages.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import TypeVar
+
+ENV_VAR = "MDREVIEW_PROFILE"
+
+# Spans summarised in the footer stats line, in pipeline order
+FOOTER_STAGES = (
+    "app.read",
+    "storage.hash",
+    "mermaid.preprocess",
+    "markdown.parse",
+    "markdown.mount",
+    "markdown.comments",
+    "diff.compute",
+    "storage.save_review",
+)
+
+F = TypeVar("F", bound=Callable)
+
+_trace_path: Path | None = None
+_events: list[dict] = []  # list.append is atomic, so threads can record freely
+_last: dict[str, float] = {}  # span name -> most recent duration in seconds
+_origin = time.perf_counter_ns()
+_NOOP = nullcontext()
+
+
+def enabled() -> bool:
+    return _trace_path is not None
+
+
+def enable(path: Path | str) -> None:
+    """Start recording spans and write them to ``path`` when the process exits."""
+    global _trace_path
+    if _trace_path is None:
+        atexit.register(_write_at_exit)
+    _trace_path = Path(path)
+
+
+def disable() -> None:
+    """Stop recording and forget everything recorded so far."""
+    global _trace_path
+    _trace_path = None
+    _events.clear()
+    _last.clear()
+
+
+def _record(name: str, start: int, end: int, args: dict | None) -> None:
+    event = {
+        "name": name,
+        "cat": name.partition(".")[0],
+        "ph": "X",
+        "ts": (start - _origin) / 1000,
+        "dur": (end - start) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+    _last[name] = (end - start) / 1e9
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: dict | None) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> _Span:
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _record(self.name, self.start, time.perf_counter_ns(), self.args)
+
+
+def span(name: str, **args):
+    """Context manager timing one stage; ``args`` are shown in the trace viewer."""
+    if _trace_path is None:
+        return _NOOP
+    return _Span(name, args)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator timing every call, or nothing at all when profiling is off."""
+
+    def decorate(fn: F) -> F:
+        if _trace_path is None:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(name, None):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def events() -> list[dict]:
+    return list(_events)
+
+
+def stats_line() -> str:
+    """Latest duration of each footer stage, e.g. ``read 0.2ms · parse 14.1ms``."""
+    return " · ".join(
+        f"{name.partition('.')[2]} {_last[name] * 1000:.1f}ms"
+        for name in FOOTER_STAGES
+        if name in _last
+    )
+
+
+def write_trace(path: Path) -> None:
+    trace = {"traceEvents": events(), "displayTimeUnit": "ms"}
+    path.write_text(json.dumps(trace))
+
+
+def _write_at_exit() -> None:
+    if _trace_path is None:
+        return
+    try:
+        write_trace(_trace_path)
+    except OSError as e:
+        print(f"mdreview: could not write profile: {e}", file=sys.stderr)
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
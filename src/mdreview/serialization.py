@@ -0,0 +1,66 @@
+"""JSON encoding for sidecars and journals, using orjson when installed.
+
+Output is byte-identical to the stdlib ``json`` module with its default
+``ensure_ascii=True``, so sidecars written with or without orjson produce
+no diffs in git. orjson writes non-ASCII characters (and DEL) raw, so
+those are escaped afterwards exactly as ``json`` would escape them.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional: pip install mdreview[fast]
+    _orjson = None
+
+_NON_ASCII = re.compile("[\x7f-\U0010ffff]")
+
+
+def _escape(match: re.Match[str]) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _ascii(raw: bytes) -> str:
+    text = raw.decode()
+    if text.isascii() and "\x7f" not in text:
+        return text
+    return _NON_ASCII.sub(_escape, text)
+
+
+def backend() -> str:
+    """Name of the JSON library in use."""
+    return "orjson" if _orjson is not None else "json"
+
+
+def loads(data: bytes | str) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Same text as ``json.dumps(obj, indent=2)``."""
+    if _orjson is not None:
+        try:
+            return _ascii(_orjson.dumps(obj, option=_orjson.OPT_INDENT_2))
+        except TypeError:  # e.g. lone surrogates or huge ints: let json decide
+            pass
+    return json.dumps(obj, indent=2)
+
+
+def dumps_compact(obj: Any) -> str:
+    """Same text as ``json.dumps(obj, separators=(",", ":"))``."""
+    if _orjson is not None:
+        try:
+            return _ascii(_orjson.dumps(obj))
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"))
@@ -0,0 +1,125 @@
+"""Content-addressed, compressed snapshot store with per-file round history.
+
+Layout under the store root (usually ``<workspace>/.mdreview``)::
+
+    objects/<algo>/<xx>/<rest-of-digest>   zlib-compressed document content
+    history/<relative/path.md>.json        rounds recorded for that document
+
+Identical content is stored once, however many files or rounds share it.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+from uuid import uuid4
+
+STORE_DIR = ".mdreview"
+COMPRESS_LEVEL = 6
+
+
+def find_store_root(start: Path) -> Path:
+    """The directory whose store keeps the history of documents under ``start``.
+
+    The nearest directory with a store already, or else the git toplevel,
+    so a document gets the same history however it was opened. Outside a
+    repository with no store yet, ``start`` itself.
+    """
+    start = start.resolve()
+    if not start.is_dir():
+        start = start.parent
+    for directory in (start, *start.parents):
+        if (directory / STORE_DIR).is_dir() or (directory / ".git").exists():
+            return directory
+    return start
+
+
+class SnapshotRound(NamedTuple):
+    content_hash: str
+    saved_at: str
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file and rename so readers never see partial data."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class SnapshotStore:
+    """Snapshots for every document under one workspace directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _object_path(self, content_hash: str) -> Path:
+        algo, digest = content_hash.split(":", 1)
+        return self.root / "objects" / algo / digest[:2] / digest[2:]
+
+    def _history_path(self, md_path: Path) -> Path:
+        resolved = md_path.resolve()
+        workspace = self.root.resolve().parent
+        try:
+            rel = resolved.relative_to(workspace)
+        except ValueError:
+            rel = Path(*resolved.parts[1:])  # outside the workspace: full path
+        return self.root / "history" / rel.with_name(rel.name + ".json")
+
+    def put(self, content: str) -> str:
+        """Store content if not already present. Returns its hash."""
+        from mdreview.storage import compute_hash
+
+        content_hash = compute_hash(content)
+        self._put(content, content_hash)
+        return content_hash
+
+    def _put(self, content: str, content_hash: str) -> None:
+        path = self._object_path(content_hash)
+        if not path.exists():
+            _write_bytes(path, zlib.compress(content.encode(), COMPRESS_LEVEL))
+
+    def get(self, content_hash: str) -> str | None:
+        path = self._object_path(content_hash)
+        if not path.exists():
+            return None
+        return zlib.decompress(path.read_bytes()).decode()
+
+    def rounds(self, md_path: Path) -> list[SnapshotRound]:
+        """Recorded rounds for a document, oldest first."""
+        path = self._history_path(md_path)
+        if not path.exists():
+            return []
+        data = json.loads(path.read_text())
+        return [SnapshotRound(r["content_hash"], r["saved_at"]) for r in data]
+
+    def record(self, md_path: Path, content: str) -> SnapshotRound:
+        """Store content and append it as a new round unless it matches the last.
+
+        The last round is compared with the algorithm it was hashed with.
+        """
+        from mdreview.storage import compute_hash, hash_matches
+
+        content_hash = compute_hash(content)
+        rounds = self.rounds(md_path)
+        if rounds and hash_matches(rounds[-1].content_hash, content, content_hash):
+            return rounds[-1]
+        self._put(content, content_hash)
+        new = SnapshotRound(content_hash, datetime.now(timezone.utc).isoformat())
+        rounds.append(new)
+        data = [r._asdict() for r in rounds]
+        _write_bytes(
+            self._history_path(md_path), (json.dumps(data, indent=2) + "\n").encode()
+        )
+        return new
+
+    def load(self, md_path: Path, round: int = -1) -> str | None:
+        """Content of a round (negative indexes count back from the latest)."""
+        rounds = self.rounds(md_path)
+        try:
+            return self.get(rounds[round].content_hash)
+        except IndexError:
+            return None
@@ -0,0 +1,235 @@
+"""Workspace-level review store in a single SQLite database.
+
+An alternative to per-file sidecars for large ``--dir`` sessions: every
+review, comment and snapshot round lives in one file, keyed by the
+markdown path relative to the database's directory. Snapshot content is
+zlib-compressed and stored once per content hash.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mdreview.fingerprints import decode_blocks, encode_blocks
+from mdreview.models import Comment, ReviewFile, ReviewStatus
+from mdreview.snapshots import COMPRESS_LEVEL, SnapshotRound
+from mdreview.storage import compute_hash, hash_matches
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    path TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    reviewed_at TEXT,
+    blocks TEXT
+);
+CREATE INDEX IF NOT EXISTS reviews_status ON reviews (status);
+
+CREATE TABLE IF NOT EXISTS comments (
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    line_start INTEGER NOT NULL,
+    line_end INTEGER NOT NULL,
+    anchor_text TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    orphaned INTEGER NOT NULL,
+    updated_at TEXT,
+    anchor_hash TEXT,
+    context_hash TEXT,
+    PRIMARY KEY (path, position)
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_blobs (
+    content_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshot_rounds (
+    path TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    PRIMARY KEY (path, round)
+);
+"""
+
+
+class SqliteBackend:
+    """Review backend storing everything in one SQLite file.
+
+    The connection is shared between the UI and the sidecar writer thread,
+    so every statement runs under a lock.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._root = db_path.resolve().parent
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _key(self, md_path: Path) -> str:
+        """Store paths relative to the database so the tree can be moved."""
+        resolved = md_path.resolve()
+        try:
+            return resolved.relative_to(self._root).as_posix()
+        except ValueError:
+            return resolved.as_posix()
+
+    def paths(self) -> list[Path]:
+        """Markdown paths with a stored review or snapshot."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM reviews"
+                " UNION SELECT path FROM snapshot_rounds ORDER BY 1"
+            ).fetchall()
+        return [self._root / key for (key,) in rows]
+
+    def load_review(self, md_path: Path) -> ReviewFile | None:
+        key = self._key(md_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file, content_hash, status, reviewed_at, blocks"
+                " FROM reviews WHERE path = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            comment_rows = self._conn.execute(
+                "SELECT id, line_start, line_end, anchor_text, body, created_at,"
+                " orphaned, updated_at, anchor_hash, context_hash"
+                " FROM comments WHERE path = ? ORDER BY position",
+                (key,),
+            ).fetchall()
+        file, content_hash, status, reviewed_at, blocks = row
+        comments = [
+            Comment(
+                id=cid,
+                line_start=line_start,
+                line_end=line_end,
+                anchor_text=anchor_text,
+                body=body,
+                created_at=created_at,
+                orphaned=bool(orphaned),
+                updated_at=updated_at,
+                anchor_hash=anchor_hash,
+                context_hash=context_hash,
+            )
+            for (
+                cid,
+                line_start,
+                line_end,
+                anchor_text,
+                body,
+                created_at,
+                orphaned,
+                updated_at,
+                anchor_hash,
+                context_hash,
+            ) in comment_rows
+        ]
+        return ReviewFile(
+            file=file,
+            content_hash=content_hash,
+            status=ReviewStatus(status),
+            comments=comments,
+            reviewed_at=reviewed_at,
+            blocks=decode_blocks(blocks or ""),
+        )
+
+    def save_review(self, md_path: Path, review: ReviewFile) -> None:
+        key = self._key(md_path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reviews"
+                " (path, file, content_hash, status, reviewed_at, blocks)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    review.file,
+                    review.content_hash,
+                    review.status.value,
+                    review.reviewed_at,
+                    encode_blocks(review.blocks) or None,
+                ),
+            )
+            self._conn.execute("DELETE FROM comments WHERE path = ?", (key,))
+            self._conn.executemany(
+                "INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        position,
+                        c.id,
+                        c.line_start,
+                        c.line_end,
+                        c.anchor_text,
+                        c.body,
+                        c.created_at,
+                        int(c.orphaned),
+                        c.updated_at,
+                        c.anchor_hash,
+                        c.context_hash,
+                    )
+                    for position, c in enumerate(review.comments)
+                ],
+            )
+
+    def _insert_round(self, key: str, content: str, saved_at: str) -> SnapshotRound:
+        """Store content and append a round unless it matches the latest one."""
+        content_hash = compute_hash(content)
+        latest = self._conn.execute(
+            "SELECT round, content_hash FROM snapshot_rounds"
+            " WHERE path = ? ORDER BY round DESC LIMIT 1",
+            (key,),
+        ).fetchone()
+        if latest and hash_matches(latest[1], content, content_hash):
+            return SnapshotRound(latest[1], saved_at)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO snapshot_blobs (content_hash, data) VALUES (?, ?)",
+            (content_hash, zlib.compress(content.encode(), COMPRESS_LEVEL)),
+        )
+        self._conn.execute(
+            "INSERT INTO snapshot_rounds VALUES (?, ?, ?, ?)",
+            (key, latest[0] + 1 if latest else 0, content_hash, saved_at),
+        )
+        return SnapshotRound(content_hash, saved_at)
+
+    def snapshot_rounds(self, md_path: Path) -> list[SnapshotRound]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT content_hash, saved_at FROM snapshot_rounds"
+                " WHERE path = ? ORDER BY round",
+                (self._key(md_path),),
+            ).fetchall()
+        return [SnapshotRound(*row) for row in rows]
+
+    def load_snapshot(self, md_path: Path, round: int = -1) -> str | None:
+        rounds = self.snapshot_rounds(md_path)
+        try:
+            content_hash = rounds[round].content_hash
+        except IndexError:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM snapshot_blobs WHERE content_hash = ?",
+                (content_hash,),
+            ).fetchone()
+        return zlib.decompress(row[0]).decode() if row else None
+
+    def save_snapshot(self, md_path: Path, content: str) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            self._insert_round(self._key(md_path), content, now)
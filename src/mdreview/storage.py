@@ -1,98 +1,535 @@
-"""Read/write .review.json sidecar files and handle anchor drift."""
+"""Persist reviews and snapshots, replay comment journals, handle anchor drift.
+
+Reviews are stored through a pluggable backend: per-file sidecars by
+default, or a workspace-level store (see ``mdreview.sqlite_store``).
+"""
 
 from __future__ import annotations
 
 import hashlib
 import json
+import os
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
 from difflib import SequenceMatcher
+from functools import partial
 from pathlib import Path
+from typing import Any, Protocol
+from uuid import uuid4
 
+from mdreview import serialization
+from mdreview.fingerprints import (
+    AnchorIndex,
+    anchor_hashes,
+    decode_blocks,
+    encode_blocks,
+    fingerprint,
+    line_mapper,
+)
 from mdreview.models import Comment, ReviewFile, ReviewStatus
+from mdreview.profiling import traced
+from mdreview.snapshots import SnapshotRound, SnapshotStore
+
+try:
+    import xxhash as _xxhash
+except ImportError:  # optional: pip install mdreview[fast]
+    _xxhash = None
 
 DRIFT_THRESHOLD = 0.6  # Minimum similarity ratio to accept a fuzzy re-anchor
+JOURNAL_COMPACT_EVENTS = 200  # Journal events before folding into the sidecar
+HASH_CHUNK = 1 << 20  # Bytes read at a time when only the hash is needed
+
+# Hashes are tagged "<name>:<hexdigest>", so a stored hash names its algorithm
+HASH_ALGORITHMS: dict[str, Callable[..., Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": partial(hashlib.blake2b, digest_size=32),
+}
+if _xxhash is not None:
+    HASH_ALGORITHMS["xxh3"] = _xxhash.xxh3_128
+
+_hash_algorithm = "sha256"
+
+
+def get_hash_algorithm() -> str:
+    return _hash_algorithm
+
+
+def set_hash_algorithm(name: str) -> None:
+    """Hash new content with a different algorithm.
+
+    Stored hashes are still checked with the algorithm their tag names, so
+    existing sidecars and snapshots keep validating.
+    """
+    global _hash_algorithm
+    if name not in HASH_ALGORITHMS:
+        raise ValueError(f"unknown or unavailable hash algorithm: {name}")
+    _hash_algorithm = name
+
+
+def _universal_newlines(data: bytes) -> bytes:
+    """Translate CRLF and lone CR line endings to LF, as read_text() does."""
+    if b"\r" not in data:
+        return data
+    return data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+
+def algorithm_of(content_hash: str | None) -> str:
+    """The algorithm a stored hash was tagged with.
+
+    Untagged or empty hashes, and algorithms that are not available here,
+    give the selected algorithm.
+    """
+    name = content_hash.partition(":")[0] if content_hash else ""
+    return name if name in HASH_ALGORITHMS else _hash_algorithm
+
 
+@traced("storage.hash")
+def hash_bytes(data: bytes, algorithm: str | None = None) -> str:
+    name = algorithm or _hash_algorithm
+    return f"{name}:{HASH_ALGORITHMS[name](data).hexdigest()}"
 
-def compute_hash(content: str) -> str:
-    return "sha256:" + hashlib.sha256(content.encode()).hexdigest()
+
+def compute_hash(content: str, algorithm: str | None = None) -> str:
+    return hash_bytes(content.encode(), algorithm)
+
+
+def hash_matches(stored: str | None, content: str, content_hash: str) -> bool:
+    """Whether ``stored`` is the hash of ``content``, whose hash under the
+    selected algorithm is ``content_hash``.
+
+    Only hashes ``content`` again when ``stored`` uses another algorithm.
+    """
+    if not stored:
+        return False
+    algorithm = algorithm_of(stored)
+    if algorithm == algorithm_of(content_hash):
+        return stored == content_hash
+    return compute_hash(content, algorithm) == stored
+
+
+@traced("storage.hash")
+def hash_file(path: Path, algorithm: str | None = None) -> str:
+    """Hash of a document as read_text() would return it, without decoding.
+
+    The file is streamed, so this is cheap when the text itself isn't needed.
+    Pass ``algorithm_of(stored)`` to check a stored hash.
+    """
+    name = algorithm or _hash_algorithm
+    h = HASH_ALGORITHMS[name]()
+    with open(path, "rb") as f:
+        carry = b""  # a trailing CR may be the first half of a CRLF
+        while chunk := f.read(HASH_CHUNK):
+            chunk = carry + chunk
+            carry = b"\r" if chunk.endswith(b"\r") else b""
+            h.update(_universal_newlines(chunk[: len(chunk) - len(carry)]))
+        h.update(_universal_newlines(carry))
+    return f"{name}:{h.hexdigest()}"
+
+
+def read_content(path: Path) -> tuple[str, str]:
+    """A document's text, as read_text() would return it, and its hash.
+
+    The file is read once and the hash taken from the bytes, not re-encoded
+    from the text.
+    """
+    data = _universal_newlines(path.read_bytes())
+    return data.decode(), hash_bytes(data)
 
 
 def sidecar_path(md_path: Path) -> Path:
     return md_path.with_suffix(md_path.suffix + ".review.json")
 
 
-def load_review(md_path: Path) -> ReviewFile:
-    """Load the review sidecar for a markdown file, or create a fresh one."""
-    sp = sidecar_path(md_path)
-    if not sp.exists():
-        return ReviewFile(file=md_path.name)
-
-    data = json.loads(sp.read_text())
-    comments = [Comment(**c) for c in data.get("comments", [])]
-    status = ReviewStatus(data.get("status", "unreviewed"))
+def review_from_dict(data: dict, md_path: Path) -> ReviewFile:
     return ReviewFile(
         file=data.get("file", md_path.name),
         content_hash=data.get("content_hash", ""),
-        status=status,
-        comments=comments,
+        status=ReviewStatus(data.get("status", "unreviewed")),
+        comments=[Comment(**c) for c in data.get("comments", [])],
         reviewed_at=data.get("reviewed_at"),
+        blocks=decode_blocks(data.get("blocks", [])),
     )
 
 
-def save_review(md_path: Path, review: ReviewFile) -> None:
-    """Write the review sidecar to disk."""
-    sp = sidecar_path(md_path)
+def review_to_dict(review: ReviewFile) -> dict:
     data = {
         "file": review.file,
         "content_hash": review.content_hash,
         "status": review.status.value,
-        "comments": [
-            {
-                "id": c.id,
-                "line_start": c.line_start,
-                "line_end": c.line_end,
-                "anchor_text": c.anchor_text,
-                "body": c.body,
-                "created_at": c.created_at,
-                "orphaned": c.orphaned,
-                "updated_at": c.updated_at,
-            }
-            for c in review.comments
-        ],
+        "comments": [comment_to_dict(c) for c in review.comments],
         "reviewed_at": review.reviewed_at,
     }
-    sp.write_text(json.dumps(data, indent=2) + "\n")
+    if review.blocks:
+        data["blocks"] = encode_blocks(review.blocks)
+    return data
+
+
+def comment_to_dict(c: Comment) -> dict:
+    return {
+        "id": c.id,
+        "line_start": c.line_start,
+        "line_end": c.line_end,
+        "anchor_text": c.anchor_text,
+        "body": c.body,
+        "created_at": c.created_at,
+        "orphaned": c.orphaned,
+        "updated_at": c.updated_at,
+        "anchor_hash": c.anchor_hash,
+        "context_hash": c.context_hash,
+    }
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """Write text via a temp file in the same directory and os.replace it in.
+
+    Readers see either the old file or the new one, never a partial write.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def snapshot_path(md_path: Path) -> Path:
     return md_path.with_suffix(md_path.suffix + ".snapshot")
 
 
-def load_snapshot(md_path: Path) -> str | None:
-    """Load the snapshot content for a markdown file, or None if not found."""
-    sp = snapshot_path(md_path)
-    if not sp.exists():
-        return None
-    return sp.read_text()
+# --- Backends ---
+
+
+class ReviewBackend(Protocol):
+    """Where reviews and snapshots for markdown files are kept."""
+
+    def load_review(self, md_path: Path) -> ReviewFile | None:
+        """Return the stored review, or None if the file has none."""
+        ...
+
+    def save_review(self, md_path: Path, review: ReviewFile) -> None: ...
+
+    def load_snapshot(self, md_path: Path, round: int = -1) -> str | None:
+        """Return a snapshot round (default: latest), or None."""
+        ...
+
+    def save_snapshot(self, md_path: Path, content: str) -> None:
+        """Record content as the latest snapshot round."""
+        ...
+
+    def snapshot_rounds(self, md_path: Path) -> list[SnapshotRound]: ...
+
+
+class SidecarBackend:
+    """A .review.json sidecar next to each markdown file.
+
+    Snapshots go to a content-addressed SnapshotStore keeping every round
+    when one is given, otherwise to a single .snapshot file per document.
+    A legacy .snapshot file is still read when the store has no history.
+    """
+
+    def __init__(self, snapshots: SnapshotStore | None = None) -> None:
+        self.snapshots = snapshots
+
+    def load_review(self, md_path: Path) -> ReviewFile | None:
+        sp = sidecar_path(md_path)
+        if not sp.exists():
+            return None
+        return review_from_dict(serialization.loads(sp.read_bytes()), md_path)
+
+    def save_review(self, md_path: Path, review: ReviewFile) -> None:
+        data = review_to_dict(review)
+        _atomic_write(sidecar_path(md_path), serialization.dumps_pretty(data) + "\n")
+
+    def load_snapshot(self, md_path: Path, round: int = -1) -> str | None:
+        if self.snapshots is not None and self.snapshots.rounds(md_path):
+            return self.snapshots.load(md_path, round)
+        sp = snapshot_path(md_path)
+        if round not in (0, -1) or not sp.exists():
+            return None
+        return sp.read_text()
+
+    def save_snapshot(self, md_path: Path, content: str) -> None:
+        if self.snapshots is not None:
+            self.snapshots.record(md_path, content)
+        else:
+            _atomic_write(snapshot_path(md_path), content)
+
+    def snapshot_rounds(self, md_path: Path) -> list[SnapshotRound]:
+        if self.snapshots is not None:
+            rounds = self.snapshots.rounds(md_path)
+            if rounds:
+                return rounds
+        sp = snapshot_path(md_path)
+        if not sp.exists():
+            return []
+        saved_at = datetime.fromtimestamp(sp.stat().st_mtime, timezone.utc)
+        return [SnapshotRound(hash_file(sp), saved_at.isoformat())]
+
+
+_backend: ReviewBackend = SidecarBackend()
+
+
+def get_backend() -> ReviewBackend:
+    return _backend
+
+
+def set_backend(backend: ReviewBackend) -> None:
+    """Route load/save of reviews and snapshots through a different backend."""
+    global _backend
+    _backend = backend
+
+
+@traced("storage.load_review")
+def load_review(md_path: Path) -> ReviewFile:
+    """Load the stored review for a markdown file, or create a fresh one.
+
+    Events from a comment journal, if present, are replayed on top.
+    """
+    review = _backend.load_review(md_path) or ReviewFile(file=md_path.name)
+    events = load_journal(md_path)
+    if events:
+        replay_journal(review, events)
+    return review
+
+
+@traced("storage.save_review")
+def save_review(md_path: Path, review: ReviewFile) -> None:
+    """Write the review for a markdown file.
+
+    The review was loaded with any journal replayed into it, so the saved
+    state supersedes the journal, which is removed.
+    """
+    _backend.save_review(md_path, review)
+    journal_path(md_path).unlink(missing_ok=True)
+
+
+def load_snapshot(md_path: Path, round: int = -1) -> str | None:
+    """Load a snapshot round for a markdown file (default: the latest).
+
+    Returns None if the file has no snapshot or no such round.
+    """
+    return _backend.load_snapshot(md_path, round)
 
 
 def save_snapshot(md_path: Path, content: str) -> None:
-    """Write the snapshot content to disk."""
-    sp = snapshot_path(md_path)
-    sp.write_text(content)
+    """Record the snapshot content for a markdown file as its latest round."""
+    _backend.save_snapshot(md_path, content)
+
+
+def snapshot_rounds(md_path: Path) -> list[SnapshotRound]:
+    """Snapshot rounds recorded for a markdown file, oldest first."""
+    return _backend.snapshot_rounds(md_path)
+
+
+def copy_reviews(
+    source: ReviewBackend, target: ReviewBackend, md_paths: list[Path]
+) -> int:
+    """Copy stored reviews and snapshot rounds between backends.
+
+    Files without a stored review or snapshot are skipped. Returns the
+    number of files copied.
+    """
+    copied = 0
+    for md_path in md_paths:
+        review = source.load_review(md_path)
+        rounds = source.snapshot_rounds(md_path)
+        if review is None and not rounds:
+            continue
+        if review is not None:
+            target.save_review(md_path, review)
+        for i in range(len(rounds)):
+            snapshot = source.load_snapshot(md_path, i)
+            if snapshot is not None:
+                target.save_snapshot(md_path, snapshot)
+        copied += 1
+    return copied
+
+
+# --- Comment journal ---
+#
+# An append-only alternative to rewriting the sidecar on every mutation:
+# one JSON object per line, replayed over the sidecar by load_review and
+# periodically compacted back into it. Any full save_review removes the
+# journal, so one left behind by an interrupted session is folded in by the
+# next save, whether or not that session keeps a journal. Until then it is
+# replayed on every load.
+
+
+def journal_path(md_path: Path) -> Path:
+    return md_path.with_suffix(md_path.suffix + ".review.jsonl")
+
+
+def event_add(comment: Comment) -> dict:
+    return {"op": "add", "comment": comment_to_dict(comment)}
+
+
+def event_edit(comment: Comment) -> dict:
+    return {
+        "op": "edit",
+        "id": comment.id,
+        "body": comment.body,
+        "updated_at": comment.updated_at,
+    }
+
+
+def event_delete(comment_id: str) -> dict:
+    return {"op": "delete", "id": comment_id}
 
 
-def reconcile_drift(review: ReviewFile, lines: list[str]) -> bool:
+def event_clear() -> dict:
+    return {"op": "clear"}
+
+
+def event_status(review: ReviewFile) -> dict:
+    return {
+        "op": "status",
+        "status": review.status.value,
+        "reviewed_at": review.reviewed_at,
+    }
+
+
+def event_content(review: ReviewFile) -> dict:
+    """Record a new content hash, its block fingerprints and the re-anchored
+    comment positions."""
+    return {
+        "op": "content",
+        "content_hash": review.content_hash,
+        "blocks": encode_blocks(review.blocks),
+        "anchors": [
+            [
+                c.id,
+                c.line_start,
+                c.line_end,
+                c.anchor_text,
+                c.orphaned,
+                c.anchor_hash,
+                c.context_hash,
+            ]
+            for c in review.comments
+        ],
+    }
+
+
+@traced("storage.append_journal")
+def append_journal(md_path: Path, *events: dict) -> None:
+    """Append events to the journal in a single write."""
+    text = "".join(serialization.dumps_compact(e) + "\n" for e in events)
+    with open(journal_path(md_path), "a") as f:
+        f.write(text)
+
+
+def load_journal(md_path: Path) -> list[dict]:
+    """Read journal events, skipping a torn final line from an interrupted append."""
+    jp = journal_path(md_path)
+    if not jp.exists():
+        return []
+    events = []
+    for line in jp.read_text().splitlines():
+        try:
+            events.append(serialization.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return events
+
+
+def replay_journal(review: ReviewFile, events: list[dict]) -> None:
+    """Apply journal events to a review in order."""
+    for event in events:
+        match event.get("op"):
+            case "add":
+                comment = Comment(**event["comment"])
+                for i, c in enumerate(review.comments):
+                    if c.id == comment.id:
+                        review.comments[i] = comment
+                        break
+                else:
+                    review.comments.append(comment)
+            case "edit":
+                for c in review.comments:
+                    if c.id == event["id"]:
+                        c.body = event["body"]
+                        c.updated_at = event["updated_at"]
+            case "delete":
+                review.comments = [c for c in review.comments if c.id != event["id"]]
+            case "clear":
+                review.comments = []
+                review.status = ReviewStatus.UNREVIEWED
+                review.reviewed_at = None
+            case "status":
+                review.status = ReviewStatus(event["status"])
+                review.reviewed_at = event["reviewed_at"]
+            case "content":
+                review.content_hash = event["content_hash"]
+                review.blocks = decode_blocks(event.get("blocks", []))
+                anchors = {a[0]: a[1:] for a in event["anchors"]}
+                for c in review.comments:
+                    if c.id in anchors:
+                        line_start, line_end, anchor, orphaned, *hashes = anchors[c.id]
+                        c.line_start = line_start
+                        c.line_end = line_end
+                        c.anchor_text = anchor
+                        c.orphaned = orphaned
+                        if hashes:  # journals written before anchor hashes
+                            c.anchor_hash, c.context_hash = hashes
+
+
+@traced("storage.compact_journal")
+def compact_journal(md_path: Path, review: ReviewFile) -> None:
+    """Fold the journal into the sidecar and remove it."""
+    save_review(md_path, review)  # removes the journal
+
+
+@traced("storage.reconcile_drift")
+def reconcile_drift(review: ReviewFile, lines: Sequence[str]) -> bool:
     """Re-anchor comments when the markdown content has changed.
 
+    Comments in blocks whose fingerprint is unchanged just follow their
+    block. The rest are looked up by their anchor hashes, preferring the
+    match with the same surrounding lines and then the one nearest their old
+    position, and only searched for fuzzily when the exact lines are gone.
+    The review's block fingerprints and the comments' anchor hashes are
+    updated to the new content.
+
     Returns True if any comments were modified or orphaned.
     """
+    blocks = fingerprint(lines)
+    remap = line_mapper(review.blocks, blocks) if review.blocks else None
+    review.blocks = blocks
+    index: AnchorIndex | None = None  # built on the first hash lookup
+
     changed = False
     for comment in review.comments:
         if not comment.anchor_text:
             continue
 
-        # Check if anchor text still matches at recorded position
         start = comment.line_start - 1  # 1-indexed to 0-indexed
+        if remap is not None and not comment.orphaned:
+            moved_to = remap(start)
+            if moved_to is not None:
+                if moved_to != start:
+                    _move_comment(comment, moved_to - start)
+                    changed = True
+                continue  # Its block is unchanged
+
+        if comment.anchor_hash:
+            if index is None:
+                index = AnchorIndex(lines)
+            length = comment.line_end - comment.line_start + 1
+            found = index.find(comment.anchor_hash, comment.context_hash, length)
+            if found:
+                best = min(found, key=lambda i: abs(i - start))
+                if best != start or comment.orphaned:
+                    _move_comment(comment, best - start)
+                    comment.orphaned = False
+                    changed = True
+                continue
+
+        # Check if anchor text still matches at recorded position
         if (
             0 <= start < len(lines)
             and lines[start].strip() == comment.anchor_text.strip()
@@ -111,9 +548,7 @@ def reconcile_drift(review: ReviewFile, lines: list[str]) -> bool:
                 best_idx = i
 
         if best_ratio >= DRIFT_THRESHOLD and best_idx >= 0:
-            offset = best_idx - (comment.line_start - 1)
-            comment.line_start += offset
-            comment.line_end += offset
+            _move_comment(comment, best_idx - start)
             comment.anchor_text = lines[best_idx].strip()
             comment.orphaned = False
             changed = True
@@ -121,4 +556,15 @@ def reconcile_drift(review: ReviewFile, lines: list[str]) -> bool:
             comment.orphaned = True
             changed = True
 
+    for comment in review.comments:
+        if comment.anchor_text and not comment.orphaned:
+            comment.anchor_hash, comment.context_hash = anchor_hashes(
+                lines, comment.line_start, comment.line_end
+            )
+
     return changed
+
+
+def _move_comment(comment: Comment, offset: int) -> None:
+    comment.line_start += offset
+    comment.line_end += offset
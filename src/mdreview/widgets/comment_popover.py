@@ -3,10 +3,10 @@
 from __future__ import annotations
 
 import textwrap
+from functools import lru_cache
 
 from textual.app import ComposeResult
 from textual.message import Message
-from textual.reactive import reactive
 from textual.widget import Widget
 from textual.widgets import Label, Static
 
@@ -51,17 +51,46 @@ class CommentCard(Static):
     def __init__(self, comment: Comment) -> None:
         super().__init__()
         self.comment = comment
+        self._header = Label(classes="cc-header")
+        self._orphaned = Label(
+            "[anchor lost - text may have moved]", classes="cc-orphaned"
+        )
+        self._body = Label(classes="cc-body")
+        self.set_comment(comment)
 
     def compose(self) -> ComposeResult:
+        yield self._header
+        yield self._orphaned
+        yield self._body
+
+    def set_comment(self, comment: Comment) -> None:
+        """Show another comment in this card without rebuilding it."""
+        self.comment = comment
         range_str = (
-            f"L{self.comment.line_start}"
-            if self.comment.line_start == self.comment.line_end
-            else f"L{self.comment.line_start}-{self.comment.line_end}"
+            f"L{comment.line_start}"
+            if comment.line_start == comment.line_end
+            else f"L{comment.line_start}-{comment.line_end}"
         )
-        yield Label(f"Comment ({range_str})", classes="cc-header")
-        if self.comment.orphaned:
-            yield Label("[anchor lost - text may have moved]", classes="cc-orphaned")
-        yield Label(self.comment.body, classes="cc-body")
+        self._header.update(f"Comment ({range_str})")
+        self._orphaned.display = comment.orphaned
+        self._body.update(comment.body)
+
+
+@lru_cache(maxsize=4096)
+def _card_height(body: str, orphaned: bool) -> int:
+    """Rows taken by one comment card, including its bottom margin."""
+    # Inner width for text wrapping (popover width minus borders, padding, card padding)
+    wrap_width = POPOVER_INNER_WIDTH - 4  # card border(2) + card padding(2)
+    # Card border top/bottom = 2 rows, header line ("Comment (L1-5)") = 1 row
+    total = 3
+    # Orphaned warning = 1 row
+    if orphaned:
+        total += 1
+    # Body: wrap text and count lines
+    for paragraph in body.split("\n"):
+        total += len(textwrap.wrap(paragraph, width=wrap_width)) or 1
+    # Margin-bottom between cards = 1 row
+    return total + 1
 
 
 def _estimate_height(comments: list[Comment], block_changed: bool = False) -> int:
@@ -69,26 +98,10 @@ def _estimate_height(comments: list[Comment], block_changed: bool = False) -> in
 
     We compute this manually because Textual's auto-height doesn't work
     reliably for overlay-layer widgets outside the normal layout flow.
+    Card heights are cached, since the same comments are measured again
+    every time the cursor returns to their block.
     """
-    # Inner width for text wrapping (popover width minus borders, padding, card padding)
-    wrap_width = POPOVER_INNER_WIDTH - 4  # card border(2) + card padding(2)
-    total = 0
-    for comment in comments:
-        # Card border top/bottom = 2 rows
-        total += 2
-        # Header line ("Comment (L1-5)") = 1 row
-        total += 1
-        # Orphaned warning = 1 row
-        if comment.orphaned:
-            total += 1
-        # Body: wrap text and count lines
-        body_lines = 0
-        for paragraph in comment.body.split("\n"):
-            wrapped = textwrap.wrap(paragraph, width=wrap_width) or [""]
-            body_lines += len(wrapped)
-        total += body_lines
-        # Margin-bottom between cards = 1 row
-        total += 1
+    total = sum(_card_height(c.body, c.orphaned) for c in comments)
     # Changed hint = 1 row + padding-top(1)
     if comments and block_changed:
         total += 2
@@ -140,34 +153,58 @@ class CommentPopover(Widget):
             super().__init__()
             self.comment_id = comment_id
 
-    _version = reactive(0, recompose=True)
-
     def __init__(self) -> None:
         super().__init__()
         self._comments: list[Comment] = []
         self._block_changed: bool = False
+        self._cards: list[CommentCard] = []  # reused; extras are hidden
+        self._shown: tuple | None = None  # what the cards currently display
+        self._block_y: int | None = None
+        self._changed_hint = Label(
+            "[block changed since last review]", classes="cp-changed-hint"
+        )
+        self._help = Label("[d] delete  [e] edit", classes="cp-help")
 
     def compose(self) -> ComposeResult:
-        for comment in self._comments:
-            yield CommentCard(comment)
-        if self._comments:
-            if self._block_changed:
-                yield Label(
-                    "[block changed since last review]", classes="cp-changed-hint"
-                )
-            yield Label("[d] delete  [e] edit", classes="cp-help")
+        yield self._changed_hint
+        yield self._help
 
     def show_comments(
         self, comments: list[Comment], block_y: int = 0, block_changed: bool = False
     ) -> None:
         self._comments = comments
         self._block_changed = block_changed
-        if comments:
-            self.add_class("visible")
-            self._size_and_position(comments, block_y)
-        else:
-            self.remove_class("visible")
-        self._version += 1
+        if not comments:
+            self.hide()
+            return
+        # Comments are edited in place, so compare what is displayed
+        shown = (
+            tuple(
+                (c.id, c.body, c.orphaned, c.line_start, c.line_end) for c in comments
+            ),
+            block_changed,
+        )
+        if shown == self._shown and block_y == self._block_y:
+            return  # same comments at the same place: nothing to redo
+        if shown != self._shown:
+            self._show_cards(comments, block_changed)
+            self._shown = shown
+        self._block_y = block_y
+        self.add_class("visible")
+        self._size_and_position(comments, block_y)
+
+    def _show_cards(self, comments: list[Comment], block_changed: bool) -> None:
+        """Point the card widgets at ``comments``, mounting more only if needed."""
+        for card, comment in zip(self._cards, comments):
+            card.set_comment(comment)
+            card.display = True
+        for card in self._cards[len(comments) :]:
+            card.display = False
+        new_cards = [CommentCard(c) for c in comments[len(self._cards) :]]
+        if new_cards:
+            self._cards.extend(new_cards)
+            self.mount_all(new_cards, before=self._changed_hint)
+        self._changed_hint.display = block_changed
 
     def _size_and_position(self, comments: list[Comment], block_y: int) -> None:
         """Compute explicit size and position the popover."""
@@ -196,7 +233,8 @@ class CommentPopover(Widget):
     def hide(self) -> None:
         self.remove_class("visible")
         self._comments = []
-        self._version += 1
+        self._shown = None
+        self._block_y = None
 
     @property
     def active_comments(self) -> list[Comment]:
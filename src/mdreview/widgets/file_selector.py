@@ -1,53 +1,198 @@
-"""File selector popup widget."""
+"""File selector popup widget.
+
+Sessions can hold tens of thousands of files, so the list is virtual: only
+the visible rows are rendered, straight from the app's file and review
+lists, and nothing is built per file when the selector opens. Display names
+are kept in a ``PathIndex`` that the app reuses between openings and extends
+as files are discovered.
+"""
 
 from __future__ import annotations
 
+import re
+from bisect import insort
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache, partial
 from pathlib import Path
 
-from textual import on
+from rich.segment import Segment
+from textual import events, on
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Vertical
+from textual.geometry import Region, Size
 from textual.message import Message
+from textual.reactive import reactive
 from textual.screen import ModalScreen
-from textual.widgets import Label, ListItem, ListView
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Input, Label
 
-from mdreview.models import ReviewStatus
+from mdreview.models import ReviewFile, ReviewStatus
 
+# Tab cycles through these; None shows every status
+STATUS_FILTERS: tuple[ReviewStatus | None, ...] = (
+    None,
+    ReviewStatus.UNREVIEWED,
+    ReviewStatus.CHANGES_REQUESTED,
+    ReviewStatus.APPROVED,
+)
+STATUS_LABELS = {
+    None: "all",
+    ReviewStatus.UNREVIEWED: "unreviewed",
+    ReviewStatus.CHANGES_REQUESTED: "changes requested",
+    ReviewStatus.APPROVED: "approved",
+}
 
-class FileItem(ListItem):
-    """A single file entry in the file selector."""
 
-    def __init__(
-        self, path: Path, status: ReviewStatus, comment_count: int, index: int
-    ) -> None:
+@lru_cache(maxsize=64)
+def _matcher(query: str) -> Callable[[str], re.Match[str] | None]:
+    """Subsequence search for an already folded query; the leftmost match is
+    also the tightest one starting there."""
+    return re.compile(".*?".join(map(re.escape, query))).search
+
+
+def _fold(query: str) -> str:
+    return "".join(query.split()).casefold()
+
+
+def display_name(path: Path) -> str:
+    parent = path.parent.name
+    return f"{parent}/{path.name}" if parent and parent != "." else path.name
+
+
+def _status_icon(status: ReviewStatus) -> str:
+    match status:
+        case ReviewStatus.APPROVED:
+            return "\u2713"  # ✓
+        case ReviewStatus.CHANGES_REQUESTED:
+            return "\u25cf"  # ●
+        case _:
+            return "\u25cb"  # ○
+
+
+class PathIndex:
+    """Display names of a session's files, case-folded once for matching."""
+
+    def __init__(self, files: Iterable[Path] = ()) -> None:
+        self.names: list[str] = []
+        self._folded: list[str] = []
+        self.sync(list(files))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def sync(self, files: Sequence[Path]) -> range:
+        """Index files appended since the last sync; returns their indices."""
+        start = len(self.names)
+        for path in files[start:]:
+            name = display_name(path)
+            self.names.append(name)
+            self._folded.append(name.casefold())
+        return range(start, len(self.names))
+
+    def search(self, query: str, candidates: Iterable[int] | None = None) -> list[int]:
+        """Indices whose name has the query's characters in order, best first.
+
+        Tighter matches rank higher, then shorter names, then file order.
+        Spaces in the query are ignored. ``candidates`` restricts the search,
+        e.g. to the matches of a shorter prefix of the same query.
+        """
+        query = _fold(query)
+        if candidates is None:
+            candidates = range(len(self.names))
+        if not query:
+            return list(candidates)
+        search = _matcher(query)
+        folded = self._folded
+        scored = []
+        for i in candidates:
+            m = search(folded[i])
+            if m is not None:
+                scored.append((m.end() - m.start(), len(folded[i]), i))
+        scored.sort()
+        return [i for _, _, i in scored]
+
+    def rank(self, query: str, i: int) -> tuple[int, int, int] | None:
+        """Sort key of entry ``i`` in ``search(query)``, or None if it doesn't match."""
+        folded = self._folded[i]
+        m = _matcher(_fold(query))(folded)
+        return None if m is None else (m.end() - m.start(), len(folded), i)
+
+
+class FileList(ScrollView, can_focus=False):
+    """Virtual list of files: renders only the rows on screen."""
+
+    COMPONENT_CLASSES = {"file-list--highlight"}
+
+    DEFAULT_CSS = """
+    FileList {
+        height: auto;
+        max-height: 20;
+        overflow-x: hidden;
+    }
+
+    FileList > .file-list--highlight {
+        background: $accent;
+        color: $text;
+    }
+    """
+
+    highlighted: reactive[int] = reactive(0)
+
+    class Chosen(Message):
+        def __init__(self, index: int) -> None:
+            super().__init__()
+            self.index = index
+
+    def __init__(self, index: PathIndex, reviews: Sequence[ReviewFile]) -> None:
         super().__init__()
-        self.file_path = path
-        self.file_status = status
-        self.comment_count = comment_count
-        self.file_index = index
+        self._index = index
+        self._reviews = reviews
+        self.rows: list[int] = []  # file indices, in display order
 
-    def compose(self) -> ComposeResult:
-        icon = self._status_icon()
-        name = self.file_path.name
-        parent = self.file_path.parent.name
-        display = f"{parent}/{name}" if parent != "." else name
-
-        count_str = (
-            f"  {self.comment_count} comment{'s' if self.comment_count != 1 else ''}"
-            if self.comment_count > 0
-            else ""
+    def show(self, rows: list[int], highlighted: int = 0) -> None:
+        self.rows = rows
+        self.virtual_size = Size(0, len(rows))
+        self.highlighted = max(0, min(highlighted, len(rows) - 1))
+        self.refresh()
+
+    @property
+    def highlighted_file(self) -> int | None:
+        if 0 <= self.highlighted < len(self.rows):
+            return self.rows[self.highlighted]
+        return None
+
+    def move(self, delta: int) -> None:
+        if self.rows:
+            self.highlighted = max(0, min(self.highlighted + delta, len(self.rows) - 1))
+
+    def watch_highlighted(self, old: int, new: int) -> None:
+        self.scroll_to_region(Region(0, new, 1, 1), animate=False, force=True)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        row = self.scroll_offset.y + y
+        width = self.scrollable_content_region.width
+        if row >= len(self.rows):
+            return Strip.blank(width, self.rich_style)
+        i = self.rows[row]
+        review = self._reviews[i]
+        count = len(review.comments)
+        count_str = f"  {count} comment{'s' if count != 1 else ''}" if count else ""
+        text = f" {_status_icon(review.status)}  {self._index.names[i]}{count_str}"
+        style = (
+            self.get_component_rich_style("file-list--highlight")
+            if row == self.highlighted
+            else self.rich_style
         )
-        yield Label(f" {icon}  {display}{count_str}")
+        return Strip([Segment(text, style)]).crop_extend(0, width, style)
 
-    def _status_icon(self) -> str:
-        match self.file_status:
-            case ReviewStatus.APPROVED:
-                return "\u2713"  # ✓
-            case ReviewStatus.CHANGES_REQUESTED:
-                return "\u25cf"  # ●
-            case _:
-                return "\u25cb"  # ○
+    def on_click(self, event: events.Click) -> None:
+        row = self.scroll_offset.y + event.y
+        if row < len(self.rows):
+            self.highlighted = row
+            self.post_message(self.Chosen(self.rows[row]))
 
 
 class FileSelector(ModalScreen[int | None]):
@@ -55,6 +200,12 @@ class FileSelector(ModalScreen[int | None]):
 
     BINDINGS = [
         Binding("escape", "dismiss_selector", "Close"),
+        Binding("up", "move(-1)", show=False),
+        Binding("down", "move(1)", show=False),
+        Binding("pageup", "move(-10)", show=False),
+        Binding("pagedown", "move(10)", show=False),
+        Binding("tab", "cycle_status", "Status filter", priority=True),
+        Binding("ctrl+n", "toggle_commented", "Only commented"),
     ]
 
     DEFAULT_CSS = """
@@ -65,6 +216,7 @@ class FileSelector(ModalScreen[int | None]):
     FileSelector > Vertical {
         width: 60;
         max-height: 80%;
+        height: auto;
         background: $surface;
         border: thick $primary;
         padding: 1 2;
@@ -77,9 +229,8 @@ class FileSelector(ModalScreen[int | None]):
         padding-bottom: 1;
     }
 
-    FileSelector > Vertical > ListView {
-        height: auto;
-        max-height: 20;
+    FileSelector > Vertical > Input {
+        margin-bottom: 1;
     }
 
     FileSelector > Vertical > Label#fs-help {
@@ -89,34 +240,117 @@ class FileSelector(ModalScreen[int | None]):
     }
     """
 
-    class FileSelected(Message):
-        def __init__(self, index: int) -> None:
-            super().__init__()
-            self.index = index
-
     def __init__(
         self,
-        files: list[tuple[Path, ReviewStatus, int]],
+        files: Sequence[Path],
+        reviews: Sequence[ReviewFile],
         current_index: int = 0,
+        index: PathIndex | None = None,
     ) -> None:
         super().__init__()
         self._files = files
+        self._reviews = reviews
         self._current_index = current_index
+        self._index = index if index is not None else PathIndex()
+        self._index.sync(files)
+        self._query = ""
+        self._matches: list[int] = list(range(len(self._index)))
+        self._status: ReviewStatus | None = None
+        self._commented_only = False
 
     def compose(self) -> ComposeResult:
         with Vertical():
             yield Label("Files", id="fs-title")
-            items = []
-            for i, (path, status, count) in enumerate(self._files):
-                item = FileItem(path, status, count, i)
-                items.append(item)
-            yield ListView(*items, initial_index=self._current_index)
-            yield Label("\u2191\u2193 navigate  Enter select  Esc close", id="fs-help")
-
-    @on(ListView.Selected)
-    def on_list_selected(self, event: ListView.Selected) -> None:
-        if isinstance(event.item, FileItem):
-            self.dismiss(event.item.file_index)
+            yield Input(placeholder="Type to filter", id="fs-filter")
+            yield FileList(self._index, self._reviews)
+            yield Label(
+                "\u2191\u2193 navigate  Enter select  Tab status  "
+                "^N commented  Esc close",
+                id="fs-help",
+            )
+
+    def on_mount(self) -> None:
+        self._apply_filters(keep=self._current_index)
+
+    def _apply_filters(self, keep: int | None = None) -> None:
+        """Show the matches passing the status filters; ``keep`` stays highlighted."""
+        status, reviews = self._status, self._reviews
+        if status is None and not self._commented_only:
+            rows = self._matches
+        else:
+            rows = [
+                i
+                for i in self._matches
+                if (status is None or reviews[i].status == status)
+                and (not self._commented_only or reviews[i].comments)
+            ]
+        file_list = self.query_one(FileList)
+        if keep is None:
+            keep = file_list.highlighted_file
+        if keep is None:
+            highlighted = 0
+        elif rows is self._matches and not self._query:
+            highlighted = keep  # every file, in file order
+        else:
+            highlighted = next((row for row, i in enumerate(rows) if i == keep), 0)
+        file_list.show(rows, highlighted)
+
+        title = "Files"
+        if len(rows) != len(self._index):
+            title += f" ({len(rows)} of {len(self._index)})"
+        filters = [STATUS_LABELS[status]] if status is not None else []
+        if self._commented_only:
+            filters.append("commented")
+        if filters:
+            title += " \u2014 " + ", ".join(filters)
+        self.query_one("#fs-title", Label).update(title)
+
+    @on(Input.Changed, "#fs-filter")
+    def on_filter_changed(self, event: Input.Changed) -> None:
+        query = "".join(event.value.split())
+        if self._query and query.startswith(self._query):
+            # Typing narrows the previous matches; only they can still match
+            self._matches = self._index.search(query, self._matches)
+        else:
+            self._matches = self._index.search(query)
+        self._query = query
+        self._apply_filters()
+
+    @on(Input.Submitted, "#fs-filter")
+    def on_filter_submitted(self) -> None:
+        chosen = self.query_one(FileList).highlighted_file
+        if chosen is not None:
+            self.dismiss(chosen)
+
+    @on(FileList.Chosen)
+    def on_file_chosen(self, event: FileList.Chosen) -> None:
+        self.dismiss(event.index)
+
+    def sync(self) -> None:
+        """Show files appended to the session after the selector was opened."""
+        new = self._index.sync(self._files)
+        if not new:
+            return
+        if self._query:
+            rank = partial(self._index.rank, self._query)
+            for i in self._index.search(self._query, new):
+                insort(self._matches, i, key=rank)
+        else:
+            self._matches.extend(new)
+        if self.is_mounted:
+            self._apply_filters()
+
+    def action_move(self, delta: int) -> None:
+        self.query_one(FileList).move(delta)
+
+    def action_cycle_status(self) -> None:
+        position = STATUS_FILTERS.index(self._status)
+        self._status = STATUS_FILTERS[(position + 1) % len(STATUS_FILTERS)]
+        self._apply_filters()
+
+    def action_toggle_commented(self) -> None:
+        self._commented_only = not self._commented_only
+        self._apply_filters()
 
     def action_dismiss_selector(self) -> None:
         self.dismiss(None)
@@ -41,6 +41,7 @@ def _build_help_text(keys: dict[str, str]) -> str:
 
  Diff
    {k["toggle_diff"]:15s} Toggle diff view (changes since last review)
+   {k["cycle_diff_round"]:15s} Diff against an earlier review round
 
  Mermaid
    {k["open_mermaid"]:15s} Open diagram in browser
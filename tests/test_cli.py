@@ -5,7 +5,14 @@ from unittest.mock import patch
 
 from click.testing import CliRunner
 
-from mdreview.cli import detect_install_method, main
+from mdreview.cli import (
+    collect_files,
+    detect_install_method,
+    get_installed_version,
+    history_root,
+    main,
+)
+from mdreview.snapshots import STORE_DIR, SnapshotStore
 
 
 def test_version_flag_prints_version():
@@ -25,21 +32,50 @@ def test_version_flag_without_files():
     assert "mdreview" in result.output
 
 
+class _FakeDist:
+    def __init__(self, installer: str | None, version: str = "1.2.3") -> None:
+        self._installer = installer
+        self.version = version
+
+    def read_text(self, name: str) -> str | None:
+        return self._installer if name == "INSTALLER" else None
+
+
 class TestDetectInstallMethod:
-    def test_pipx(self):
-        with patch("mdreview.cli.sys") as mock_sys:
-            mock_sys.executable = "/home/user/.local/pipx/venvs/mdreview/bin/python"
-            assert detect_install_method() == "pipx"
+    def _detect(self, prefix, dist):
+        with (
+            patch("mdreview.cli.sys") as mock_sys,
+            patch("mdreview.cli._installed_distribution", return_value=dist),
+        ):
+            mock_sys.prefix = str(prefix)
+            return detect_install_method()
+
+    def test_pipx(self, tmp_path):
+        (tmp_path / "pipx_metadata.json").write_text("{}")
+        assert self._detect(tmp_path, _FakeDist("pip\n")) == "pipx"
+
+    def test_uv_tool(self, tmp_path):
+        (tmp_path / "uv-receipt.toml").write_text("")
+        assert self._detect(tmp_path, _FakeDist("uv\n")) == "uv"
+
+    def test_uv_pip_from_installer_record(self, tmp_path):
+        assert self._detect(tmp_path, _FakeDist("uv\n")) == "uv-pip"
+
+    def test_pip_from_installer_record(self, tmp_path):
+        assert self._detect(tmp_path, _FakeDist("pip\n")) == "pip"
 
-    def test_uv_tool(self):
-        with patch("mdreview.cli.sys") as mock_sys:
-            mock_sys.executable = "/home/user/.local/share/uv/tools/mdreview/bin/python"
-            assert detect_install_method() == "uv"
+    def test_pip_fallback(self, tmp_path):
+        assert self._detect(tmp_path, _FakeDist(None)) == "pip"
+        assert self._detect(tmp_path, None) == "pip"
 
-    def test_pip_fallback(self):
-        with patch("mdreview.cli.sys") as mock_sys:
-            mock_sys.executable = "/usr/bin/python3"
-            assert detect_install_method() == "pip"
+
+class TestGetInstalledVersion:
+    def test_reads_distribution_metadata(self):
+        assert get_installed_version() == version("mdreview")
+
+    def test_unknown_when_not_installed(self):
+        with patch("mdreview.cli._installed_distribution", return_value=None):
+            assert get_installed_version() == "unknown"
 
 
 class TestUpdateFlag:
@@ -71,3 +107,92 @@ class TestUpdateFlag:
         with patch("mdreview.cli.run_upgrade", return_value=1):
             result = runner.invoke(main, ["--update"])
         assert result.exit_code == 1
+
+
+class TestStoreFlags:
+    def test_import_export_roundtrip(self, tmp_review_file, tmp_path):
+        md_path, _ = tmp_review_file
+        store = str(tmp_path / "reviews.sqlite")
+        runner = CliRunner()
+
+        result = runner.invoke(
+            main, ["--store", store, "--import-sidecars", str(md_path)]
+        )
+        assert result.exit_code == 0
+        assert "Imported 1 file(s)" in result.output
+
+        sidecar = md_path.with_suffix(".md.review.json")
+        expected = sidecar.read_text()
+        sidecar.unlink()
+        result = runner.invoke(main, ["--store", store, "--export-sidecars"])
+        assert result.exit_code == 0
+        assert sidecar.read_text() == expected
+
+    def test_import_requires_store(self, tmp_md_file):
+        runner = CliRunner()
+        result = runner.invoke(main, ["--import-sidecars", str(tmp_md_file)])
+        assert result.exit_code == 2
+
+
+class TestStatusFlag:
+    def test_status_exit_code(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        runner = CliRunner()
+        result = runner.invoke(main, ["--status", str(md_path)])
+        assert result.exit_code == 1
+        assert "changes requested" in result.output
+
+    def test_status_json(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        runner = CliRunner()
+        result = runner.invoke(main, ["--status", "--json", str(md_path)])
+        assert result.exit_code == 1
+        assert '"exit_code": 1' in result.output
+
+
+class TestCollectFiles:
+    def test_dedupes_explicit_and_scanned(self, tmp_md_file):
+        paths = collect_files((str(tmp_md_file),), str(tmp_md_file.parent))
+        assert paths == [tmp_md_file.resolve()]
+
+    def test_exclude_applies_to_scans_only(self, tmp_path):
+        (tmp_path / "drafts").mkdir()
+        draft = tmp_path / "drafts" / "a.md"
+        draft.write_text("# A\n")
+        assert collect_files((), str(tmp_path), exclude=("drafts/",)) == []
+        assert collect_files((str(draft),), None, exclude=("drafts/",)) == [
+            draft.resolve()
+        ]
+
+    def test_dedupes_symlinked_file(self, tmp_md_file):
+        link = tmp_md_file.parent / "link.md"
+        link.symlink_to(tmp_md_file)
+        paths = collect_files((str(link),), str(tmp_md_file.parent))
+        assert paths == [tmp_md_file.resolve()]
+
+
+class TestHistoryRoot:
+    def test_same_store_for_file_and_dir(self, tmp_path, monkeypatch):
+        (tmp_path / ".git").mkdir()
+        doc = tmp_path / "docs" / "a.md"
+        doc.parent.mkdir()
+        doc.write_text("# A\n")
+        monkeypatch.chdir(tmp_path)
+
+        by_file = SnapshotStore(history_root(("docs/a.md",), None) / STORE_DIR)
+        by_file.record(doc, "v1\n")
+        by_dir = SnapshotStore(history_root((), ".") / STORE_DIR)
+        assert by_dir.rounds(doc) == by_file.rounds(doc)
+        assert by_dir.load(doc) == "v1\n"
+
+    def test_finds_existing_store_above(self, tmp_path):
+        (tmp_path / STORE_DIR).mkdir()
+        doc = tmp_path / "docs" / "a.md"
+        doc.parent.mkdir()
+        doc.write_text("# A\n")
+        assert history_root((str(doc),), None) == tmp_path.resolve()
+
+    def test_falls_back_to_the_files_directory(self, tmp_path):
+        doc = tmp_path / "a.md"
+        doc.write_text("# A\n")
+        assert history_root((str(doc),), None) == tmp_path.resolve()
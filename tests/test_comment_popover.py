@@ -0,0 +1,102 @@
+"""Tests for the comment popover's cached layout and in-place updates."""
+
+from __future__ import annotations
+
+from textual.app import App
+
+from mdreview.models import Comment
+from mdreview.widgets.comment_popover import (
+    CommentCard,
+    CommentPopover,
+    _card_height,
+    _estimate_height,
+)
+
+
+def _comment(n: int, body: str = "Short note", orphaned: bool = False) -> Comment:
+    return Comment(n, n, f"line {n}", body, id=f"c{n}", orphaned=orphaned)
+
+
+class PopoverApp(App):
+    def compose(self):
+        yield CommentPopover()
+
+
+def _visible_cards(popover: CommentPopover) -> list[CommentCard]:
+    return [card for card in popover.query(CommentCard) if card.display]
+
+
+class TestEstimateHeight:
+    def test_single_short_comment(self):
+        # card: border 2 + header 1 + body 1 + margin 1; help 2; popover 4
+        assert _estimate_height([_comment(1)]) == 11
+
+    def test_orphaned_long_comment_and_changed_hint(self):
+        body = "word " * 20  # 100 chars wrap to 4 lines of 32
+        height = _estimate_height([_comment(1, body, orphaned=True)], True)
+        assert height == 2 + 1 + 1 + 4 + 1 + 2 + 2 + 4
+
+    def test_card_heights_are_cached(self):
+        comments = [_comment(1, "cached body"), _comment(2, "cached body")]
+        _estimate_height(comments)
+        hits = _card_height.cache_info().hits
+        _estimate_height(comments)
+        assert _card_height.cache_info().hits == hits + 2
+
+
+class TestCommentPopover:
+    async def test_cards_are_reused(self):
+        app = PopoverApp()
+        async with app.run_test() as pilot:
+            popover = app.query_one(CommentPopover)
+            popover.show_comments([_comment(1), _comment(2)], block_y=3)
+            await pilot.pause()
+            first = _visible_cards(popover)
+            assert [c.comment.id for c in first] == ["c1", "c2"]
+
+            popover.show_comments([_comment(3)], block_y=5)
+            await pilot.pause()
+            assert _visible_cards(popover) == first[:1]
+            assert first[0].comment.id == "c3"
+            assert len(popover.query(CommentCard)) == 2
+
+            popover.show_comments([_comment(4), _comment(5), _comment(6)])
+            await pilot.pause()
+            assert len(_visible_cards(popover)) == 3
+            assert _visible_cards(popover)[:2] == first
+
+    async def test_unchanged_comments_skip_work(self):
+        app = PopoverApp()
+        async with app.run_test() as pilot:
+            popover = app.query_one(CommentPopover)
+            comments = [_comment(1)]
+            popover.show_comments(comments, block_y=3)
+            await pilot.pause()
+            card = _visible_cards(popover)[0]
+            card.comment = None  # would be replaced if the cards were redone
+            popover.show_comments(comments, block_y=3)
+            assert card.comment is None
+
+    async def test_in_place_edit_is_shown(self):
+        app = PopoverApp()
+        async with app.run_test() as pilot:
+            popover = app.query_one(CommentPopover)
+            comment = _comment(1)
+            popover.show_comments([comment])
+            await pilot.pause()
+            comment.body = "Edited"
+            popover.show_comments([comment])
+            await pilot.pause()
+            body = _visible_cards(popover)[0].query_one(".cc-body")
+            assert "Edited" in str(body.render())
+
+    async def test_hide(self):
+        app = PopoverApp()
+        async with app.run_test() as pilot:
+            popover = app.query_one(CommentPopover)
+            popover.show_comments([_comment(1)])
+            await pilot.pause()
+            assert popover.has_class("visible")
+            popover.hide()
+            assert not popover.has_class("visible")
+            assert popover.active_comments == []
@@ -0,0 +1,182 @@
+"""Tests for mdreview.daemon — the optional warm workspace daemon."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mdreview.daemon import (
+    DaemonClient,
+    DaemonError,
+    DaemonServer,
+    Workspace,
+    check_socket_dir,
+)
+from mdreview.operations import approve_file
+from mdreview.storage import load_review, save_review
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Workspace:
+    (tmp_path / "a.md").write_text("# A\n\ntext\n")
+    (tmp_path / "b.md").write_text("# B\n\n```mermaid\ngraph TD\n  X-->Y\n```\n")
+    return Workspace(tmp_path)
+
+
+@pytest.fixture
+def server(workspace: Workspace):
+    # AF_UNIX paths are short; keep the socket out of pytest's deep tmp dirs
+    sock_dir = Path(tempfile.mkdtemp(prefix="mdr"))
+    srv = DaemonServer(workspace, sock_dir / "d.sock", idle_timeout=60)
+    thread = threading.Thread(target=srv.run, kwargs={"watch": False})
+    thread.start()
+    yield srv
+    srv.shutdown()
+    thread.join()
+    os.rmdir(sock_dir)
+
+
+@pytest.fixture
+def client(server: DaemonServer):
+    c = DaemonClient.connect(server.path)
+    yield c
+    c.close()
+
+
+class TestWorkspace:
+    def test_files(self, workspace, tmp_path):
+        assert [p.name for p in workspace.files()] == ["a.md", "b.md"]
+
+    def test_status_follows_sidecar_changes(self, workspace, tmp_path):
+        assert workspace.status()["exit_code"] == 2
+        for path in workspace.files():
+            review = load_review(path)
+            approve_file(review)
+            save_review(path, review)
+        result = workspace.status()
+        assert result["exit_code"] == 0
+        assert "2 approved" in result["output"]
+
+    def test_render_cache_is_capped(self, tmp_path):
+        (tmp_path / "a.md").write_text("# A\n" * 2000)
+        (tmp_path / "b.md").write_text("# B\n" * 2000)
+        ws = Workspace(tmp_path, cache_limit=12_000)
+        ws.render(ws.files()[0], True)
+        ws.render(ws.files()[1], True)
+        assert 0 < ws.cache_bytes() <= 12_000
+
+    def test_hashes_and_reviews_share_the_cap(self, tmp_path):
+        for n in range(50):
+            (tmp_path / f"{n}.md").write_text(f"# {n}\n")
+        ws = Workspace(tmp_path, cache_limit=2_000)
+        ws.status()
+        assert 0 < ws.cache_bytes() <= 2_000
+        assert ws.status()["exit_code"] == 2  # evicted entries are reloaded
+
+    def test_render_sees_edits(self, workspace, tmp_path):
+        path = tmp_path / "a.md"
+        assert "text" in workspace.render(path, True)["processed"]
+        path.write_text("# A\n\nchanged, and longer\n")
+        assert "changed" in workspace.render(path, True)["processed"]
+
+    def test_render_outside_workspace(self, workspace, tmp_path):
+        with pytest.raises(ValueError):
+            workspace.render(tmp_path.parent / "elsewhere.md", True)
+
+
+class TestDaemon:
+    def test_files_and_status(self, client, tmp_path):
+        assert [p.name for p in client.files()] == ["a.md", "b.md"]
+        output, code = client.status()
+        assert code == 2
+        assert "not reviewed" in output
+
+    def test_render(self, client, tmp_path):
+        processed, diagrams = client.render(tmp_path / "b.md", False)
+        assert len(diagrams) == 1
+
+    def test_errors_are_reported(self, client):
+        with pytest.raises(DaemonError):
+            client.request("bogus")
+        assert client.request("ping")["files"] == 2
+
+    def test_bad_requests_are_reported(self, client):
+        with pytest.raises(DaemonError, match="needs a path"):
+            client.request("render")
+        with pytest.raises(DaemonError, match="JSONDecodeError"):
+            client._file.write(b"not json\n")
+            client._file.flush()
+            client.request("ping")  # reads the answer to the bad line
+        assert client.request("ping")["files"] == 2
+
+    def test_refuses_second_daemon(self, server, workspace):
+        with pytest.raises(OSError):
+            DaemonServer(workspace, server.path)
+
+    def test_no_daemon(self, tmp_path):
+        assert DaemonClient.connect(tmp_path / "missing.sock") is None
+
+    def test_client_refuses_open_socket_dir(self, server):
+        os.chmod(server.path.parent, 0o755)
+        try:
+            assert DaemonClient.connect(server.path) is None
+        finally:
+            os.chmod(server.path.parent, 0o700)
+
+
+class TestSocketDir:
+    def test_private_dir_passes(self, tmp_path):
+        private = tmp_path / "private"
+        private.mkdir(mode=0o700)
+        os.chmod(private, 0o700)
+        check_socket_dir(private)
+
+    def test_open_dir_refused(self, tmp_path):
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        os.chmod(shared, 0o777)
+        with pytest.raises(PermissionError):
+            check_socket_dir(shared)
+
+    def test_symlink_refused(self, tmp_path):
+        private = tmp_path / "private"
+        private.mkdir(mode=0o700)
+        (tmp_path / "link").symlink_to(private)
+        with pytest.raises(PermissionError):
+            check_socket_dir(tmp_path / "link")
+
+    def test_server_refuses_open_dir(self, workspace, tmp_path):
+        shared = tmp_path / "shared"
+        shared.mkdir()
+        os.chmod(shared, 0o755)
+        with pytest.raises(PermissionError):
+            DaemonServer(workspace, shared / "d.sock")
+
+    def test_server_creates_private_dir(self, workspace):
+        base = Path(tempfile.mkdtemp(prefix="mdr"))
+        srv = DaemonServer(workspace, base / "sub" / "d.sock")
+        try:
+            assert (base / "sub").stat().st_mode & 0o777 == 0o700
+        finally:
+            srv.server_close()
+            srv.path.unlink()
+            (base / "sub").rmdir()
+            base.rmdir()
+
+
+def test_idle_timeout(workspace):
+    sock_dir = Path(tempfile.mkdtemp(prefix="mdr"))
+    srv = DaemonServer(workspace, sock_dir / "d.sock", idle_timeout=0.2)
+    thread = threading.Thread(target=srv.run, kwargs={"watch": False})
+    start = time.monotonic()
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.monotonic() - start < 5
+    assert not (sock_dir / "d.sock").exists()
+    os.rmdir(sock_dir)
@@ -0,0 +1,203 @@
+"""Tests for mdreview.discovery — ignore-aware markdown scanning."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mdreview.discovery import (
+    PatternSet,
+    _Walker,
+    compile_pattern,
+    iter_markdown_files,
+    stream_batches,
+)
+
+
+def _tree(root: Path, *files: str) -> None:
+    for name in files:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {name}\n")
+
+
+def _scan(root: Path, **kwargs) -> list[str]:
+    return [
+        p.relative_to(root.resolve()).as_posix()
+        for p in iter_markdown_files(root, **kwargs)
+    ]
+
+
+class TestPatterns:
+    def test_blank_and_comment(self):
+        assert compile_pattern("") is None
+        assert compile_pattern("# note") is None
+
+    def test_unanchored_matches_any_depth(self, tmp_path):
+        rules = PatternSet.from_globs(tmp_path, ["build"])
+        assert rules.matches(str(tmp_path / "build"), True)
+        assert rules.matches(str(tmp_path / "a" / "build"), True)
+
+    def test_anchored(self, tmp_path):
+        rules = PatternSet.from_globs(tmp_path, ["/docs/draft.md"])
+        assert rules.matches(str(tmp_path / "docs" / "draft.md"), False)
+        assert not rules.matches(str(tmp_path / "x" / "docs" / "draft.md"), False)
+
+    def test_dir_only(self, tmp_path):
+        rules = PatternSet.from_globs(tmp_path, ["out/"])
+        assert rules.matches(str(tmp_path / "out"), True)
+        assert not rules.matches(str(tmp_path / "out"), False)
+
+    def test_double_star(self, tmp_path):
+        rules = PatternSet.from_globs(tmp_path, ["docs/**/tmp.md"])
+        assert rules.matches(str(tmp_path / "docs" / "tmp.md"), False)
+        assert rules.matches(str(tmp_path / "docs" / "a" / "b" / "tmp.md"), False)
+
+    def test_negation_last_match_wins(self, tmp_path):
+        rules = PatternSet.from_globs(tmp_path, ["*.md", "!keep.md"])
+        assert rules.matches(str(tmp_path / "drop.md"), False)
+        assert not rules.matches(str(tmp_path / "keep.md"), False)
+
+
+class TestIterMarkdownFiles:
+    def test_sorted_like_rglob(self, tmp_path):
+        _tree(tmp_path, "b.md", "a/z.md", "a-b.md", "a/sub/x.md", "notes.txt")
+        expected = [
+            p.relative_to(tmp_path).as_posix() for p in sorted(tmp_path.rglob("*.md"))
+        ]
+        assert _scan(tmp_path) == expected
+
+    def test_skips_dependency_dirs(self, tmp_path):
+        _tree(tmp_path, "README.md", "node_modules/pkg/README.md", ".venv/x.md")
+        assert _scan(tmp_path) == ["README.md"]
+
+    def test_honours_gitignore(self, tmp_path):
+        _tree(tmp_path, "a.md", "build/out.md", "docs/keep.md", "docs/skip.md")
+        (tmp_path / ".gitignore").write_text("build/\nskip.md\n")
+        assert _scan(tmp_path) == ["a.md", "docs/keep.md"]
+        assert len(_scan(tmp_path, use_gitignore=False)) == 4
+
+    def test_nested_gitignore_reincludes(self, tmp_path):
+        _tree(tmp_path, "docs/a.md", "docs/b.md")
+        (tmp_path / ".gitignore").write_text("*.md\n")
+        (tmp_path / "docs" / ".gitignore").write_text("!a.md\n")
+        assert _scan(tmp_path) == ["docs/a.md"]
+
+    def test_parent_gitignore_applies_inside_repo(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".gitignore").write_text("generated/\n")
+        _tree(tmp_path, "docs/a.md", "docs/generated/b.md")
+        assert _scan(tmp_path / "docs") == ["a.md"]
+
+    def test_include_and_exclude(self, tmp_path):
+        _tree(tmp_path, "a.md", "b.markdown", "drafts/c.md")
+        assert _scan(tmp_path, include=["*.md", "*.markdown"], exclude=["drafts/"]) == [
+            "a.md",
+            "b.markdown",
+        ]
+
+    def test_results_stream(self, tmp_path):
+        _tree(tmp_path, "a/1.md", "b/2.md")
+        it = iter_markdown_files(tmp_path)
+        assert next(it).name == "1.md"
+        it.close()
+
+    def test_files_stream_before_their_subtree_is_done(self, tmp_path, monkeypatch):
+        _tree(tmp_path, "a/1.md", "a/slow/2.md")
+        release = threading.Event()
+        entries = _Walker.entries
+
+        def slow_entries(self, directory, rules):
+            if directory.endswith("slow"):
+                release.wait(10)
+            return entries(self, directory, rules)
+
+        monkeypatch.setattr(_Walker, "entries", slow_entries)
+        it = iter_markdown_files(tmp_path)
+        start = time.monotonic()
+        assert next(it).name == "1.md"
+        assert time.monotonic() - start < 5
+        release.set()
+        assert next(it).name == "2.md"
+
+    def test_symlinked_file_listed_once(self, tmp_path):
+        _tree(tmp_path, "docs/real.md")
+        (tmp_path / "alias.md").symlink_to(tmp_path / "docs" / "real.md")
+        assert _scan(tmp_path) == ["docs/real.md"]
+
+    def test_stop_ends_the_walk(self, tmp_path):
+        _tree(tmp_path, "a.md", "b/c.md")
+        stop = threading.Event()
+        stop.set()
+        assert _scan(tmp_path, stop=stop) == ["a.md"]
+
+
+def test_stream_batches():
+    async def collect() -> list[list[int]]:
+        return [batch async for batch in stream_batches(iter(range(5)), 2)]
+
+    batches = asyncio.run(collect())
+    assert [n for batch in batches for n in batch] == [0, 1, 2, 3, 4]
+    assert all(0 < len(batch) <= 2 for batch in batches)
+
+
+def test_stream_batches_hands_over_without_waiting_for_more():
+    more = threading.Event()
+
+    def slow():
+        yield 1
+        more.wait(10)
+        yield 2
+
+    async def first_batch() -> list[int]:
+        batches = stream_batches(slow(), 64)
+        batch = await asyncio.wait_for(anext(batches), 5)
+        more.set()
+        assert await anext(batches) == [2]
+        return batch
+
+    assert asyncio.run(first_batch()) == [1]
+
+
+def test_closing_stream_batches_stops_the_scan():
+    stop = threading.Event()
+    ended = threading.Event()
+
+    def endless():
+        try:
+            n = 0
+            while True:
+                yield n
+                n += 1
+        finally:
+            ended.set()
+
+    async def first_batch() -> list[int]:
+        batches = stream_batches(endless(), 2, stop=stop)
+        batch = await anext(batches)
+        await batches.aclose()
+        return batch
+
+    assert asyncio.run(first_batch())[0] == 0
+    assert stop.is_set()
+    assert ended.wait(5)
+
+
+def test_stream_batches_reports_scan_errors(monkeypatch):
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+
+    def failing(error):
+        yield 1
+        raise error
+
+    async def drain(error) -> list[int]:
+        return [n async for batch in stream_batches(failing(error), 2) for n in batch]
+
+    with pytest.raises(PermissionError):
+        asyncio.run(drain(PermissionError("denied")))
+    with pytest.raises(RuntimeError, match="discovery failed"):
+        asyncio.run(drain(TypeError("a bug")))
@@ -0,0 +1,128 @@
+"""Tests for the virtual, filterable file selector."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from textual.app import App
+
+from mdreview.models import Comment, ReviewFile, ReviewStatus
+from mdreview.widgets.file_selector import FileList, FileSelector, PathIndex
+
+FILES = [
+    Path("/docs/guide/install.md"),
+    Path("/docs/guide/usage.md"),
+    Path("/docs/api/index.md"),
+    Path("/docs/notes.md"),
+]
+
+
+class TestPathIndex:
+    def test_display_names(self):
+        index = PathIndex(FILES)
+        assert index.names == [
+            "guide/install.md",
+            "guide/usage.md",
+            "api/index.md",
+            "docs/notes.md",
+        ]
+
+    def test_empty_query_keeps_file_order(self):
+        assert PathIndex(FILES).search("  ") == [0, 1, 2, 3]
+
+    def test_subsequence_match_is_case_insensitive(self):
+        assert PathIndex(FILES).search("GDUs") == [1]
+
+    def test_tighter_match_ranks_first(self):
+        # "ind" is contiguous in api/index.md but spread out in guide/install.md
+        assert PathIndex(FILES).search("ind") == [2, 0]
+
+    def test_candidates_restrict_search(self):
+        index = PathIndex(FILES)
+        assert index.search("md", candidates=[3, 1]) == [3, 1]
+
+    def test_rank_agrees_with_search(self):
+        index = PathIndex(FILES)
+        ranked = sorted(
+            (r for r in (index.rank("in", i) for i in range(4)) if r is not None)
+        )
+        assert [i for *_, i in ranked] == index.search("in")
+        assert index.rank("zzz", 0) is None
+
+    def test_sync_indexes_only_new_files(self):
+        index = PathIndex(FILES[:2])
+        files = list(FILES)
+        assert index.sync(files) == range(2, 4)
+        assert index.sync(files) == range(4, 4)
+        assert len(index) == 4
+
+
+class SelectorApp(App):
+    def __init__(self, selector: FileSelector) -> None:
+        super().__init__()
+        self.selector = selector
+        self.chosen: list[int | None] = []
+
+    def on_mount(self) -> None:
+        self.push_screen(self.selector, callback=self.chosen.append)
+
+
+def _reviews() -> list[ReviewFile]:
+    reviews = [ReviewFile(file=p.name) for p in FILES]
+    reviews[1].status = ReviewStatus.APPROVED
+    reviews[2].comments.append(Comment(1, 1, "# API", "Needs examples"))
+    return reviews
+
+
+class TestFileSelector:
+    async def test_opens_on_current_file(self):
+        app = SelectorApp(FileSelector(FILES, _reviews(), current_index=2))
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            file_list = app.selector.query_one(FileList)
+            assert file_list.rows == [0, 1, 2, 3]
+            assert file_list.highlighted_file == 2
+
+    async def test_type_to_filter_and_select(self):
+        app = SelectorApp(FileSelector(FILES, _reviews()))
+        async with app.run_test() as pilot:
+            await pilot.press("u", "s", "a", "g")
+            await pilot.pause()
+            assert app.selector.query_one(FileList).rows == [1]
+            await pilot.press("enter")
+            await pilot.pause()
+        assert app.chosen == [1]
+
+    async def test_status_and_comment_filters(self):
+        app = SelectorApp(FileSelector(FILES, _reviews()))
+        async with app.run_test() as pilot:
+            file_list = app.selector.query_one(FileList)
+            await pilot.press("tab")  # unreviewed
+            await pilot.pause()
+            assert file_list.rows == [0, 2, 3]
+            await pilot.press("ctrl+n")
+            await pilot.pause()
+            assert file_list.rows == [2]
+            await pilot.press("tab", "tab")  # approved
+            await pilot.pause()
+            assert file_list.rows == []
+
+    async def test_sync_adds_matching_files(self):
+        files = list(FILES)
+        reviews = _reviews()
+        app = SelectorApp(FileSelector(files, reviews))
+        async with app.run_test() as pilot:
+            await pilot.press("i", "n", "d")
+            await pilot.pause()
+            files.append(Path("/docs/ind.md"))
+            reviews.append(ReviewFile(file="ind.md"))
+            app.selector.sync()
+            await pilot.pause()
+            assert app.selector.query_one(FileList).rows == [4, 2, 0]
+
+    async def test_escape_dismisses(self):
+        app = SelectorApp(FileSelector(FILES, _reviews()))
+        async with app.run_test() as pilot:
+            await pilot.press("escape")
+            await pilot.pause()
+        assert app.chosen == [None]
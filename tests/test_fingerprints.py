@@ -0,0 +1,72 @@
+"""Tests for mdreview.fingerprints — per-block content hashes."""
+
+from __future__ import annotations
+
+from mdreview.fingerprints import (
+    decode_blocks,
+    encode_blocks,
+    fingerprint,
+    line_mapper,
+    match_blocks,
+)
+
+DOC = """# Title
+Intro paragraph
+continues here.
+
+```python
+x = 1
+
+y = 2
+```
+
+- item
+- item
+""".splitlines()
+
+
+class TestFingerprint:
+    def test_block_ranges(self):
+        ranges = [(b.start, b.end) for b in fingerprint(DOC)]
+        # heading alone, paragraph, whole fence despite its blank line, list
+        assert ranges == [(0, 1), (1, 3), (4, 9), (10, 12)]
+
+    def test_unclosed_fence_runs_to_end(self):
+        assert [(b.start, b.end) for b in fingerprint(["```", "code", ""])] == [(0, 3)]
+
+    def test_same_text_same_hash(self):
+        a = fingerprint(["one", "", "two", "", "one"])
+        assert a[0].hash == a[2].hash != a[1].hash
+
+    def test_storage_roundtrip(self):
+        blocks = fingerprint(DOC)
+        assert decode_blocks(encode_blocks(blocks)) == blocks
+        assert decode_blocks("") == []
+
+    def test_reads_list_of_entries(self):
+        blocks = fingerprint(DOC)
+        assert decode_blocks(encode_blocks(blocks).split(";")) == blocks
+
+
+class TestMatching:
+    def test_edit_touches_only_its_block(self):
+        old = fingerprint(DOC)
+        edited = list(DOC)
+        edited[1] = "Intro paragraph, reworded"
+        new = fingerprint(edited)
+        unchanged = [o.start for o, _ in match_blocks(old, new)]
+        assert unchanged == [0, 4, 10]
+
+    def test_line_mapper_follows_inserted_lines(self):
+        old = fingerprint(DOC)
+        new = fingerprint(["New first paragraph.", "", *DOC])
+        remap = line_mapper(old, new)
+        assert remap(0) == 2
+        assert remap(6) == 8
+        assert remap(3) is None  # blank line, in no block
+
+    def test_line_mapper_follows_moved_block(self):
+        old = fingerprint(["alpha", "", "beta", "", "gamma"])
+        new = fingerprint(["gamma", "", "alpha", "", "beta"])
+        remap = line_mapper(old, new)
+        assert [remap(0), remap(2), remap(4)] == [2, 4, 0]
@@ -0,0 +1,109 @@
+"""Tests for mdreview.headless — status without the TUI."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+from mdreview import storage
+from mdreview.headless import check_file, collect_status, run_status, status_to_dict
+from mdreview.models import ReviewStatus
+from mdreview.storage import journal_path, load_review, set_hash_algorithm
+
+
+class TestCheckFile:
+    def test_unchanged(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        status = check_file(md_path)
+        assert status.review.status == ReviewStatus.CHANGES_REQUESTED
+        assert not status.drifted
+        assert not status.reconciled
+
+    def test_not_drifted_after_algorithm_switch(self, tmp_review_file, monkeypatch):
+        md_path, review = tmp_review_file
+        monkeypatch.setattr(storage, "_hash_algorithm", "sha256")
+        set_hash_algorithm("blake2b")
+        assert not check_file(md_path).drifted
+
+    def test_new_file_not_drifted(self, tmp_md_file):
+        status = check_file(tmp_md_file)
+        assert status.review.status == ReviewStatus.UNREVIEWED
+        assert not status.drifted
+
+    def test_drift_reported_without_writing(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        md_path.write_text("Intro\n\n" + md_path.read_text())
+        sidecar = md_path.with_suffix(".md.review.json")
+        before = sidecar.read_text()
+
+        status = check_file(md_path)
+        assert status.drifted
+        assert not status.reconciled
+        assert sidecar.read_text() == before
+
+    def test_reconcile_saves_reanchored_comments(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        md_path.write_text("Intro\n\n" + md_path.read_text())
+        journal_path(md_path).write_text("")
+
+        status = check_file(md_path, reconcile=True)
+        assert status.reconciled
+        saved = load_review(md_path)
+        assert saved.content_hash == status.review.content_hash
+        assert [c.line_start for c in saved.comments] == [3, 5]
+        assert not journal_path(md_path).exists()
+
+
+class TestCollectStatus:
+    def test_keeps_order(self, tmp_path):
+        paths = []
+        for i in range(20):
+            p = tmp_path / f"doc{i}.md"
+            p.write_text(f"# Doc {i}\n")
+            paths.append(p)
+        statuses = collect_status(paths, workers=4)
+        assert [s.path for s in statuses] == paths
+
+
+class TestReport:
+    def test_json(self, tmp_review_file, tmp_path):
+        md_path, _ = tmp_review_file
+        other = tmp_path / "other.md"
+        other.write_text("# Other\n")
+
+        data = status_to_dict(collect_status([md_path, other]))
+        assert data["exit_code"] == 2
+        assert [f["status"] for f in data["files"]] == [
+            "changes_requested",
+            "unreviewed",
+        ]
+        assert data["files"][0]["comments"] == 2
+
+    def test_run_status_prints_summary(self, tmp_review_file, capsys):
+        md_path, _ = tmp_review_file
+        assert run_status([md_path]) == 1
+        assert "changes requested (2 comments)" in capsys.readouterr().out
+
+    def test_run_status_json(self, tmp_review_file, capsys):
+        md_path, _ = tmp_review_file
+        assert run_status([md_path], as_json=True) == 1
+        assert json.loads(capsys.readouterr().out)["exit_code"] == 1
+
+
+def test_status_does_not_import_textual(tmp_md_file):
+    """The CLI status path must stay usable without a terminal or Textual."""
+    code = (
+        "import sys\n"
+        "from mdreview.cli import main\n"
+        "try:\n"
+        f"    main(['--status', {str(tmp_md_file)!r}])\n"
+        "except SystemExit as e:\n"
+        "    assert e.code == 2, e.code\n"
+        "assert 'textual' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert "not reviewed" in result.stdout
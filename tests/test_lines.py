@@ -0,0 +1,104 @@
+"""Tests for mdreview.lines — memory-mapped line access."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from markdown_it import MarkdownIt
+
+from mdreview.lines import LineIndex, split_lines
+from mdreview.models import ReviewFile
+from mdreview.operations import add_comment
+
+CONTENTS = [
+    b"",
+    b"\n",
+    b"one line",
+    b"one\ntwo\n",
+    b"one\r\ntwo\r\n",
+    b"old\rmac\r\rendings",
+    b"mixed\r\r\nendings\n\n",
+    "café\nüber\r\n".encode(),
+    "form\x0cfeed\nline\u2028separator\x85next\n".encode(),
+]
+
+
+@pytest.mark.parametrize("content", CONTENTS)
+def test_matches_split_lines(tmp_path, content):
+    path = tmp_path / "doc.md"
+    path.write_bytes(content)
+    expected = split_lines(path.read_text())
+    lines = LineIndex(path)
+    assert len(lines) == len(expected)
+    assert list(lines) == expected
+    assert lines[:] == expected
+    assert [lines[i] for i in range(len(lines))] == expected
+
+
+class TestSplitLines:
+    @pytest.mark.parametrize("content", CONTENTS[:8])
+    def test_like_splitlines_for_plain_newlines(self, content):
+        text = content.decode()
+        assert split_lines(text) == text.splitlines()
+
+    def test_numbers_lines_like_markdown_it(self):
+        text = "# A\x0cstill A\n\npara\u2028same para\n\n# B\n"
+        tokens = MarkdownIt("gfm-like").parse(text)
+        lines = split_lines(text)
+        heading = [t for t in tokens if t.type == "heading_open"][-1]
+        assert lines[heading.map[0]] == "# B"
+        assert len(lines) == 5
+
+
+class TestLineIndex:
+    def test_negative_index_and_slices(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("a\nb\nc\nd\n")
+        lines = LineIndex(path)
+        assert lines[-1] == "d"
+        assert lines[1:3] == ["b", "c"]
+        assert lines[::2] == ["a", "c"]
+        with pytest.raises(IndexError):
+            lines[4]
+
+    def test_sequence_protocol(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# Title\n\nBody\n")
+        lines = LineIndex(path)
+        assert "Body" in lines
+        assert lines.index("Body") == 2
+
+    def test_offsets_only(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("".join(f"line {i}\n" for i in range(1000)))
+        assert LineIndex(path).nbytes() == 4 * 1001
+
+    def test_reindexes_after_change(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("first\nsecond\n")
+        lines = LineIndex(path)
+        path.write_text("replaced\n")
+        os.utime(path, ns=(0, 0))  # ensure the stat differs
+        assert lines[0] == "replaced"
+        assert len(lines) == 1
+
+    def test_length_sees_growth(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("first\n")
+        lines = LineIndex(path)
+        assert len(lines) == 1
+        path.write_text("first\nadded later\n")
+        os.utime(path, ns=(0, 0))
+        assert len(lines) == 2
+
+    def test_comment_on_a_line_added_after_indexing(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("first\n")
+        lines = LineIndex(path)
+        lines[0]
+        path.write_text("first\nadded later\n")
+        os.utime(path, ns=(0, 0))
+        review = ReviewFile(file="doc.md")
+        comment = add_comment(review, lines, 2, 2, "note")
+        assert comment.anchor_text == "added later"
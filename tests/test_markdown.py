@@ -0,0 +1,176 @@
+"""Tests for the review widget's progressive mounting and inline text memo."""
+
+from __future__ import annotations
+
+import pytest
+from textual.app import App
+from textual.containers import ScrollableContainer
+from textual.widgets._markdown import MarkdownBlock, MarkdownParagraph
+
+from mdreview import markdown
+from mdreview.markdown import (
+    MAX_BATCH,
+    MIN_BATCH,
+    MOUNT_BUDGET,
+    ReviewMarkdown,
+    next_batch_size,
+)
+
+DOC = "".join(f"Paragraph {n}\n\n" for n in range(150))
+
+
+class ScrollApp(App):
+    def compose(self):
+        with ScrollableContainer():
+            yield ReviewMarkdown()
+
+
+def _spy_mounts(md: ReviewMarkdown) -> list[list[int]]:
+    """Record the first source line of every block in each mounted batch."""
+    batches: list[list[int]] = []
+    mount_all = md.mount_all
+
+    def spy(widgets, *args, **kwargs):
+        widgets = list(widgets)
+        batches.append([w.source_range[0] for w in widgets])
+        return mount_all(widgets, *args, **kwargs)
+
+    md.mount_all = spy
+    return batches
+
+
+class TestNextBatchSize:
+    def test_fits_the_budget(self):
+        assert next_batch_size(100, MOUNT_BUDGET * 2) == 50
+
+    def test_growth_is_capped(self):
+        assert next_batch_size(20, MOUNT_BUDGET / 10) == 40
+        assert next_batch_size(MAX_BATCH, 0) == MAX_BATCH
+
+    def test_never_below_minimum(self):
+        assert next_batch_size(100, 10.0) == MIN_BATCH
+
+    def test_grows_with_mounted_blocks(self):
+        assert next_batch_size(100, 10.0, mounted=3000) == 1500
+
+
+class TestProgressiveMount:
+    async def test_mounts_in_document_order_without_anchor(self):
+        app = ScrollApp()
+        async with app.run_test() as pilot:
+            md = app.query_one(ReviewMarkdown)
+            batches = _spy_mounts(md)
+            await md.update(DOC)
+            await pilot.pause()
+            lines = [line for batch in batches for line in batch]
+            assert lines == sorted(lines)
+            assert len(batches) > 1  # not one big batch
+
+    async def test_anchored_view_mounts_first_and_stays(self):
+        app = ScrollApp()
+        async with app.run_test(size=(80, 24)) as pilot:
+            md = app.query_one(ReviewMarkdown)
+            await md.update(DOC)
+            await pilot.pause()
+            scroller = app.query_one(ScrollableContainer)
+            scroller.scroll_to(y=200, animate=False, immediate=True)
+            await pilot.pause()
+            anchor = md.scroll_anchor()
+            assert anchor == (200, 0)  # paragraphs take a row plus a margin row
+
+            batches = _spy_mounts(md)
+            await md.update(DOC, anchor)
+            await pilot.pause()
+            await pilot.pause()
+            assert batches[0][0] == 200
+            assert md.scroll_anchor() == anchor
+            starts = [b.source_range[0] for b in md.children]
+            assert starts == sorted(starts)
+            assert len(starts) == 150
+
+    async def test_user_scroll_releases_the_view(self):
+        app = ScrollApp()
+        async with app.run_test() as pilot:
+            md = app.query_one(ReviewMarkdown)
+            await md.update(DOC)
+            await pilot.pause()
+            scroller = app.query_one(ScrollableContainer)
+            scroller.scroll_to(y=150, animate=False, immediate=True)
+            await pilot.pause()
+            update = md.update(DOC, md.scroll_anchor())
+            await pilot.pause()
+            scroller.scroll_to(y=0, animate=False, immediate=True)
+            await update
+            await pilot.pause()
+            await pilot.pause()
+            assert scroller.scroll_y == 0
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Inline sources built from scratch, with an empty memo to start."""
+    monkeypatch.setattr(markdown, "_inline_texts", markdown.OrderedDict())
+    built: list[str] = []
+    build_from_token = MarkdownBlock.build_from_token
+
+    def spy(self, token):
+        built.append(token.content)
+        build_from_token(self, token)
+
+    monkeypatch.setattr(MarkdownBlock, "build_from_token", spy)
+    return built
+
+
+class TestInlineMemo:
+    async def test_reload_rebuilds_only_changed_blocks(self, builds):
+        app = ScrollApp()
+        async with app.run_test():
+            md = app.query_one(ReviewMarkdown)
+            await md.update("# Title\n\nSame *text*\n\nOld\n")
+            assert builds == ["Title", "Same *text*", "Old"]
+            builds.clear()
+            await md.update("# Title\n\nSame *text*\n\nNew\n")
+            assert builds == ["New"]
+            texts = [str(b._text) for b in md.query(MarkdownParagraph)]
+            assert texts == ["Same text", "New"]
+
+    async def test_repeated_blocks_share_text(self, builds):
+        app = ScrollApp()
+        async with app.run_test():
+            md = app.query_one(ReviewMarkdown)
+            await md.update("| a | b |\n|---|---|\n| x | y |\n| x | y |\n")
+            assert builds == ["a", "b", "x", "y"]
+
+    async def test_link_targets_are_part_of_the_key(self, builds):
+        app = ScrollApp()
+        async with app.run_test():
+            md = app.query_one(ReviewMarkdown)
+            await md.update("See [docs]\n\n[docs]: https://a.example\n")
+            await md.update("See [docs]\n\n[docs]: https://b.example\n")
+            assert builds == ["See [docs]", "See [docs]"]
+
+    async def test_style_change_rebuilds_inline_text(self, builds):
+        app = ScrollApp()
+        async with app.run_test() as pilot:
+            md = app.query_one(ReviewMarkdown)
+            await md.update("Some *em* here\n")
+            app.stylesheet.add_source(
+                "ReviewMarkdown > .em { text-style: underline; }", read_from=("t", "")
+            )
+            app.stylesheet.reparse()
+            app.stylesheet.update(app)
+            await pilot.pause()
+            paragraph = md.query_one(MarkdownParagraph)
+            assert [str(span.style) for span in paragraph._text.spans] == ["underline"]
+            assert builds == ["Some *em* here"] * 2
+
+    async def test_memo_is_bounded(self, builds, monkeypatch):
+        monkeypatch.setattr(markdown, "INLINE_CACHE_SIZE", 2)
+        app = ScrollApp()
+        async with app.run_test():
+            md = app.query_one(ReviewMarkdown)
+            await md.update("one\n\ntwo\n\nthree\n")
+            assert len(markdown._inline_texts) == 2
+            builds.clear()
+            await md.update("one\n\nthree\n")
+            assert builds == ["one"]
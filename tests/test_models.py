@@ -70,3 +70,45 @@ class TestReviewFile:
     def test_with_status(self):
         rf = ReviewFile(file="test.md", status=ReviewStatus.APPROVED)
         assert rf.status == ReviewStatus.APPROVED
+
+
+class TestCompactComment:
+    """Slotted Comment with packed timestamps keeps the dataclass behaviour."""
+
+    def test_no_instance_dict(self):
+        c = Comment(line_start=1, line_end=1, anchor_text="x", body="y")
+        assert not hasattr(c, "__dict__")
+        assert not hasattr(ReviewFile(file="a.md"), "__dict__")
+
+    def test_utc_timestamps_round_trip(self):
+        for stamp in (
+            "2026-01-01T00:00:00+00:00",
+            "2026-01-01T00:01:00.123456+00:00",
+        ):
+            c = Comment(1, 1, "x", "y", created_at=stamp, updated_at=stamp)
+            assert c.created_at == stamp
+            assert c.updated_at == stamp
+            assert isinstance(c._created_at, int)
+
+    def test_other_timestamps_kept_verbatim(self):
+        for stamp in (
+            "2026-01-01T00:00:00Z",
+            "2026-01-01T01:00:00+01:00",
+            "2026-01-01T00:00:00.000000+00:00",
+            "yesterday",
+        ):
+            c = Comment(1, 1, "x", "y", created_at=stamp)
+            assert c.created_at == stamp
+
+    def test_anchor_text_interned(self):
+        a = Comment(1, 1, "".join(["# ", "Title"]), "y")
+        b = Comment(2, 2, "".join(["# ", "Title"]), "z")
+        assert a.anchor_text is b.anchor_text
+
+    def test_equality_and_copy(self):
+        from copy import copy
+
+        c = Comment(1, 2, "x", "y", id="abcd1234")
+        assert copy(c) == c
+        assert c != Comment(1, 2, "x", "other", id="abcd1234")
+        assert "anchor_text='x'" in repr(c)
@@ -2,9 +2,13 @@
 
 from pathlib import Path
 
+from mdreview import storage
+from mdreview.fingerprints import anchor_hashes
 from mdreview.models import Comment, ReviewFile, ReviewStatus
 from mdreview.operations import (
+    ReviewTally,
     add_comment,
+    apply_reload,
     approve_file,
     compute_exit_code,
     delete_all_comments,
@@ -12,11 +16,11 @@ from mdreview.operations import (
     edit_comment,
     format_summary,
     handle_content_change,
+    reload_file,
     request_changes,
     should_save_snapshot,
 )
-from mdreview.storage import compute_hash
-
+from mdreview.storage import compute_hash, set_hash_algorithm
 
 # --- Comment operations ---
 
@@ -38,6 +42,12 @@ class TestAddComment:
         assert comment.created_at is not None
         assert comment in review.comments
 
+    def test_add_comment_records_anchor_hashes(self):
+        review = self._make_review()
+        lines = ["# Title", "Some content", "More content"]
+        comment = add_comment(review, lines, 2, 3, "Needs rewording")
+        assert (comment.anchor_hash, comment.context_hash) == anchor_hashes(lines, 2, 3)
+
     def test_add_comment_anchor_out_of_range(self):
         review = self._make_review()
         lines = ["only line"]
@@ -205,6 +215,66 @@ class TestComputeExitCode:
         assert compute_exit_code(reviews) == 2
 
 
+U, A, C = (
+    ReviewStatus.UNREVIEWED,
+    ReviewStatus.APPROVED,
+    ReviewStatus.CHANGES_REQUESTED,
+)
+
+
+class TestReviewTally:
+    def test_counts(self):
+        tally = ReviewTally([U, A, C, U])
+        assert len(tally) == 4
+        assert tally.count(U) == 2
+        assert tally.count(A) == 1
+        assert tally.count(C) == 1
+
+    def test_set_updates_counts_and_exit_code(self):
+        tally = ReviewTally([U, A])
+        assert tally.exit_code() == 2
+        tally.set(0, C)
+        assert tally.count(U) == 0
+        assert tally.count(C) == 1
+        assert tally.exit_code() == 1
+        tally.set(0, A)
+        assert tally.exit_code() == 0
+
+    def test_set_same_status_is_noop(self):
+        tally = ReviewTally([U])
+        tally.set(0, U)
+        assert tally.count(U) == 1
+        assert tally.next_unreviewed(0) == 0
+
+    def test_next_unreviewed_wraps_around(self):
+        tally = ReviewTally([U, A, U, A])
+        assert tally.next_unreviewed(0) == 2
+        assert tally.next_unreviewed(2) == 0
+        assert tally.next_unreviewed(3) == 0
+
+    def test_next_unreviewed_after_changes(self):
+        tally = ReviewTally([U, U, U])
+        tally.set(1, A)
+        assert tally.next_unreviewed(0) == 2
+        tally.set(2, C)
+        assert tally.next_unreviewed(0) == 0
+        tally.set(0, A)
+        assert tally.next_unreviewed(0) is None
+        tally.set(1, U)  # e.g. all comments deleted
+        assert tally.next_unreviewed(2) == 1
+
+    def test_append(self):
+        tally = ReviewTally([A])
+        tally.append(U)
+        assert tally.next_unreviewed(0) == 1
+        assert tally.statuses() == [A, U]
+
+    def test_matches_compute_exit_code(self):
+        statuses = [A, C, A]
+        reviews = [ReviewFile(file=f"{i}.md", status=s) for i, s in enumerate(statuses)]
+        assert ReviewTally(statuses).exit_code() == compute_exit_code(reviews)
+
+
 # --- File change handling ---
 
 
@@ -218,7 +288,6 @@ class TestHandleContentChange:
         result = handle_content_change(review, "new content\n", review.content_hash)
         assert result.changed is True
         assert result.new_hash == compute_hash("new content\n")
-        assert result.lines == ["new content"]
         assert review.content_hash == result.new_hash
 
     def test_content_unchanged(self):
@@ -230,6 +299,16 @@ class TestHandleContentChange:
         assert result.changed is False
         assert result.new_hash == current_hash
 
+    def test_stored_hash_from_another_algorithm(self, monkeypatch):
+        monkeypatch.setattr(storage, "_hash_algorithm", "sha256")
+        stored = compute_hash("same")
+        review = ReviewFile(file="test.md", content_hash=stored)
+        set_hash_algorithm("blake2b")
+
+        result = handle_content_change(review, "same", compute_hash("same"))
+        assert result.changed is False
+        assert review.content_hash == stored
+
     def test_content_changed_without_comments(self):
         old_hash = compute_hash("old")
         review = ReviewFile(file="test.md", content_hash=old_hash)
@@ -239,6 +318,59 @@ class TestHandleContentChange:
         assert len(review.comments) == 0  # no drift to reconcile
 
 
+class TestReloadFile:
+    def test_moves_copies_without_touching_review(self, tmp_path):
+        md = tmp_path / "doc.md"
+        md.write_text("# Title\n\nInserted\n\nSome content\n")
+        comment = Comment(
+            line_start=3, line_end=3, anchor_text="Some content", body="n", id="c1"
+        )
+        review = ReviewFile(file="doc.md", content_hash=compute_hash("old"))
+        review.comments.append(comment)
+
+        result = reload_file(md, review.content_hash, review.comments, None)
+        assert result.changed is True
+        assert [c.id for c in result.moved] == ["c1"]
+        assert result.moved[0].line_start == 5
+        assert comment.line_start == 3  # original untouched
+        assert review.content_hash == compute_hash("old")
+
+    def test_unchanged_content(self, tmp_path):
+        md = tmp_path / "doc.md"
+        md.write_text("same\n")
+        same = compute_hash("same\n")
+        result = reload_file(md, same, [], same)
+        assert result.changed is False
+        assert result.diff_available is False
+
+    def test_diff_available_against_snapshot(self, tmp_path):
+        md = tmp_path / "doc.md"
+        md.write_text("new\n")
+        old = compute_hash("old\n")
+        result = reload_file(md, old, [], old)
+        assert result.diff_available is True
+
+
+class TestApplyReload:
+    def test_applies_moved_positions_by_id(self, tmp_path):
+        md = tmp_path / "doc.md"
+        md.write_text("intro\n\nkeep me\n")
+        review = ReviewFile(file="doc.md", content_hash=compute_hash("old"))
+        review.comments.append(
+            Comment(line_start=1, line_end=1, anchor_text="keep me", body="x", id="a")
+        )
+        review.comments.append(
+            Comment(line_start=1, line_end=1, anchor_text="intro", body="y", id="b")
+        )
+
+        result = reload_file(md, review.content_hash, review.comments, None)
+        apply_reload(review, result)
+
+        assert review.comments[0].line_start == 3
+        assert review.comments[1].line_start == 1
+        assert review.content_hash == compute_hash("intro\n\nkeep me\n")
+
+
 # --- Summary ---
 
 
@@ -272,3 +404,11 @@ class TestFormatSummary:
 
         text = format_summary(files, reviews)
         assert "Exit code: 0" in text
+
+    def test_incomplete_scan_is_unreviewed(self):
+        files = [Path("/docs/a.md")]
+        reviews = [ReviewFile(file="a.md", status=ReviewStatus.APPROVED)]
+
+        text = format_summary(files, reviews, scan_complete=False)
+        assert "scan stopped" in text
+        assert "Exit code: 2" in text
@@ -0,0 +1,169 @@
+"""Tests for chunked markdown parsing and the review widget's loading."""
+
+from __future__ import annotations
+
+import pytest
+from textual.app import App
+from textual.widgets._markdown import MarkdownH1
+
+from mdreview import parsing
+from mdreview.markdown import ReviewMarkdown
+from mdreview.parsing import decode, gfm_parser, iter_tokens, parse_chunk, split_chunks
+
+SECTION = """\
+# Section {n}
+
+Paragraph *{n}* with [a link](https://example.com).
+
+| a | b |
+|---|---|
+| {n} | 2 |
+
+```python
+# a comment, not a heading
+
+# still code
+```
+
+- item
+
+  # heading inside the item
+
+<!-- a comment
+
+# not a heading either
+-->
+
+<?php
+
+# a processing instruction
+?>
+
+<!DOCTYPE html
+
+# a declaration
+>
+
+<![CDATA[
+
+# character data
+]]>
+
+"""
+
+
+def _doc(sections: int) -> str:
+    return "".join(SECTION.format(n=n) for n in range(sections))
+
+
+def _summary(tokens) -> list[tuple]:
+    return [
+        (t.type, t.map, t.content, [(c.type, c.content) for c in t.children or []])
+        for t in tokens
+    ]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(parsing, "PARALLEL_MIN_CHARS", 0)
+    monkeypatch.setattr(parsing, "CHUNK_CHARS", 100)
+    yield
+    parsing.shutdown()
+
+
+class TestSplitChunks:
+    def test_cuts_only_at_top_level_headings(self):
+        doc = _doc(6)
+        chunks = split_chunks(doc, size=1)
+        assert len(chunks) == 6
+        assert "".join(text for _, text in chunks) == doc
+        lines = doc.splitlines()
+        for first_line, text in chunks:
+            assert text.startswith("# Section")
+            assert lines[first_line] == text.splitlines()[0]
+
+    def test_chunks_reach_the_target_size(self):
+        chunks = split_chunks(_doc(10), size=len(_doc(3)))
+        assert len(chunks) == 4
+
+    def test_heading_must_follow_a_blank_line(self):
+        doc = "<div>\n# inside html\n</div>\n" + "x\n" * 10
+        assert len(split_chunks(doc, size=1)) == 1
+
+    def test_link_references_keep_the_document_whole(self):
+        doc = _doc(3) + "[ref]: https://example.com\n"
+        assert split_chunks(doc, size=1) == [(0, doc)]
+
+    @pytest.mark.parametrize(
+        "definition", ["> [ref]: /u", "- [ref]: /u", "1. > [ref]: /u"]
+    )
+    def test_nested_link_references_keep_the_document_whole(self, definition):
+        doc = _doc(3) + definition + "\n"
+        assert split_chunks(doc, size=1) == [(0, doc)]
+
+    def test_crlf_lines_are_counted(self):
+        doc = "intro\r\n\r\n# A\r\n\r\ntext\r\n\r\n# B\r\n"
+        assert [line for line, _ in split_chunks(doc, size=1)] == [0, 2, 6]
+
+
+class TestParseChunk:
+    def test_chunks_parse_like_the_whole_document(self):
+        doc = _doc(8)
+        tokens = []
+        for first_line, text in split_chunks(doc, size=500):
+            tokens += decode(parse_chunk(text, first_line))
+        assert _summary(tokens) == _summary(gfm_parser().parse(doc))
+
+    @pytest.mark.parametrize("definition", ["> [ref]: /u", "- [ref]: /u"])
+    def test_nested_link_references_resolve_across_chunks(self, definition):
+        doc = "# Uses\n\nSee [ref].\n\n" + _doc(4) + definition + "\n"
+        tokens = []
+        for first_line, text in split_chunks(doc, size=1):
+            tokens += decode(parse_chunk(text, first_line))
+        assert _summary(tokens) == _summary(gfm_parser().parse(doc))
+
+    def test_parser_is_shared(self):
+        assert gfm_parser() is gfm_parser()
+
+
+class TestIterTokens:
+    async def test_small_document_is_one_chunk(self):
+        chunks = [tokens async for tokens in iter_tokens(_doc(3))]
+        assert len(chunks) == 1
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    async def test_chunks_arrive_in_order(self, small_chunks, monkeypatch, workers):
+        monkeypatch.setattr(parsing, "_worker_count", lambda: workers)
+        doc = _doc(5)
+        chunks = [tokens async for tokens in iter_tokens(doc)]
+        assert len(chunks) == 5
+        merged = [token for tokens in chunks for token in tokens]
+        assert _summary(merged) == _summary(gfm_parser().parse(doc))
+        assert (parsing._pool is not None) == (workers > 1)
+
+    async def test_custom_parser_parses_whole(self, small_chunks):
+        parser = parsing.MarkdownIt("commonmark")
+        chunks = [tokens async for tokens in iter_tokens(_doc(5), parser)]
+        assert len(chunks) == 1
+
+
+class MarkdownApp(App):
+    def compose(self):
+        yield ReviewMarkdown()
+
+
+class TestReviewMarkdown:
+    async def test_chunked_load_maps_blocks_to_source(self, small_chunks):
+        doc = _doc(4)
+        app = MarkdownApp()
+        async with app.run_test() as pilot:
+            md = app.query_one(ReviewMarkdown)
+            await md.update(doc)
+            await pilot.pause()
+            headings = [h for h in md.query(MarkdownH1) if h.parent is md]
+            starts = [b.source_range[0] for b in headings]
+            lines = doc.splitlines()
+            assert [lines[s] for s in starts] == [f"# Section {n}" for n in range(4)]
+            # Heading ids run on across chunks
+            ids = [block_id for *_, block_id in md._table_of_contents]
+            assert len(set(ids)) == len(ids) == 8
@@ -0,0 +1,76 @@
+"""Tests for mdreview.persistence — write-behind sidecar queue."""
+
+from __future__ import annotations
+
+import pytest
+
+from mdreview.models import Comment, ReviewFile, ReviewStatus
+from mdreview.persistence import ReviewWriter
+from mdreview.storage import load_review, sidecar_path
+
+
+class TestReviewWriter:
+    def test_flush_writes_latest_state(self, tmp_md_file):
+        writer = ReviewWriter(delay=60)
+        review = ReviewFile(file=tmp_md_file.name)
+        writer.submit(tmp_md_file, review)
+        review.status = ReviewStatus.APPROVED
+        writer.submit(tmp_md_file, review)
+        assert writer.stats().pending == 1
+        assert not sidecar_path(tmp_md_file).exists()
+
+        writer.flush()
+        assert load_review(tmp_md_file).status == ReviewStatus.APPROVED
+        stats = writer.stats()
+        assert stats.pending == 0
+        assert stats.writes == 1
+        writer.close()
+
+    def test_submit_copies_review(self, tmp_md_file):
+        writer = ReviewWriter(delay=60)
+        review = ReviewFile(file=tmp_md_file.name)
+        review.comments.append(
+            Comment(line_start=1, line_end=1, anchor_text="# Hello", body="before")
+        )
+        writer.submit(tmp_md_file, review)
+        review.comments[0].body = "after"
+        writer.close()
+        assert load_review(tmp_md_file).comments[0].body == "before"
+
+    def test_close_flushes_pending(self, tmp_md_file):
+        writer = ReviewWriter(delay=60)
+        writer.submit(tmp_md_file, ReviewFile(file=tmp_md_file.name))
+        writer.close()
+        assert sidecar_path(tmp_md_file).exists()
+
+    def test_write_after_delay(self, tmp_md_file):
+        writer = ReviewWriter(delay=0)
+        writer.submit(tmp_md_file, ReviewFile(file=tmp_md_file.name))
+        writer.flush()
+        assert sidecar_path(tmp_md_file).exists()
+        writer.close()
+
+    def test_failure_reported(self, tmp_path):
+        errors = []
+        writer = ReviewWriter(delay=0, on_error=lambda p, e: errors.append(p))
+        missing = tmp_path / "missing" / "doc.md"
+        writer.submit(missing, ReviewFile(file="doc.md"))
+        writer.close()
+        assert errors == [missing]
+        assert writer.stats().failures == 1
+
+    def test_bug_ends_writer_without_stalling_flush(self, tmp_md_file, monkeypatch):
+        def broken(path, review):
+            raise TypeError("not serializable")
+
+        monkeypatch.setattr("mdreview.persistence.save_review", broken)
+        monkeypatch.setattr("threading.excepthook", lambda args: None)
+        errors = []
+        writer = ReviewWriter(delay=0, on_error=lambda p, e: errors.append(e))
+        writer.submit(tmp_md_file, ReviewFile(file=tmp_md_file.name))
+        writer.flush()
+        writer.close()
+        assert errors == []  # not mistaken for a failed write
+        assert writer.stats().failures == 1
+        with pytest.raises(RuntimeError):
+            writer.submit(tmp_md_file, ReviewFile(file=tmp_md_file.name))
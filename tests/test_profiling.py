@@ -0,0 +1,129 @@
+"""Tests for mdreview.profiling — opt-in timing spans and Chrome traces."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mdreview import profiling
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    trace = tmp_path / "trace.json"
+    profiling.enable(trace)
+    yield trace
+    profiling.disable()
+
+
+def _double(x):
+    return x * 2
+
+
+class TestDisabled:
+    def test_traced_returns_function_unchanged(self):
+        assert profiling.traced("test.double")(_double) is _double
+
+    def test_span_records_nothing(self):
+        with profiling.span("test.stage", file="a.md"):
+            pass
+        assert profiling.events() == []
+        assert profiling.stats_line() == ""
+
+
+class TestEnabled:
+    def test_traced_records_complete_event(self, profiled):
+        double = profiling.traced("test.double")(_double)
+        assert double is not _double
+        assert double(21) == 42
+        (event,) = profiling.events()
+        assert event["name"] == "test.double"
+        assert event["cat"] == "test"
+        assert event["ph"] == "X"
+        assert event["dur"] >= 0
+        assert "args" not in event
+
+    def test_span_args(self, profiled):
+        with profiling.span("test.stage", file="a.md"):
+            pass
+        (event,) = profiling.events()
+        assert event["args"] == {"file": "a.md"}
+
+    def test_stats_line_follows_pipeline_order(self, profiled):
+        with profiling.span("markdown.parse"):
+            pass
+        with profiling.span("app.read"):
+            pass
+        with profiling.span("test.not_in_footer"):
+            pass
+        line = profiling.stats_line()
+        assert line.startswith("read ")
+        assert " · parse " in line
+        assert "not_in_footer" not in line
+
+    def test_write_trace(self, profiled):
+        with profiling.span("test.stage"):
+            pass
+        profiling.write_trace(profiled)
+        trace = json.loads(profiled.read_text())
+        assert [e["name"] for e in trace["traceEvents"]] == ["test.stage"]
+
+
+def test_env_var_writes_trace_on_exit(tmp_path, tmp_md_file):
+    trace = tmp_path / "trace.json"
+    code = (
+        "from pathlib import Path\n"
+        "from mdreview.headless import check_file\n"
+        f"check_file(Path({str(tmp_md_file)!r}))\n"
+    )
+    env = {**os.environ, profiling.ENV_VAR: str(trace)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert result.returncode == 0, result.stderr
+    names = {e["name"] for e in json.loads(trace.read_text())["traceEvents"]}
+    assert {"storage.load_review", "storage.hash"} <= names
+
+
+def test_cli_flag_writes_trace(tmp_path, tmp_md_file):
+    trace = tmp_path / "trace.json"
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "mdreview",
+            "--status",
+            "--profile",
+            str(trace),
+            str(tmp_md_file),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2, result.stderr
+    names = {e["name"] for e in json.loads(trace.read_text())["traceEvents"]}
+    assert "storage.load_review" in names
+
+
+async def test_footer_stats_line():
+    from textual.app import App
+
+    from mdreview.app import FooterBar
+
+    class FooterApp(App):
+        def compose(self):
+            yield FooterBar()
+
+    app = FooterApp()
+    async with app.run_test():
+        footer = app.query_one(FooterBar)
+        footer.set_mode("normal")
+        footer.set_stats("parse 1.0ms")
+        assert footer.styles.height.value == 2
+        assert "parse 1.0ms" in str(footer.render())
+        footer.set_stats("")
+        assert footer.styles.height.value == 1
@@ -0,0 +1,48 @@
+"""Tests for mdreview.serialization — byte-stable JSON with optional orjson."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mdreview import serialization
+
+SAMPLES = [
+    {"file": "a.md", "comments": [], "meta": {}, "reviewed_at": None, "ok": True},
+    {"body": "café — \U0001f600   done", "n": [1, {"x": []}]},
+    {"body": 'quote " backslash \\ slash / tab \t nl \n del \x7f ctl \x01'},
+    {"nested": [[], [[1, 2], {"k": "v"}], {}]},
+]
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        module = pytest.importorskip("orjson")
+    else:
+        module = None
+    monkeypatch.setattr(serialization, "_orjson", module)
+    return request.param
+
+
+class TestByteStable:
+    @pytest.mark.parametrize("obj", SAMPLES)
+    def test_pretty_matches_stdlib(self, backend, obj):
+        assert serialization.dumps_pretty(obj) == json.dumps(obj, indent=2)
+
+    @pytest.mark.parametrize("obj", SAMPLES)
+    def test_compact_matches_stdlib(self, backend, obj):
+        expected = json.dumps(obj, separators=(",", ":"))
+        assert serialization.dumps_compact(obj) == expected
+
+    @pytest.mark.parametrize("obj", SAMPLES)
+    def test_loads_round_trip(self, backend, obj):
+        assert serialization.loads(serialization.dumps_pretty(obj).encode()) == obj
+
+    def test_unencodable_falls_back(self, backend):
+        obj = {"s": "lone \ud800 surrogate"}
+        assert serialization.dumps_pretty(obj) == json.dumps(obj, indent=2)
+
+    def test_backend_name(self, backend):
+        assert serialization.backend() == backend
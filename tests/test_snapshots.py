@@ -0,0 +1,90 @@
+"""Tests for mdreview.snapshots — content-addressed snapshot history."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from mdreview import storage
+from mdreview.snapshots import STORE_DIR, SnapshotStore
+from mdreview.storage import (
+    SidecarBackend,
+    compute_hash,
+    set_hash_algorithm,
+    snapshot_path,
+)
+
+
+def _objects(store: SnapshotStore) -> list[Path]:
+    return [p for p in (store.root / "objects").rglob("*") if p.is_file()]
+
+
+class TestSnapshotStore:
+    def test_put_get_roundtrip(self, tmp_path):
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        content_hash = store.put("# Title\n")
+        assert content_hash == compute_hash("# Title\n")
+        assert store.get(content_hash) == "# Title\n"
+
+    def test_blobs_are_compressed(self, tmp_path):
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        content = "repeated line\n" * 1000
+        store.put(content)
+        (blob,) = _objects(store)
+        assert blob.stat().st_size < len(content) // 10
+
+    def test_dedup_across_files(self, tmp_path):
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        store.record(tmp_path / "a.md", "same\n")
+        store.record(tmp_path / "docs" / "b.md", "same\n")
+        assert len(_objects(store)) == 1
+
+    def test_rounds_history(self, tmp_path):
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        md = tmp_path / "a.md"
+        store.record(md, "v1\n")
+        store.record(md, "v1\n")  # unchanged: no new round
+        store.record(md, "v2\n")
+
+        rounds = store.rounds(md)
+        assert [r.content_hash for r in rounds] == [
+            compute_hash("v1\n"),
+            compute_hash("v2\n"),
+        ]
+        assert store.load(md) == "v2\n"
+        assert store.load(md, 0) == "v1\n"
+        assert store.load(md, 5) is None
+
+    def test_no_new_round_after_algorithm_switch(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "_hash_algorithm", "sha256")
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        md = tmp_path / "a.md"
+        first = store.record(md, "v1\n")
+        set_hash_algorithm("blake2b")
+        assert store.record(md, "v1\n") == first
+        assert len(store.rounds(md)) == 1
+        assert len(_objects(store)) == 1
+
+    def test_missing_history(self, tmp_path):
+        store = SnapshotStore(tmp_path / STORE_DIR)
+        assert store.rounds(tmp_path / "a.md") == []
+        assert store.load(tmp_path / "a.md") is None
+
+
+class TestSidecarBackendHistory:
+    def test_history_instead_of_snapshot_file(self, tmp_md_file):
+        backend = SidecarBackend(SnapshotStore(tmp_md_file.parent / STORE_DIR))
+        backend.save_snapshot(tmp_md_file, "one\n")
+        backend.save_snapshot(tmp_md_file, "two\n")
+
+        assert not snapshot_path(tmp_md_file).exists()
+        assert len(backend.snapshot_rounds(tmp_md_file)) == 2
+        assert backend.load_snapshot(tmp_md_file, -2) == "one\n"
+
+    def test_legacy_snapshot_is_one_round(self, tmp_snapshot_file):
+        md_path, content = tmp_snapshot_file
+        backend = SidecarBackend(SnapshotStore(md_path.parent / STORE_DIR))
+
+        (only,) = backend.snapshot_rounds(md_path)
+        assert only.content_hash == compute_hash(content)
+        assert backend.load_snapshot(md_path) == content
+        assert backend.load_snapshot(md_path, -2) is None
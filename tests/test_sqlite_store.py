@@ -0,0 +1,107 @@
+"""Tests for mdreview.sqlite_store — workspace-level SQLite backend."""
+
+from __future__ import annotations
+
+import pytest
+
+from mdreview.fingerprints import fingerprint
+from mdreview.models import ReviewStatus
+from mdreview.sqlite_store import SqliteBackend
+from mdreview.storage import (
+    SidecarBackend,
+    copy_reviews,
+    get_backend,
+    load_review,
+    load_snapshot,
+    save_review,
+    set_backend,
+    sidecar_path,
+    snapshot_path,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    backend = SqliteBackend(tmp_path / "reviews.sqlite")
+    yield backend
+    backend.close()
+
+
+class TestSqliteBackend:
+    def test_review_roundtrip(self, store, tmp_review_file):
+        md_path, original = tmp_review_file
+        store.save_review(md_path, original)
+        loaded = store.load_review(md_path)
+
+        assert loaded == original
+
+    def test_missing_review(self, store, tmp_md_file):
+        assert store.load_review(tmp_md_file) is None
+        assert store.load_snapshot(tmp_md_file) is None
+
+    def test_save_replaces_comments(self, store, tmp_review_file):
+        md_path, review = tmp_review_file
+        store.save_review(md_path, review)
+        review.comments.pop(0)
+        review.status = ReviewStatus.APPROVED
+        store.save_review(md_path, review)
+
+        loaded = store.load_review(md_path)
+        assert [c.id for c in loaded.comments] == ["eeff0011"]
+        assert loaded.status == ReviewStatus.APPROVED
+
+    def test_snapshot_roundtrip(self, store, tmp_md_file):
+        store.save_snapshot(tmp_md_file, "old\n")
+        store.save_snapshot(tmp_md_file, "newer\n")
+        assert store.load_snapshot(tmp_md_file) == "newer\n"
+
+    def test_snapshot_rounds(self, store, tmp_md_file):
+        store.save_snapshot(tmp_md_file, "v1\n")
+        store.save_snapshot(tmp_md_file, "v1\n")
+        store.save_snapshot(tmp_md_file, "v2\n")
+
+        assert len(store.snapshot_rounds(tmp_md_file)) == 2
+        assert store.load_snapshot(tmp_md_file, 0) == "v1\n"
+        assert store.load_snapshot(tmp_md_file, 7) is None
+
+    def test_block_fingerprints(self, store, tmp_review_file):
+        md_path, review = tmp_review_file
+        review.blocks = fingerprint(["# Test", "", "Content here"])
+        store.save_review(md_path, review)
+        assert store.load_review(md_path).blocks == review.blocks
+
+    def test_paths_relative_to_store(self, store, tmp_review_file):
+        md_path, review = tmp_review_file
+        store.save_review(md_path, review)
+        assert store.paths() == [md_path.resolve()]
+
+
+class TestBackendSelection:
+    def test_storage_functions_use_active_backend(self, store, tmp_review_file):
+        md_path, review = tmp_review_file
+        previous = get_backend()
+        set_backend(store)
+        try:
+            assert load_review(md_path).comments == []  # sidecar not consulted
+            save_review(md_path, review)
+        finally:
+            set_backend(previous)
+        assert store.load_review(md_path) == review
+
+
+class TestCopyReviews:
+    def test_import_and_export(self, store, tmp_review_file, tmp_snapshot_file):
+        md_path, review = tmp_review_file
+        _, snapshot = tmp_snapshot_file
+        sidecars = SidecarBackend()
+
+        assert copy_reviews(sidecars, store, [md_path]) == 1
+        sidecar_path(md_path).unlink()
+        snapshot_path(md_path).unlink()
+
+        assert copy_reviews(store, sidecars, store.paths()) == 1
+        assert load_review(md_path) == review
+        assert load_snapshot(md_path) == snapshot
+
+    def test_skips_files_without_data(self, store, tmp_md_file):
+        assert copy_reviews(SidecarBackend(), store, [tmp_md_file]) == 0
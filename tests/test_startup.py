@@ -0,0 +1,65 @@
+"""Startup regression checks: each CLI path imports only what it needs."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+# Cumulative import time allowed for the interactive path (mdreview.app),
+# in microseconds. Generous enough for slow CI machines; it exists to catch
+# a heavy dependency creeping back onto the startup path.
+APP_IMPORT_BUDGET_US = 1_500_000
+
+
+def _loaded_modules(code: str) -> set[str]:
+    """Run code in a fresh interpreter and return the modules it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+def _import_time_us(module: str) -> int:
+    """Cumulative import time of a module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_cli_import_is_light():
+    modules = _loaded_modules("import mdreview.cli")
+    assert "textual" not in modules
+    assert "tomllib" not in modules
+    assert "mdreview.keybindings" not in modules
+    assert "importlib.metadata" not in modules
+
+
+def test_app_defers_unused_modules():
+    modules = _loaded_modules("import mdreview.app")
+    for name in (
+        "webbrowser",
+        "mermaid_ascii",
+        "tomllib",
+        "mdreview.widgets.help_overlay",
+        "mdreview.widgets.confirm",
+        "mdreview.widgets.file_selector",
+        "mdreview.widgets.comment_input",
+        "mdreview.widgets.comment_picker",
+    ):
+        assert name not in modules, name
+
+
+def test_app_import_time_budget():
+    elapsed = _import_time_us("mdreview.app")
+    assert elapsed < APP_IMPORT_BUDGET_US, f"mdreview.app took {elapsed} us"
@@ -4,13 +4,33 @@ from __future__ import annotations
 
 import json
 
+import pytest
+
+from mdreview import storage
+from mdreview.fingerprints import anchor_hashes, fingerprint
 from mdreview.models import Comment, ReviewFile, ReviewStatus
 from mdreview.storage import (
+    algorithm_of,
+    append_journal,
+    compact_journal,
     compute_hash,
+    event_add,
+    event_clear,
+    event_content,
+    event_delete,
+    event_edit,
+    event_status,
+    hash_file,
+    hash_matches,
+    journal_path,
     load_review,
     load_snapshot,
+    read_content,
     reconcile_drift,
+    replay_journal,
+    save_review,
     save_snapshot,
+    set_hash_algorithm,
     sidecar_path,
     snapshot_path,
 )
@@ -29,6 +49,39 @@ class TestComputeHash:
     def test_different_content_different_hash(self):
         assert compute_hash("a") != compute_hash("b")
 
+    def test_file_hash_matches_text_hash(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "HASH_CHUNK", 4)  # CRLF split across chunks
+        md = tmp_path / "doc.md"
+        md.write_bytes("# Café\r\n\r\nold\rmac\r\n".encode())
+        text, content_hash = read_content(md)
+        assert text == md.read_text()
+        assert content_hash == compute_hash(text) == hash_file(md)
+
+    def test_pluggable_algorithm(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "_hash_algorithm", "sha256")
+        md = tmp_path / "doc.md"
+        md.write_text("hello\n")
+        set_hash_algorithm("blake2b")
+        h = compute_hash("hello\n")
+        assert h.startswith("blake2b:") and len(h) == len("blake2b:") + 64
+        assert hash_file(md) == h
+
+    def test_stored_hash_checked_with_its_own_algorithm(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(storage, "_hash_algorithm", "sha256")
+        md = tmp_path / "doc.md"
+        md.write_text("hello\n")
+        stored = hash_file(md)
+        set_hash_algorithm("blake2b")
+        assert algorithm_of(stored) == "sha256"
+        assert hash_file(md, algorithm_of(stored)) == stored
+        assert hash_matches(stored, "hello\n", compute_hash("hello\n"))
+        assert not hash_matches(stored, "bye\n", compute_hash("bye\n"))
+        assert not hash_matches("", "hello\n", compute_hash("hello\n"))
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ValueError):
+            set_hash_algorithm("md5")
+
 
 class TestSaveLoadReview:
     """inline-comments: Comment persistence roundtrip."""
@@ -96,6 +149,100 @@ class TestSaveLoadReview:
         assert len(review.comments) == 1
         assert review.comments[0].updated_at is None
 
+    def test_save_leaves_no_temp_files(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        save_review(md_path, review)
+        names = sorted(p.name for p in md_path.parent.iterdir())
+        assert names == ["test.md", "test.md.review.json"]
+
+
+class TestJournal:
+    """Append-only comment journal replayed over the sidecar."""
+
+    def test_replay_over_sidecar(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        added = Comment(line_start=5, line_end=5, anchor_text="## Section 2", body="x")
+        edited = review.comments[0]
+        edited.body = "Rename it"
+        review.status = ReviewStatus.APPROVED
+        append_journal(
+            md_path,
+            event_add(added),
+            event_edit(edited),
+            event_delete("eeff0011"),
+            event_status(review),
+        )
+
+        loaded = load_review(md_path)
+        assert [c.id for c in loaded.comments] == ["aabbccdd", added.id]
+        assert loaded.comments[0].body == "Rename it"
+        assert loaded.status == ReviewStatus.APPROVED
+
+    def test_journal_without_sidecar(self, tmp_md_file):
+        comment = Comment(line_start=1, line_end=1, anchor_text="# Hello", body="b")
+        append_journal(tmp_md_file, event_add(comment))
+        loaded = load_review(tmp_md_file)
+        assert loaded.comments[0].id == comment.id
+
+    def test_clear_resets_status(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        append_journal(md_path, event_clear())
+        loaded = load_review(md_path)
+        assert loaded.comments == []
+        assert loaded.status == ReviewStatus.UNREVIEWED
+        assert loaded.reviewed_at is None
+
+    def test_content_event_moves_anchors(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        review.content_hash = "sha256:new"
+        review.comments[1].line_start = 7
+        review.comments[1].line_end = 7
+        review.comments[1].orphaned = True
+        append_journal(md_path, event_content(review))
+
+        loaded = load_review(md_path)
+        assert loaded.content_hash == "sha256:new"
+        assert loaded.comments[1].line_start == 7
+        assert loaded.comments[1].orphaned is True
+
+    def test_torn_last_line_ignored(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        append_journal(md_path, event_delete("aabbccdd"))
+        with open(journal_path(md_path), "a") as f:
+            f.write('{"op": "delete", "id": "eeff')
+        loaded = load_review(md_path)
+        assert [c.id for c in loaded.comments] == ["eeff0011"]
+
+    def test_compact_folds_and_removes_journal(self, tmp_review_file):
+        md_path, review = tmp_review_file
+        append_journal(md_path, event_delete("aabbccdd"))
+        review = load_review(md_path)
+        compact_journal(md_path, review)
+
+        assert not journal_path(md_path).exists()
+        data = json.loads(sidecar_path(md_path).read_text())
+        assert [c["id"] for c in data["comments"]] == ["eeff0011"]
+
+    def test_replay_is_idempotent_after_compaction(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        append_journal(md_path, event_delete("aabbccdd"))
+        compact_journal(md_path, load_review(md_path))
+        # Simulate a crash between writing the sidecar and removing the journal
+        append_journal(md_path, event_delete("aabbccdd"))
+        assert [c.id for c in load_review(md_path).comments] == ["eeff0011"]
+
+    def test_save_folds_journal_left_by_crash(self, tmp_review_file):
+        md_path, _ = tmp_review_file
+        added = Comment(line_start=5, line_end=5, anchor_text="## Section 2", body="x")
+        append_journal(md_path, event_add(added))  # journal session then crashed
+        # A later session without a journal deletes the comment and saves
+        review = load_review(md_path)
+        review.comments = [c for c in review.comments if c.id != added.id]
+        save_review(md_path, review)
+
+        assert not journal_path(md_path).exists()
+        assert added.id not in [c.id for c in load_review(md_path).comments]
+
 
 class TestSaveLoadSnapshot:
     """round-diff: Snapshot save and load roundtrip."""
@@ -186,3 +333,107 @@ class TestReconcileDrift:
         lines = ["anything"]
         changed = reconcile_drift(review, lines)
         assert changed is False
+
+    def test_unchanged_block_moves_without_search(self, monkeypatch):
+        """Repeated lines follow their own block, not the first look-alike."""
+        old = ["- TODO", "", "## Part", "", "- TODO"]
+        review = ReviewFile(
+            file="test.md",
+            comments=[Comment(5, 5, "- TODO", "second one")],
+            blocks=fingerprint(old),
+        )
+        monkeypatch.setattr(storage, "SequenceMatcher", None)  # no fuzzy search
+        new = ["Intro", "", *old]
+        assert reconcile_drift(review, new) is True
+        assert review.comments[0].line_start == 7
+        assert review.blocks == fingerprint(new)
+
+
+class TestAnchorHashes:
+    LINES = ["fn a() {", "  x", "}", "", "fn b() {", "  y", "}"]
+
+    def _comment(self, line: int) -> Comment:
+        anchor_hash, context_hash = anchor_hashes(self.LINES, line, line)
+        return Comment(
+            line,
+            line,
+            self.LINES[line - 1],
+            "note",
+            anchor_hash=anchor_hash,
+            context_hash=context_hash,
+        )
+
+    def test_context_picks_the_right_repeated_line(self, monkeypatch):
+        review = ReviewFile(file="test.md", comments=[self._comment(3)])
+        monkeypatch.setattr(storage, "SequenceMatcher", None)  # no fuzzy search
+        new = ["fn c() {", "  z", "}", "", *self.LINES]
+        assert reconcile_drift(review, new) is True
+        assert review.comments[0].line_start == 7  # not the "}" still on line 3
+
+    def test_nearest_exact_match_without_context(self):
+        review = ReviewFile(file="test.md", comments=[self._comment(3)])
+        new = ["x", "}", "x", "x", "x", "x", "}"]
+        reconcile_drift(review, new)
+        assert review.comments[0].line_start == 2
+        assert not review.comments[0].orphaned
+
+    def test_hashes_follow_the_new_content(self):
+        review = ReviewFile(
+            file="test.md", comments=[Comment(1, 1, "fn a() {", "old sidecar")]
+        )
+        new = ["intro", *self.LINES]
+        reconcile_drift(review, new)
+        comment = review.comments[0]
+        assert comment.line_start == 2
+        assert (comment.anchor_hash, comment.context_hash) == anchor_hashes(new, 2, 2)
+
+    def test_sidecar_roundtrip(self, tmp_md_file):
+        review = ReviewFile(file="test.md", comments=[self._comment(2)])
+        save_review(tmp_md_file, review)
+        assert load_review(tmp_md_file).comments == review.comments
+
+    def test_replays_journal_without_hashes(self):
+        comment = self._comment(1)
+        review = ReviewFile(file="test.md", comments=[comment])
+        event = {
+            "op": "content",
+            "content_hash": "",
+            "anchors": [[comment.id, 3, 3, "}", False]],
+        }
+        replay_journal(review, [event])
+        assert comment.line_start == 3
+        assert comment.anchor_hash is not None
+
+
+class TestBlockFingerprints:
+    def test_sidecar_roundtrip(self, tmp_md_file):
+        review = ReviewFile(file="test.md", blocks=fingerprint(["# A", "", "b"]))
+        save_review(tmp_md_file, review)
+        assert load_review(tmp_md_file).blocks == review.blocks
+
+    def test_sidecar_keeps_blocks_on_one_line(self, tmp_md_file):
+        lines = [f"para {n}" for n in range(20)]
+        review = ReviewFile(file="test.md", blocks=fingerprint(lines))
+        save_review(tmp_md_file, review)
+        text = sidecar_path(tmp_md_file).read_text()
+        assert sum('"blocks"' in line for line in text.splitlines()) == 1
+        assert len(text.splitlines()) < 20
+
+    def test_sidecar_with_list_of_blocks(self, tmp_md_file):
+        blocks = fingerprint(["# A", "", "b"])
+        data = {
+            "file": "test.md",
+            "blocks": [f"{b.start}-{b.end} {b.hash}" for b in blocks],
+        }
+        sidecar_path(tmp_md_file).write_text(json.dumps(data))
+        assert load_review(tmp_md_file).blocks == blocks
+
+    def test_old_sidecar_without_blocks(self, tmp_md_file):
+        sidecar_path(tmp_md_file).write_text(json.dumps({"file": "test.md"}))
+        assert load_review(tmp_md_file).blocks == []
+
+    def test_journal_content_event_carries_blocks(self):
+        source = ReviewFile(file="test.md", blocks=fingerprint(["x"]))
+        review = ReviewFile(file="test.md")
+        replay_journal(review, [event_content(source)])
+        assert review.blocks == source.blocks